@@ -36,7 +36,12 @@
 
 
 # AI จัดการ optimization
-from pulp import *
+import sys
+from bookingroom.ilp import build_room_model, selected_assignments
+
+# โหมดเงื่อนไขเวลาชน: "clique" (sweep-line, โมเดลโตแบบเชิงเส้น) หรือ "pairwise" (แบบเดิม)
+# เลือกได้จาก command line เช่น python AI_optimization.py pairwise
+CONSTRAINT_MODE = sys.argv[1] if len(sys.argv) > 1 else "clique"
 
 groups = [
     {
@@ -70,55 +75,15 @@ rooms = [
     {"id": "R2", "capacity": 6}
 ]
 
-model = LpProblem("Room_Scheduling", LpMaximize)
-
-# สร้างตัวแปร: x[group][room][slot] → ใช้ห้องนั้นในช่วงเวลานั้นหรือไม่
-x = {}
-for g in groups:
-    for r in rooms:
-        for slot in ["main", "alt"]:
-            key = (g["id"], r["id"], slot)
-            x[key] = LpVariable(f"x_{g['id']}_{r['id']}_{slot}", cat=LpBinary)
-
-# เป้าหมาย: maximize ความสำคัญรวม
-model += lpSum([g["priority"] * x[(g["id"], r["id"], slot)]
-                for g in groups for r in rooms for slot in ["main", "alt"]])
-
-# เงื่อนไข: กลุ่มหนึ่งเลือกได้แค่ช่วงเดียวและห้องเดียว
-for g in groups:
-    model += lpSum([x[(g["id"], r["id"], slot)]
-                    for r in rooms for slot in ["main", "alt"]]) <= 1
-
-# เงื่อนไข: ขนาดห้องต้องพอ
-for g in groups:
-    for r in rooms:
-        for slot in ["main", "alt"]:
-            if g["size"] > r["capacity"]:
-                model += x[(g["id"], r["id"], slot)] == 0
-
-# เงื่อนไข: ห้ามเวลาชนกันในห้องเดียวกัน
-for i in range(len(groups)):
-    for j in range(i + 1, len(groups)):
-        g1, g2 = groups[i], groups[j]
-        for r in rooms:
-            for s1 in ["main", "alt"]:
-                for s2 in ["main", "alt"]:
-                    t1_start = g1[f"{s1}_start"]
-                    t1_end = g1[f"{s1}_end"]
-                    t2_start = g2[f"{s2}_start"]
-                    t2_end = g2[f"{s2}_end"]
-                    if not (t1_end <= t2_start or t2_end <= t1_start):
-                        model += x[(g1["id"], r["id"], s1)] + x[(g2["id"], r["id"], s2)] <= 1
+# สร้างโมเดล: ตัวแปร x[group][room][slot], เป้าหมาย maximize ความสำคัญรวม
+# เงื่อนไข: กลุ่มละไม่เกิน 1 ช่วง/1 ห้อง, ขนาดห้องต้องพอ, ห้ามเวลาชนกันในห้องเดียวกัน
+model, x = build_room_model(groups, rooms, slots=["main", "alt"], mode=CONSTRAINT_MODE)
 
 # แก้ปัญหา
 model.solve()
 
 # แสดงผลลัพธ์
-for g in groups:
-    for r in rooms:
-        for slot in ["main", "alt"]:
-            if x[(g["id"], r["id"], slot)].value() == 1:
-                start = g[f"{slot}_start"]
-                end = g[f"{slot}_end"]
-                print(f"✅ กลุ่ม {g['id']} ได้ใช้ห้อง {r['id']} ช่วง {start}–{end}")
-
+for g, r, slot in selected_assignments(groups, rooms, x):
+    start = g[f"{slot}_start"]
+    end = g[f"{slot}_end"]
+    print(f"✅ กลุ่ม {g['id']} ได้ใช้ห้อง {r['id']} ช่วง {start}–{end}")
@@ -0,0 +1,128 @@
+"""
+วัดความเร็วการดึงเวลา / จำนวนคนจากประโยคจอง (ประโยคต่อวินาที)
+
+    python benchmarks/nlp_throughput.py               ใช้ corpus 5,000 ประโยค
+    python benchmarks/nlp_throughput.py 20000         กำหนดจำนวนประโยคเอง
+
+เทียบ 3 แบบ:
+  legacy   -> สร้าง pattern ใหม่และ re.findall ทุกครั้ง + get_time แบบเดิม + get_size แบบเดิม
+  extract  -> extract_time_and_size (regex ที่ compile ไว้ อ่านข้อความรอบเดียว)
+  parse    -> parse_booking_text ทั้งหมด (รวมตัดคำและหากิจกรรม)
+"""
+import os
+import re
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bookingroom.nlp import extract_time_and_size, parse_booking_text
+from bookingroom.timeutil import to_minutes
+
+# -----------------------------
+# โค้ดแบบเดิม (ก่อนใช้ regex ที่ compile ไว้) ไว้เทียบความเร็วและผลลัพธ์
+# -----------------------------
+def legacy_get_size(text):
+    pattern = r'(\d+)\s*(?:คน|ท่าน|ที่|ที่นั่ง|seats|participants)'
+    matches = re.findall(pattern, text)
+    return [int(x) for x in matches]
+
+
+def legacy_get_time(text):
+    text = text.strip()
+    minutes = 0.00
+    if "ครึ่ง" in text:
+        minutes = 0.30
+        text = text.replace("ครึ่ง", "").strip()
+    if "เที่ยง" in text:
+        return 12.00 + minutes
+    if "บ่ายโมง" in text:
+        return 13.00 + minutes
+    text = text.replace(":", ".")
+    nums = re.findall(r"(\d+\.?\d*)", text)
+    if not nums: return 0.0
+    val = float(nums[0])
+    if "บ่าย" in text:
+        if val <= 4:
+            return (val + 12.00) + minutes
+        else:
+            return val + minutes
+    elif "โมง" in text:
+        if "เย็น" in text and val <= 6:
+            return (val + 12.00) + minutes
+        return val + minutes
+    return val + minutes
+
+
+def legacy_extract(text):
+    # คืนค่าเวลาแบบ ชั่วโมง.นาที (9.30) เหมือนเดิม
+    time_chunk_pattern = r'(?:เที่ยง|บ่ายโมง|บ่าย\s*\d+|(?:\d{1,2}[:.]\d{2})|(?:\d{1,2}\s*(?:โมง|น\.|นาฬิกา|ทุ่ม)))(?:\s*ครึ่ง)?'
+    full_time_pattern = rf"({time_chunk_pattern})\s*(?:ถึง|-)\s*({time_chunk_pattern})"
+    time_matches = re.findall(full_time_pattern, text)
+    time_range = None
+    if time_matches:
+        raw_start, raw_end = time_matches[0]
+        time_range = (legacy_get_time(raw_start), legacy_get_time(raw_end))
+    sizes = legacy_get_size(text)
+    return time_range, (sizes[0] if sizes else None)
+
+
+def legacy_in_minutes(text):
+    # แปลงผลแบบเดิมเป็นนาที เพื่อเทียบกับ extract_time_and_size
+    time_range, size = legacy_extract(text)
+    if time_range is not None:
+        time_range = tuple(to_minutes(t) for t in time_range)
+    return time_range, size
+
+# -----------------------------
+# corpus ตัวอย่าง
+# -----------------------------
+ACTIVITIES = ["ประชุมทีม", "จองห้องประชุมวิชาการ", "พรีเซนต์งานลูกค้า", "ติวสอบปลายภาค",
+              "ทำงานกลุ่ม project", "ชมรมดนตรี", "meeting กับอาจารย์", "demo ระบบ"]
+TIMES = ["{h}.00-{h2}.30 น.", "{h}:00 - {h2}:00", "{h} โมง ถึง {h2} โมง", "เที่ยง ถึง บ่ายโมงครึ่ง",
+         "บ่าย 2 ถึง บ่าย 4", "{h} โมงครึ่ง - {h2} โมง", "เวลา {h}.15-{h2}.45", "10 นาฬิกา ถึง เที่ยง"]
+SIZES = ["จำนวน {n} คน", "{n} ท่าน", "{n} ที่นั่ง", "for {n} participants", ""]
+
+
+def make_corpus(count, seed=0):
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(count):
+        h = rng.randint(8, 15)
+        text = " ".join([
+            rng.choice(ACTIVITIES),
+            rng.choice(TIMES).format(h=h, h2=h + rng.randint(1, 3)),
+            rng.choice(SIZES).format(n=rng.randint(1, 20)),
+        ])
+        corpus.append(text)
+    return corpus
+
+
+def throughput(function, corpus, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in corpus:
+            function(text)
+        best = min(best, time.perf_counter() - start)
+    return len(corpus) / best
+
+
+def main(argv):
+    count = int(argv[0]) if argv else 5000
+    corpus = make_corpus(count)
+
+    mismatches = sum(legacy_in_minutes(text) != extract_time_and_size(text) for text in corpus)
+    print(f"corpus {count} ประโยค, ผลต่างจากแบบเดิม {mismatches} ประโยค")
+
+    parse_booking_text(corpus[0]) # โหลดตัวตัดคำก่อนจับเวลา
+    rows = [("legacy", legacy_extract), ("extract", extract_time_and_size),
+            ("parse", parse_booking_text)]
+    for name, function in rows:
+        rate = throughput(function, corpus)
+        print(f"{name:<10} {rate:>12,.0f} ประโยค/วินาที")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,96 @@
+"""
+วัดหน่วยความจำของข้อมูลกลุ่มและตัวเลือกการจัดตาราง: dict แบบเดิม เทียบกับ record แบบ __slots__
+
+    python benchmarks/record_memory.py               ใช้ 20,000 กลุ่ม
+    python benchmarks/record_memory.py 100000        กำหนดจำนวนกลุ่มเอง
+
+วัดด้วย tracemalloc (หน่วยความจำที่ยังถือไว้หลังสร้างเสร็จ) ทั้ง
+  groups      -> ข้อมูลกลุ่มทั้งหมด (dict จาก JSON เทียบกับ Group)
+  candidates  -> ตัวเลือก (group, room, slot) ทุกคู่ที่ build_candidates สร้าง (dict เทียบกับ Assignment)
+"""
+import gc
+import os
+import sys
+import time
+import random
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bookingroom.config import ROOMS
+from bookingroom.records import Group
+from bookingroom.scheduler import build_candidates, calculate_heuristic_score
+from bookingroom.timeutil import to_hhmm, slot_minutes
+
+
+def make_rows(count, seed=0):
+    # dict แบบที่ json.loads อ่านได้จากไฟล์ Booking_<วันที่>.txt
+    rng = random.Random(seed)
+    rows = []
+    for order in range(1, count + 1):
+        start = rng.randint(16, 32) * 30
+        duration = rng.choice([30, 60, 90, 120])
+        main_start, main_end = to_hhmm(start), to_hhmm(start + duration)
+        rows.append({"order": order, "id": f"Group_{order}", "activity": "ประชุม",
+                     "main_start": main_start, "main_end": main_end,
+                     "priority": rng.randint(1, 5), "size": rng.randint(1, 12),
+                     "duration_main": duration / 60, "alt_start": main_start, "alt_end": main_end,
+                     "duration_alt": duration / 60})
+    return rows
+
+# -----------------------------
+# แบบเดิม: ทุกอย่างเป็น dict
+# -----------------------------
+def legacy_candidates(groups, rooms, slots=("main", "alt")):
+    possible_assignments = []
+    for g in groups:
+        for r in rooms:
+            if g["size"] <= r["capacity"]:
+                for slot in slots:
+                    start, end = slot_minutes(g, slot)
+                    possible_assignments.append({
+                        "group": g,
+                        "room": r,
+                        "slot": slot,
+                        "score": calculate_heuristic_score(g, r, slot),
+                        "start": start,
+                        "end": end
+                    })
+    return possible_assignments
+
+
+def measure(build):
+    """คืนค่า (ผลลัพธ์, หน่วยความจำที่ถือไว้ (bytes), เวลา (วินาที))"""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, elapsed
+
+
+def main(argv):
+    count = int(argv[0]) if argv else 20000
+    rows = make_rows(count)
+
+    # ค่าภายใน (string / float) ใช้ร่วมกันทั้งสองแบบ จึงวัดเฉพาะโครงสร้างที่ต่างกัน
+    dict_groups, dict_bytes, dict_time = measure(lambda: [dict(row) for row in rows])
+    slot_groups, slot_bytes, slot_time = measure(lambda: [Group.from_dict(row) for row in rows])
+    results = [("groups", dict_bytes, dict_time, slot_bytes, slot_time)]
+
+    _, dict_bytes, dict_time = measure(lambda: legacy_candidates(dict_groups, ROOMS))
+    _, slot_bytes, slot_time = measure(lambda: build_candidates(slot_groups, ROOMS, ("main", "alt")))
+    results.append(("candidates", dict_bytes, dict_time, slot_bytes, slot_time))
+
+    print(f"{count:,} กลุ่ม, {len(ROOMS)} ห้อง, slot main + alt (เวลาวัดขณะเปิด tracemalloc)")
+    print(f"{'':<12} {'dict (MB)':>10} {'slots (MB)':>11} {'ลดลง':>7} {'dict (s)':>9} {'slots (s)':>10}")
+    for name, dict_bytes, dict_time, slot_bytes, slot_time in results:
+        saved = 1 - slot_bytes / dict_bytes
+        print(f"{name:<12} {dict_bytes / 1e6:>10.2f} {slot_bytes / 1e6:>11.2f} {saved:>7.0%} "
+              f"{dict_time:>9.3f} {slot_time:>10.3f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
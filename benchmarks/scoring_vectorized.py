@@ -0,0 +1,63 @@
+"""
+เทียบการจัดตาราง greedy แบบเดิม (calculate_heuristic_score ทีละคู่ + sorted) กับแบบ NumPy
+
+    python benchmarks/scoring_vectorized.py                 ใช้ 200 / 2,000 / 20,000 กลุ่ม
+    python benchmarks/scoring_vectorized.py 500 50000       กำหนดจำนวนกลุ่มเอง
+
+ตรวจด้วยว่าผลลัพธ์ (กลุ่ม, ห้อง, slot, คะแนน, เวลา) ตรงกันทุกรายการ
+"""
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bookingroom.config import ROOMS
+from bookingroom.records import make_group
+from bookingroom.scheduler import build_candidates, greedy_select
+from bookingroom.timeutil import to_hhmm
+from bookingroom.vectorized import greedy_select_vectorized
+
+SLOTS = ("main", "alt")
+
+
+def make_groups(count, seed=0):
+    rng = random.Random(seed)
+    groups = []
+    for order in range(1, count + 1):
+        start = rng.randint(16, 32) * 30
+        alt = rng.randint(16, 32) * 30
+        duration = rng.choice([30, 60, 90, 120])
+        groups.append(make_group(order, f"Group_{order}", "ประชุม", rng.randint(1, 5),
+                                 to_hhmm(start), to_hhmm(start + duration), rng.randint(1, 12),
+                                 to_hhmm(alt), to_hhmm(alt + duration)))
+    return groups
+
+
+def summary(assignments):
+    return [(a.group["id"], a.room["id"], a.slot, a.score, a.start, a.end) for a in assignments]
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main(argv):
+    counts = [int(x) for x in argv] or [200, 2000, 20000]
+    greedy_select_vectorized(make_groups(10), ROOMS, SLOTS) # โหลด NumPy ก่อนจับเวลา
+    print(f"{'กลุ่ม':>8} {'ตัวเลือก':>10} {'เดิม (s)':>10} {'NumPy (s)':>10} {'เร็วขึ้น':>8}  ผลตรงกัน")
+    for count in counts:
+        groups = make_groups(count)
+        candidates = count * len(ROOMS) * len(SLOTS)
+        (scalar, _), scalar_time = timed(lambda: greedy_select(build_candidates(groups, ROOMS, SLOTS)))
+        (vector, _), vector_time = timed(greedy_select_vectorized, groups, ROOMS, SLOTS)
+        same = summary(scalar) == summary(vector)
+        print(f"{count:>8,} {candidates:>10,} {scalar_time:>10.3f} {vector_time:>10.3f} "
+              f"{scalar_time / vector_time:>7.1f}x  {'✅' if same else '❌'}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
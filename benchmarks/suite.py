@@ -0,0 +1,388 @@
+"""
+ชุด benchmark ของ hot path หลัก: จัดตาราง (greedy / ILP / ผลจาก cache), พยากรณ์, แยกข้อความ และอ่าน/เขียนไฟล์การจอง
+
+    python benchmarks/suite.py                                  ทุกรายการ 10 - 100,000 กลุ่ม
+    python benchmarks/suite.py --only schedule,save --scales 10,1000
+    python benchmarks/suite.py --save-baseline --runs 5         บันทึกผลเป็น baseline
+    python benchmarks/suite.py --check                          exit code 1 ถ้าช้าลง / ใช้หน่วยความจำมากขึ้น
+
+ข้อมูลสุ่มด้วย seed คงที่จาก sample_booking (การกระจายเดียวกับข้อมูลเทรนโมเดลพยากรณ์)
+รายงานต่อ (รายการ, จำนวนกลุ่ม):
+  throughput  -> กลุ่ม (หรือประโยค) ต่อวินาที
+  p50 / p99   -> latency ต่อการเรียกหนึ่งครั้ง (ms) (parse_* วัดทีละประโยค ที่เหลือวัดทั้งชุด)
+  peak        -> หน่วยความจำสูงสุดระหว่างหนึ่งรอบ (tracemalloc, MB) วัดแยกจากรอบจับเวลา
+แต่ละรายการวัดซ้ำ --runs ครั้ง (ค่าเริ่มต้น 3) แล้วใช้ค่าที่ดีที่สุด (best-of-N) ตัด noise ชั่วคราวออก
+
+baseline เก็บขอบเขตของแต่ละรายการจาก noise ที่วัดได้ตอนบันทึก (limit_ms / limit_mb ดู entry_limits)
+--check ล้มเหลวเมื่อ best-of-N ของครั้งนี้เกินขอบเขตนั้น ไม่ใช่สัดส่วนคงที่
+
+benchmarks/baseline.json ใน git เป็นค่าอ้างอิง (informational) บันทึกด้วย --informational
+บนเครื่องเดียวกันแต่ต่างเวลา load / save / schedule_cached ยังต่างกันได้ถึง ~2 เท่า (หน่วยความจำ / I/O ของ host)
+จึงแสดงผลเทียบเท่านั้น ไม่ทำให้ --check คืนค่า 1 สำหรับ gate จริงให้บันทึก baseline ของ commit ฐาน
+แล้วเทียบใน job / เครื่องเดียวกันทันที:
+    git checkout <base> && python benchmarks/suite.py --save-baseline --baseline /tmp/baseline.json
+    git checkout <branch> && python benchmarks/suite.py --check --baseline /tmp/baseline.json
+รายการที่ช้า (ilp, forecast, parse_*) และ schedule_cached จำกัดจำนวนกลุ่มสูงสุดไว้ ใช้ --full เพื่อวัดทุกขนาด
+"""
+import gc
+import io
+import os
+import sys
+import json
+import math
+import time
+import random
+import argparse
+import platform
+import tempfile
+import tracemalloc
+from contextlib import redirect_stdout
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bookingroom.config import ACTIVITY_CONFIG, ROOMS
+from bookingroom.forecast import sample_booking
+from bookingroom.records import make_group
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_SCALES = [10, 100, 1000, 10000, 100000]
+PRIORITIES = [c["priority"] for c in ACTIVITY_CONFIG]
+
+# -----------------------------
+# ข้อมูลสุ่ม (seed คงที่)
+# -----------------------------
+TIME_FORMATS = ["{h} โมง ถึง {h2} โมง", "{h}.00-{h2}.00 น.", "{h}:00 - {h2}:00", "{h} นาฬิกา ถึง {h2} นาฬิกา"]
+SIZE_FORMATS = ["จำนวน {n} คน", "{n} ท่าน", "{n} ที่นั่ง"]
+
+
+def make_groups(count, seed=0):
+    rng = random.Random(seed)
+    groups = []
+    for order in range(1, count + 1):
+        priority, main_start, main_end, alt_start, alt_end, size = sample_booking(PRIORITIES, rng)
+        activity = next(c["category"] for c in ACTIVITY_CONFIG if c["priority"] == priority)
+        groups.append(make_group(order, f"Group_{order}", activity, priority, main_start, main_end, size,
+                                 alt_start, alt_end))
+    return groups
+
+
+def make_sentences(count, seed=0):
+    rng = random.Random(seed)
+    sentences = []
+    for _ in range(count):
+        priority, main_start, main_end, _, _, size = sample_booking(PRIORITIES, rng)
+        config = next(c for c in ACTIVITY_CONFIG if c["priority"] == priority)
+        sentences.append(" ".join([
+            rng.choice(config["keywords"]),
+            rng.choice(TIME_FORMATS).format(h=main_start, h2=main_end),
+            rng.choice(SIZE_FORMATS).format(n=size),
+        ]))
+    return sentences
+
+# -----------------------------
+# รายการที่วัด: setup(scale) คืนค่า (list ของงาน, จำนวนกลุ่มต่องาน)
+# -----------------------------
+def setup_schedule(scale):
+    from bookingroom.scheduler import schedule_with_heuristic
+    from bookingroom.schedule_cache import SCHEDULE_CACHE
+
+    groups = make_groups(scale)
+
+    def solve():
+        SCHEDULE_CACHE.clear() # วัดการจัดตารางจริง ไม่ใช่ผลจาก cache
+        return schedule_with_heuristic(groups, ROOMS)
+
+    return [solve], scale
+
+
+def setup_schedule_cached(scale):
+    from bookingroom.scheduler import schedule_with_heuristic
+
+    # จัดตารางข้อมูลชุดเดิมซ้ำ (เช่น โหลดไฟล์เดิมใหม่) ดึงผลจาก SCHEDULE_CACHE
+    groups = make_groups(scale)
+    return [lambda: schedule_with_heuristic(groups, ROOMS)], scale
+
+
+def setup_ilp(scale):
+    from bookingroom.ilp import schedule_optimal
+
+    groups = make_groups(scale)
+    return [lambda: schedule_optimal(groups, ROOMS, time_limit=60)], scale
+
+
+def setup_forecast(scale):
+    from bookingroom.forecast import load_or_train_model, forecast_hourly_demand
+
+    groups = make_groups(scale)
+    model = load_or_train_model(PRIORITIES, ROOMS, n_estimators=10)
+    return [lambda: forecast_hourly_demand(groups, ROOMS, model)], scale
+
+
+def setup_parse_activity(scale):
+    from bookingroom.nlp import get_activity
+
+    get_activity("ประชุม") # โหลดตัวตัดคำก่อนจับเวลา
+    return [lambda text=text: get_activity(text) for text in make_sentences(scale)], 1
+
+
+def setup_parse_time(scale):
+    from bookingroom.nlp import extract_time_and_size
+
+    return [lambda text=text: extract_time_and_size(text) for text in make_sentences(scale)], 1
+
+
+def _quiet(function, *args):
+    # save_groups / load_groups พิมพ์ข้อความทุกครั้ง
+    with redirect_stdout(io.StringIO()):
+        return function(*args)
+
+
+_tmp_dir = None # โฟลเดอร์ชั่วคราวของ save / load (ลบเมื่อจบโปรแกรม)
+
+def _tmp_path(name):
+    global _tmp_dir
+    if _tmp_dir is None:
+        _tmp_dir = tempfile.TemporaryDirectory(prefix="bench_")
+    return os.path.join(_tmp_dir.name, name)
+
+
+def setup_save(scale):
+    from bookingroom.storage import save_groups
+
+    groups = make_groups(scale)
+    path = _tmp_path(f"Booking_save_{scale}.txt")
+    return [lambda: _quiet(save_groups, groups, path)], scale
+
+
+def setup_load(scale):
+    from bookingroom.storage import load_groups, save_groups
+
+    path = _tmp_path(f"Booking_load_{scale}.txt")
+    _quiet(save_groups, make_groups(scale), path)
+    return [lambda: _quiet(load_groups, path)], scale
+
+
+# ชื่อ -> (setup, จำนวนกลุ่มสูงสุดที่วัดโดยไม่ใช้ --full)
+BENCHMARKS = {
+    "schedule": (setup_schedule, 100000),
+    "schedule_cached": (setup_schedule_cached, 10000),
+    "ilp": (setup_ilp, 1000),
+    "forecast": (setup_forecast, 10000),
+    "parse_activity": (setup_parse_activity, 10000),
+    "parse_time": (setup_parse_time, 100000),
+    "save": (setup_save, 100000),
+    "load": (setup_load, 100000),
+}
+
+# -----------------------------
+# วัดผล
+# -----------------------------
+def percentile(samples, p):
+    """nearest-rank percentile ของ list ที่เรียงแล้ว"""
+    return samples[max(0, math.ceil(p * len(samples)) - 1)]
+
+
+def measure(tasks, items_per_task, budget=1.0, min_rounds=3, max_rounds=50):
+    """รันงานทั้งหมดเป็นรอบ ๆ จนครบ min_rounds และใช้เวลาเกิน budget วินาที (ไม่เกิน max_rounds)"""
+    gc.collect() # ไม่ให้ขยะจากรายการก่อนหน้ามาเก็บระหว่างจับเวลารายการนี้
+    for task in tasks[:1]:
+        task() # warm-up (import / cache)
+
+    samples = []
+    rounds = 0
+    elapsed = 0.0
+    while rounds < max_rounds and (rounds < min_rounds or elapsed < budget):
+        for task in tasks:
+            start = time.perf_counter()
+            task()
+            samples.append(time.perf_counter() - start)
+        elapsed = sum(samples)
+        rounds += 1
+        if len(tasks) > 1 and elapsed >= budget:
+            break # งานทีละประโยค: รอบเดียวก็มีตัวอย่างพอแล้ว
+
+    # หน่วยความจำวัดอีกรอบแยกต่างหาก (tracemalloc ทำให้ช้าลง)
+    tracemalloc.start()
+    for task in tasks:
+        task()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    samples.sort()
+    return {
+        "rounds": rounds,
+        "throughput": items_per_task * len(samples) / elapsed,
+        "p50_ms": percentile(samples, 0.50) * 1000,
+        "p99_ms": percentile(samples, 0.99) * 1000,
+        "peak_mb": peak / 1e6,
+    }
+
+
+def best_of(runs):
+    """
+    รวมผลของการวัดซ้ำหลายครั้ง: p50 / peak / throughput ใช้ครั้งที่ดีที่สุด
+    เก็บ p50 ที่แย่ที่สุดและ p99 สูงสุดไว้ด้วย (ใช้คำนวณขอบเขต noise ตอนบันทึก baseline)
+    """
+    return {
+        "runs": len(runs),
+        "rounds": sum(r["rounds"] for r in runs),
+        "throughput": max(r["throughput"] for r in runs),
+        "p50_ms": min(r["p50_ms"] for r in runs),
+        "p50_worst_ms": max(r["p50_ms"] for r in runs),
+        "p99_ms": max(r["p99_ms"] for r in runs),
+        "peak_mb": min(r["peak_mb"] for r in runs),
+        "peak_worst_mb": max(r["peak_mb"] for r in runs),
+    }
+
+# -----------------------------
+# baseline
+# -----------------------------
+def _cpu_name():
+    # platform.processor() มักว่างบน Linux จึงอ่านจาก /proc/cpuinfo ก่อน
+    try:
+        with open("/proc/cpuinfo", "r", encoding="utf-8") as file:
+            for line in file:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or platform.machine()
+
+
+def machine_info():
+    """เครื่องที่ใช้วัด (เก็บไว้ใน baseline เพื่อเทียบว่าเป็นเครื่องเดียวกันหรือไม่)"""
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpu": _cpu_name(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def load_baseline(path):
+    """คืนค่าเนื้อหาของไฟล์ baseline (dict ที่มี results) หรือ dict ว่างถ้ายังไม่มีไฟล์"""
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return {}
+
+
+def entry_limits(result):
+    """
+    ขอบเขตของหนึ่งรายการจาก noise ที่วัดได้ตอนบันทึก
+    limit_ms: best-of-N p50 ต้องไม่เกิน p99 สูงสุดที่เคยเห็น หรือ p50 ที่แย่ที่สุด + ช่วงกว้างระหว่างครั้ง
+              (เกินค่านี้คือช้ากว่าทุกตัวอย่างเกือบทั้งหมดตอนบันทึก ไม่ใช่ noise)
+    limit_mb: peak ที่แย่ที่สุด + ช่วงกว้างระหว่างครั้ง (อย่างน้อย 1% หรือ 4 KB: tracemalloc แทบไม่แกว่ง
+              แต่รายการเล็ก ๆ ยังต่างกันได้ไม่กี่ KB จาก dict / cache ภายในที่ขยายตัวไม่พร้อมกัน)
+    """
+    p50_spread = result["p50_worst_ms"] - result["p50_ms"]
+    peak_spread = result["peak_worst_mb"] - result["peak_mb"]
+    return {
+        "limit_ms": max(result["p99_ms"], result["p50_worst_ms"] + p50_spread),
+        "limit_mb": result["peak_worst_mb"] + max(peak_spread, 0.01 * result["peak_worst_mb"], 0.004),
+    }
+
+
+def save_baseline(path, results, budget=None, runs=None, informational=False):
+    """results: ผลที่มี limit_ms / limit_mb แล้ว (ดู entry_limits)"""
+    payload = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        **machine_info(),
+        "budget": budget,
+        "runs": runs,
+        "informational": informational,
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(payload, file, ensure_ascii=False, indent=2)
+
+
+def regressions(current, baseline):
+    """
+    คืนค่า list ของข้อความเมื่อ best-of-N p50 หรือ peak ของครั้งนี้เกินขอบเขตที่บันทึกไว้ (entry_limits)
+    รายการใน baseline ที่ไม่มีขอบเขต (รูปแบบเก่า) ไม่ถูกตรวจ
+    """
+    found = []
+    for metric, limit, unit in (("p50_ms", "limit_ms", "ms"), ("peak_mb", "limit_mb", "MB")):
+        old, bound, new = baseline.get(metric), baseline.get(limit), current[metric]
+        if old is not None and bound is not None and new > bound:
+            change = f"+{new / old - 1:.0%}, " if old > 0 else ""
+            found.append(f"{metric} {old:.2f} -> {new:.2f} {unit} ({change}ขอบเขต {bound:.2f})")
+    return found
+
+# -----------------------------
+# Command line
+# -----------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="benchmark ของระบบจัดตารางห้องประชุม")
+    parser.add_argument("--only", help=f"เลือกรายการ คั่นด้วย , ({', '.join(BENCHMARKS)})")
+    parser.add_argument("--scales", help="จำนวนกลุ่ม คั่นด้วย , (ค่าเริ่มต้น 10,100,1000,10000,100000)")
+    parser.add_argument("--full", action="store_true", help="วัดทุกขนาด ไม่จำกัดจำนวนกลุ่มของรายการที่ช้า")
+    parser.add_argument("--budget", type=float, default=1.0, help="เวลาจับเวลาขั้นต่ำต่อรายการ (วินาที)")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="ไฟล์ baseline")
+    parser.add_argument("--runs", type=int, default=3, help="วัดซ้ำกี่ครั้งต่อรายการ (ใช้ค่าที่ดีที่สุด)")
+    parser.add_argument("--save-baseline", action="store_true", help="บันทึกผลครั้งนี้เป็น baseline")
+    parser.add_argument("--informational", action="store_true",
+                        help="บันทึก baseline เป็นค่าอ้างอิง (--check แสดงผลเทียบแต่ไม่คืนค่า 1)")
+    parser.add_argument("--check", action="store_true", help="exit code 1 ถ้ามีรายการแย่ลงกว่า baseline")
+    args = parser.parse_args(argv)
+
+    names = args.only.split(",") if args.only else list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"ไม่รู้จักรายการ: {', '.join(unknown)}")
+    scales = [int(x) for x in args.scales.split(",")] if args.scales else DEFAULT_SCALES
+    saved = load_baseline(args.baseline)
+    baseline = saved.get("results", {})
+    informational = saved.get("informational", False)
+
+    machine = machine_info()
+    print(f"Python {machine['python']}, {machine['cpus']} CPU ({machine['cpu']})"
+          + (f", เทียบกับ baseline {args.baseline}" + (" (informational)" if informational else "")
+             if baseline else ""))
+    different = [field for field in machine if field in saved and saved[field] != machine[field]]
+    if baseline and different:
+        print(f"⚠️ baseline วัดจากเครื่องอื่น ({', '.join(f'{f}={saved[f]}' for f in different)}) "
+              f"ผลเทียบอาจไม่ตรง ให้สร้าง baseline ของเครื่องนี้ด้วย --save-baseline --baseline <ไฟล์>")
+    print(f"{'รายการ':<16} {'กลุ่ม':>8} {'รอบ':>5} {'ต่อวินาที':>12} {'p50 (ms)':>10} {'p99 (ms)':>10} "
+          f"{'peak (MB)':>10}  เทียบ baseline")
+
+    results = {}
+    failed = []
+    for name in names:
+        setup, max_scale = BENCHMARKS[name]
+        for scale in scales:
+            if scale > max_scale and not args.full:
+                continue
+            key = f"{name}/{scale}"
+            tasks, items_per_task = setup(scale)
+            result = results[key] = best_of([measure(tasks, items_per_task, args.budget)
+                                             for _ in range(max(args.runs, 1))])
+
+            note = ""
+            if key in baseline:
+                found = regressions(result, baseline[key])
+                note = "❌ " + ", ".join(found) if found else "✅"
+                if found:
+                    failed.append(key)
+            print(f"{name:<16} {scale:>8,} {result['rounds']:>5} {result['throughput']:>12,.0f} "
+                  f"{result['p50_ms']:>10.2f} {result['p99_ms']:>10.2f} {result['peak_mb']:>10.2f}  {note}")
+
+    if args.save_baseline:
+        recorded = {key: {**result, **entry_limits(result)} for key, result in results.items()}
+        save_baseline(args.baseline, {**baseline, **recorded}, args.budget, args.runs, args.informational)
+        print(f"✅ บันทึก baseline {len(results)} รายการใน {args.baseline}")
+    if failed:
+        print(f"❌ แย่ลงกว่า baseline: {', '.join(failed)}")
+        if informational:
+            print("ℹ️ baseline นี้เป็นค่าอ้างอิง (informational) ไม่นับเป็นความล้มเหลว "
+                  "ใช้ --save-baseline --baseline <ไฟล์> บนเครื่อง / job เดียวกันเพื่อเป็น gate")
+            return 0
+        return 1 if args.check else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
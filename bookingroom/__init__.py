@@ -0,0 +1,29 @@
+"""
+bookingroom - ระบบจัดตารางห้องประชุม COC (ใช้ร่วมกันระหว่างสคริปต์หน้าบ้านทุกตัว)
+
+    from bookingroom import ROOMS, schedule_with_heuristic, load_groups
+
+โมดูลที่ใช้ library หนัก (sklearn, numpy, PyThaiNLP, sqlite3) จะโหลดตอนใช้งานจริงเท่านั้น
+"""
+from bookingroom.config import (ACTIVITY_CONFIG, ACTIVITIES, ROOMS, DAY_START, DAY_END,
+                                SCORING_PROFILES)
+from bookingroom.metrics import METRICS, span, count, snapshot, to_prometheus, to_json
+from bookingroom.scoring import ScoringProfile, get_profile
+from bookingroom.schedule_cache import ScheduleCache, SCHEDULE_CACHE
+from bookingroom.availability import TICK_MINUTES, AvailabilityGrid
+from bookingroom.room_calendar import RoomCalendar
+from bookingroom.timeutil import to_minutes, to_hhmm, to_hours, format_time, slot_minutes
+from bookingroom.records import Group, Assignment, as_dict, make_group, set_main_time
+from bookingroom.scheduler import (calculate_heuristic_score, build_candidates, greedy_select,
+                                   schedule_greedy, schedule_with_heuristic, SCHEDULER_MODES,
+                                   schedule_groups, IncrementalScheduler, room_calendars,
+                                   score_alternative, suggest_alternative_times, find_alternative_times)
+from bookingroom.vectorized import score_tensor, ranked_candidates, greedy_select_vectorized
+from bookingroom.storage import (booking_filename, save_groups, load_groups, booking_file_dates,
+                                 BookingJournal, JsonlStorage, SqliteStorage, open_storage)
+from bookingroom.matcher import AhoCorasick, ActivityMatcher, get_matcher
+from bookingroom.nlp import (get_activity, get_size, get_time, extract_time_and_size, find_time_range,
+                             parse_booking_text)
+from bookingroom.forecast import forecast_hourly_demand, load_or_train_model, LazyDemandModel
+from bookingroom.ilp import (CONSTRAINT_MODES, overlap_cliques, build_room_model, selected_assignments,
+                             schedule_optimal)
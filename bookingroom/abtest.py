@@ -0,0 +1,101 @@
+"""
+เปรียบเทียบชุดน้ำหนักคะแนน (SCORING_PROFILES) กับข้อมูลการจองจริง
+
+    python -m bookingroom.abtest                                   ทุกไฟล์ Data/Booking_*.txt ทุก profile
+    python -m bookingroom.abtest Data/Booking_2025-12-09.txt --profiles default,fit_rooms
+    python -m bookingroom.abtest --slots main,alt --workers 4
+
+จัดตาราง (greedy) ของแต่ละ (ไฟล์, profile) แยก process กันแบบขนาน แล้วรายงาน
+จำนวนกลุ่มที่ได้ห้อง, สัดส่วนเวลาที่ห้องถูกใช้, สัดส่วนที่นั่งที่ใช้จริง และเวลาที่ใช้จัดตาราง
+"""
+import os
+import sys
+import glob
+import time
+import argparse
+
+from bookingroom.config import ROOMS, DAY_START, DAY_END, SCORING_PROFILES
+from bookingroom.storage import DATA_DIR, load_groups
+from bookingroom.scheduler import schedule_with_heuristic
+from bookingroom.scoring import get_profile
+
+# -----------------------------
+# ตัวชี้วัดของผลการจัดตาราง
+# -----------------------------
+def utilization(groups, assignments, rooms):
+    """คืนค่า dict: scheduled, total, room_time, seats, main_slot"""
+    day_minutes = (DAY_END - DAY_START) * 60
+    booked_minutes = sum(max(0, a["end"] - a["start"]) for a in assignments)
+    booked_seats = sum(a["group"]["size"] for a in assignments)
+    offered_seats = sum(a["room"]["capacity"] for a in assignments)
+    return {
+        "scheduled": len(assignments),
+        "total": len(groups),
+        "room_time": booked_minutes / (day_minutes * len(rooms)) if rooms else 0.0,
+        "seats": booked_seats / offered_seats if offered_seats else 0.0,
+        "main_slot": sum(a["slot"] == "main" for a in assignments) / len(assignments) if assignments else 0.0,
+    }
+
+
+def run_profile(path, profile_name, slots=("main",), rooms=ROOMS):
+    """จัดตารางไฟล์เดียวด้วย profile เดียว (รันใน process pool) คืนค่า dict ของผลลัพธ์"""
+    groups = load_groups(path)
+    profile = get_profile(profile_name)
+
+    start = time.perf_counter()
+    assignments = schedule_with_heuristic(groups, rooms, slots, profile)
+    elapsed = time.perf_counter() - start
+
+    result = utilization(groups, assignments, rooms)
+    result.update({"file": os.path.basename(path), "profile": profile.name, "seconds": elapsed})
+    return result
+
+
+def run_ab(paths, profiles, slots=("main",), workers=None):
+    """รันทุก (ไฟล์, profile) คืนค่า list ของผลลัพธ์ตามลำดับไฟล์แล้วตามลำดับ profile"""
+    jobs = [(path, name) for path in paths for name in profiles]
+    workers = min(workers or os.cpu_count() or 1, len(jobs)) or 1
+    if workers == 1:
+        return [run_profile(path, name, slots) for path, name in jobs]
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_profile, path, name, slots) for path, name in jobs]
+        return [future.result() for future in futures]
+
+# -----------------------------
+# Command line
+# -----------------------------
+def print_report(results):
+    print(f"\n{'ไฟล์':<26} {'profile':<12} {'ได้ห้อง':>9} {'เวลาห้อง':>9} {'ที่นั่ง':>8} "
+          f"{'เวลาหลัก':>9} {'เวลา (ms)':>10}")
+    for r in results:
+        print(f"{r['file']:<26} {r['profile']:<12} {r['scheduled']:>4}/{r['total']:<4} "
+              f"{r['room_time']:>9.1%} {r['seats']:>8.1%} {r['main_slot']:>9.1%} {r['seconds'] * 1000:>10.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="เปรียบเทียบ scoring profile กับไฟล์การจอง")
+    parser.add_argument("paths", nargs="*", help="ไฟล์ Booking_<วันที่>.txt (ค่าเริ่มต้น: ทุกไฟล์ใน Data/)")
+    parser.add_argument("--profiles", default=",".join(SCORING_PROFILES),
+                        help="ชื่อ profile คั่นด้วย , (ค่าเริ่มต้น: ทุก profile ใน config)")
+    parser.add_argument("--slots", default="main", help="slot ที่ให้เลือก เช่น main หรือ main,alt")
+    parser.add_argument("--workers", type=int, help="จำนวน process (ค่าเริ่มต้นตามจำนวน CPU)")
+    args = parser.parse_args(argv)
+
+    paths = args.paths or sorted(glob.glob(os.path.join(DATA_DIR, "Booking_*.txt")))
+    if not paths:
+        print(f"❌ ไม่พบไฟล์การจองใน {DATA_DIR}/")
+        return 1
+    profiles = [name.strip() for name in args.profiles.split(",") if name.strip()]
+    for name in profiles:
+        get_profile(name) # ตรวจชื่อ profile ก่อนเริ่ม process
+
+    results = run_ab(paths, profiles, tuple(args.slots.split(",")), args.workers)
+    print_report(results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+from bookingroom.config import DAY_START, DAY_END
+
+# -----------------------------
+# ตารางว่างของห้องแบบ bitset (1 bit ต่อช่วงเวลา 5 นาที ในเวลาทำการ)
+# -----------------------------
+# bit ที่ i = ช่วง [DAY_START + i*5, DAY_START + (i+1)*5) นาที ถ้าเป็น 1 คือมีการจองแตะช่วงนั้น
+# การจองถูกปัดออกให้เต็มช่อง (9.07 - 9.13 -> ช่อง 9.05 และ 9.10) ดังนั้น
+#   - "ว่าง" จาก bitset เชื่อได้เสมอ (ใช้ AND ของ int ครั้งเดียว)
+#   - "ไม่ว่าง" อาจเป็นแค่เศษของช่องที่ทับกัน ต้องตรวจละเอียดจาก RoomCalendar ต่อ
+TICK_MINUTES = 5
+
+
+class AvailabilityGrid:
+    def __init__(self, day_start=DAY_START * 60, day_end=DAY_END * 60, tick=TICK_MINUTES):
+        self.day_start = day_start
+        self.day_end = day_end
+        self.tick = tick
+        self.size = -(-(day_end - day_start) // tick) # จำนวนช่อง (ปัดขึ้น)
+        self.full = (1 << self.size) - 1
+        self.busy = 0
+
+    def _ticks(self, start, end):
+        # ช่อง [first, last) ที่ช่วง [start, end) แตะ (ช่วงยาวศูนย์นับช่องที่มันอยู่)
+        first = (start - self.day_start) // self.tick
+        last = max(-((self.day_start - end) // self.tick), first + 1)
+        return first, last
+
+    def mask(self, start, end):
+        """bitmask ของช่วง [start, end) (นาที) หรือ None ถ้าอยู่นอกเวลาทำการ"""
+        if start < self.day_start or end > self.day_end or end < start:
+            return None
+        first, last = self._ticks(start, end)
+        if last > self.size:
+            return None
+        return ((1 << (last - first)) - 1) << first
+
+    def is_free(self, start, end):
+        """True = ว่างแน่นอน, False = อาจไม่ว่าง หรืออยู่นอกเวลาทำการ (ให้ตรวจจากปฏิทินต่อ)"""
+        mask = self.mask(start, end)
+        return mask is not None and not self.busy & mask
+
+    def mark(self, start, end):
+        """บันทึกการจอง [start, end) ส่วนที่อยู่นอกเวลาทำการถูกตัดทิ้ง"""
+        if end < start:
+            return
+        if start == end:
+            if not self.day_start <= start < self.day_end:
+                return
+        else:
+            start, end = max(start, self.day_start), min(end, self.day_end)
+            if start >= end:
+                return
+        first, last = self._ticks(start, end)
+        self.busy |= ((1 << (last - first)) - 1) << first
+
+    def clear(self):
+        self.busy = 0
+
+    def free_starts(self, duration, step=1):
+        """
+        เวลาเริ่ม (นาที) ทุกจุดบนเส้นช่อง ที่ว่างต่อเนื่องอย่างน้อย duration นาที
+        ใช้ shift-AND ของ int: หลังรอบที่ k bit i บอกว่าช่อง i .. i + width - 1 ว่างทั้งหมด
+        step: เลือกเฉพาะจุดเริ่มทุก ๆ step ช่อง (เช่น 12 = ทุกต้นชั่วโมง)
+        """
+        length = max(-(-duration // self.tick), 1)
+        runs = self.full & ~self.busy
+        width = 1
+        while width < length and runs:
+            shift = min(width, length - width)
+            runs &= runs >> shift
+            width += shift
+
+        starts = []
+        while runs:
+            low = runs & -runs
+            index = low.bit_length() - 1
+            if index % step == 0:
+                starts.append(self.day_start + index * self.tick)
+            runs ^= low
+        return starts
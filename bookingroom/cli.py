@@ -0,0 +1,170 @@
+from bookingroom.config import ACTIVITIES
+from bookingroom.nlp import parse_booking_text
+from bookingroom.records import make_group
+from bookingroom.timeutil import to_hhmm, format_time
+
+# -----------------------------
+# ส่วนติดต่อผู้ใช้ (input / print) ที่ใช้ร่วมกันในทุกสคริปต์
+# -----------------------------
+
+# รับข้อมูลกลุ่มแบบเลือกจากเมนู (เวอร์ชันพื้นฐาน)
+def input_manual_group(order, activities=ACTIVITIES):
+    print("=== ข้อมูลกลุ่ม ===")
+    id = input("ชื่อกลุ่ม (ภาษาอังกฤษ): ")
+
+    print("เลือกกิจกรรม:")
+    for i, act in enumerate(activities.keys(), 1):
+        print(f"{i}. {act}")
+
+    activity_name = ""
+    priority = 0
+    while True:
+        try:
+            choice = int(input("เลือกกิจกรรม (1-5): "))
+        except ValueError:
+            print("กรุณาใส่ตัวเลขจากรายการ")
+            continue
+        if 1 <= choice <= len(activities):
+            activity_name = list(activities.keys())[choice-1]
+            priority = activities[activity_name]
+            print(f"✅ คุณเลือก {activity_name}")
+            break
+        else:
+            print("กรุณาเลือกตัวเลขจากรายการ")
+
+    while True:
+        try:
+            main_start = float(input("เวลาเริ่ม (หลัก): "))
+            main_end = float(input("เวลาสิ้นสุด (หลัก): "))
+            if 8 <= main_start < main_end <= 18:
+                break
+            else:
+                print("กรุณาใส่เวลาในช่วง 8.00 - 18.00 น.")
+        except ValueError:
+            print("กรุณาใส่ตัวเลขจากรายการ")
+
+    while True:
+        try:
+            alt_start = float(input("เวลาเริ่ม (สำรอง): "))
+            alt_end = float(input("เวลาสิ้นสุด (สำรอง): "))
+            if 8 <= alt_start < alt_end <= 18:
+                break
+            else:
+                print("กรุณาใส่เวลาในช่วง 8.00 - 18.00 น.")
+        except ValueError:
+            print("กรุณาใส่ตัวเลขจากรายการ")
+
+    size = int(input("จำนวนผู้เข้าร่วม: "))
+    return make_group(order, id, activity_name, priority, main_start, main_end, size,
+                      alt_start, alt_end)
+
+# รับข้อมูลกลุ่มจากประโยค (เวอร์ชัน AI)
+def input_text_group(order, ask_time=False):
+    """ask_time=True: ถ้าหาเวลาในประโยคไม่เจอให้ผู้ใช้กรอกเอง (ไม่งั้นใช้ 0.0)"""
+    print("\n--- 📝 กรอกข้อมูล ---")
+    id = input("ชื่อผู้จอง/กลุ่ม: ")
+    if not id: id = f"Group_{order}"
+
+    print("ตัวอย่าง: จองห้องประชุมวิชาการ เวลา 9.00-11.30 น. จำนวน 10 คน")
+    input_text = input("รายละเอียดกิจกรรม: ")
+
+    parsed = parse_booking_text(input_text)
+    start_time, end_time = parsed["start"], parsed["end"]
+
+    if start_time is not None:
+        start_time, end_time = to_hhmm(start_time), to_hhmm(end_time) # นาที -> 9.30 แบบที่บันทึกในไฟล์
+    else:
+        start_time = end_time = 0.0
+        if ask_time:
+            print("⚠️ ระบบตรวจจับเวลาไม่ได้ กรุณาระบุเวลาเอง (เช่น 9.00):")
+            try:
+                start_time = float(input("Start Time: ").replace(":", "."))
+                end_time = float(input("End Time: ").replace(":", "."))
+            except ValueError:
+                start_time = 9.00
+                end_time = 10.00
+
+    return make_group(order, id, parsed["activity"], parsed["priority"], start_time, end_time,
+                      parsed["size"])
+
+# -----------------------------
+# แสดงตารางการจอง
+# -----------------------------
+def print_schedule(assignments):
+    """เรียงตามเวลาเริ่ม (start / end ของ assignment เป็นนาที)"""
+    if not assignments:
+        print("❌ ยังไม่มีการจองที่จัดสรรได้")
+        return
+
+    print("\n=== 📅 ตารางการจอง ===")
+    sorted_display = sorted(assignments, key=lambda x: x['start'])
+    for assign in sorted_display:
+        g = assign["group"]
+        r = assign["room"]
+        start = assign["start"]
+        end = assign["end"]
+        score = assign["score"]
+        print(f"🔹 {format_time(start)} - {format_time(end)} | ห้อง: {r['id']:<12} | กลุ่ม: {g['id']:<10} (คะแนน: {score:.2f})")
+
+
+def print_schedule_by_room(assignments, rooms):
+    """แยกตามห้อง"""
+    if not assignments:
+        print("❌ ยังไม่มีการจองที่จัดสรรได้")
+        return
+
+    print("\n=== 📅 ตารางการจอง (แยกตามห้อง) ===\n")
+
+    room_schedule = {room["id"]: [] for room in rooms}
+    for assign in assignments:
+        room_schedule[assign["room"]["id"]].append(
+            (assign["start"], assign["end"], assign["group"], assign["score"]))
+
+    for room_id in room_schedule:
+        print(f"🏢 ห้อง {room_id}")
+        schedule = sorted(room_schedule[room_id], key=lambda x: x[0])
+
+        if not schedule:
+            print("   (ไม่มีการใช้งาน)")
+        else:
+            for (start, end, g, score) in schedule:
+                print(f"   {format_time(start)} - {format_time(end)} | กลุ่ม: {g['id']:<10} (คะแนน: {score:.2f})")
+        print("-" * 50)
+
+# -----------------------------
+# แสดงผลการพยากรณ์
+# -----------------------------
+def print_forecast(avg_time_demand, bar_scale=2):
+    for hour, demand in avg_time_demand.items():
+        bar = '█' * int(demand * bar_scale)
+        print(f"{hour:02d}.00 - {hour+1:02d}.00 | Demand: {demand:4.2f} | {bar}")
+
+    if avg_time_demand:
+        min_hour = min(avg_time_demand, key=avg_time_demand.get)
+        max_hour = max(avg_time_demand, key=avg_time_demand.get)
+        print("\n🔹 สรุปช่วงเวลา:")
+        print(f"   ⬇️ ใช้งานน้อยที่สุด: {min_hour:02d}.00 - {min_hour+1:02d}.00")
+        print(f"   ⬆️ ใช้งานมากที่สุด: {max_hour:02d}.00 - {max_hour+1:02d}.00")
+
+# -----------------------------
+# ให้ผู้ใช้เลือกช่วงเวลาที่ระบบแนะนำ
+# -----------------------------
+def choose_alternative(group, alternatives):
+    """คืนค่า alternative ที่ผู้ใช้เลือก หรือ None ถ้ายกเลิก"""
+    print(f"\n❌ เวลาที่คุณเลือก {group['main_start']:.2f} – {group['main_end']:.2f} ไม่ว่างในทุกห้อง\n")
+    if not alternatives:
+        print("❌ ไม่พบช่วงเวลาว่างที่รองรับจำนวนผู้เข้าร่วมได้ในวันนี้")
+        return None
+    print("🔎 ระบบได้ค้นหาช่วงเวลาใกล้เคียงที่เหมาะสมที่สุดให้คุณ:\n")
+
+    for i, alt in enumerate(alternatives[:3], start=1):
+        mark = "✓" if i == 1 else ""
+        print(f"{i}) {format_time(alt['start'])} – {format_time(alt['end'])} {mark}")
+        print(f"   • ห้อง: {alt['room']}")
+        print(f"   • ความหนาแน่นผู้ใช้งาน {alt['density']}")
+        print(f"   • คะแนนเหมาะสม = {alt['score']:.1f}\n")
+    choice = input("คุณต้องการยืนยันเวลาข้อไหน?\nพิมพ์หมายเลข (1-3) หรือ 0 เพื่อยกเลิกการจอง: ")
+
+    if choice in ["1", "2", "3"] and int(choice) <= len(alternatives):
+        return alternatives[int(choice) - 1]
+    return None
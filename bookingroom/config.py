@@ -0,0 +1,67 @@
+# -----------------------------
+# ข้อมูลกิจกรรม และ Priority (เวอร์ชัน AI: จับคู่จาก keyword)
+# -----------------------------
+ACTIVITY_CONFIG = [
+    {
+        "category": "Meeting/Work",
+        "priority": 5,
+        "keywords": ["ประชุม", "meet", "conf", "discuss", "คุยงาน", "บรีฟ"]
+    },
+    {
+        "category": "Presentation",
+        "priority": 4,
+        "keywords": ["พรีเซน", "เสนอ", "present", "pitch", "demo", "ขายงาน"]
+    },
+    {
+        "category": "Study/Club",
+        "priority": 3,
+        "keywords": ["เรียน", "สอบ", "ติว", "ชมรม", "class", "exam", "quiz", "club", "กิจกรรม"]
+    },
+    {
+        "category": "Group Work",
+        "priority": 2,
+        "keywords": ["ทำงาน", "งานกลุ่ม", "group", "project", "homework", "assignment"]
+    },
+    {
+        "category": "Relax",
+        "priority": 1,
+        "keywords": ["นอน", "พัก", "เล่น", "game", "ดูหนัง", "กิน"]
+    }
+]
+
+# -----------------------------
+# ข้อมูลกิจกรรม และ Priority (เวอร์ชันพื้นฐาน: เลือกจากเมนู)
+# -----------------------------
+ACTIVITIES = {
+    "กิจกรรม : ประชุม": 5,
+    "กิจกรรม : พรีเซนต์งาน": 4,
+    "กิจกรรม : กิจกรรมชมรม": 3,
+    "กิจกรรม : ทำงาน/ทำการบ้าน": 2,
+    "กิจกรรม : พักผ่อน": 1
+}
+
+# -----------------------------
+# ข้อมูลห้อง
+# -----------------------------
+ROOMS = [
+    {"id": "COC air 1", "capacity": 8},
+    {"id": "COC air 2", "capacity": 8},
+    {"id": "COC common", "capacity": 12}
+]
+
+# ช่วงเวลาทำการ (ชั่วโมง)
+DAY_START = 8
+DAY_END = 18
+
+# -----------------------------
+# น้ำหนักคะแนนการจัดตาราง (เลือกด้วย BOOKING_SCORING=<ชื่อ> ค่าเริ่มต้น default)
+# -----------------------------
+#   order        -> น้ำหนักสำหรับลำดับการจอง (x 1/order)
+#   priority     -> น้ำหนักสำหรับ Priority
+#   main_slot    -> น้ำหนักโบนัสสำหรับเวลาหลัก
+#   wasted_space -> น้ำหนักติดลบสำหรับพื้นที่ที่เสียไป (ความจุห้อง - จำนวนคน)
+SCORING_PROFILES = {
+    "default": {"order": 1, "priority": 10, "main_slot": 5, "wasted_space": 0.5},
+    "fit_rooms": {"order": 1, "priority": 10, "main_slot": 5, "wasted_space": 2},     # เน้นห้องขนาดพอดี
+    "first_come": {"order": 40, "priority": 2, "main_slot": 5, "wasted_space": 0.5},  # เน้นจองก่อนได้ก่อน
+}
@@ -0,0 +1,216 @@
+import os
+import json
+import random
+import hashlib
+
+from bookingroom.metrics import span, count
+from bookingroom.timeutil import slot_minutes
+
+# numpy / sklearn / joblib ถูก import ภายในฟังก์ชัน เพื่อให้เปิดโปรแกรมได้ทันที
+# (โหลดเมื่อใช้งานการพยากรณ์ครั้งแรกเท่านั้น)
+
+# ลำดับ feature ต้องตรงกับตอน Train (generate_training_data)
+# เปลี่ยน FEATURE_SCHEMA_VERSION ทุกครั้งที่แก้ FEATURES หรือสูตรใน generate_training_data
+FEATURE_SCHEMA_VERSION = 1
+FEATURES = ["size", "priority", "main_start", "main_end", "alt_start", "alt_end",
+            "duration_main", "duration_alt", "room_capacity", "hour"]
+
+# -----------------------------
+# [AI] พยากรณ์ความต้องการใช้ห้อง
+# -----------------------------
+def _along(values, axis, shape):
+    # ขยาย array 1 มิติให้เป็นขนาด shape โดยวางค่าตามแกน axis (ไม่ copy ข้อมูล)
+    import numpy as np
+
+    index = [None] * len(shape)
+    index[axis] = slice(None)
+    return np.broadcast_to(values[tuple(index)], shape)
+
+
+def build_forecast_features(groups, rooms, hours):
+    """
+    สร้าง feature matrix ของทุก (group, hour, room) ในครั้งเดียว
+    คืนค่า array ขนาด (len(groups) * len(hours) * len(rooms), len(FEATURES))
+    """
+    import numpy as np
+
+    size = np.array([g["size"] for g in groups], dtype=float)
+    priority = np.array([g["priority"] for g in groups], dtype=float)
+    # โมเดลใช้เวลาเป็นชั่วโมงจริง (9.30 น. -> 9.5) คำนวณจากนาที ไม่ใช้ duration_alt ที่บันทึกไว้
+    # เพราะไฟล์เก่าเก็บผลลบทศนิยมแบบ ชั่วโมง.นาที (9.30 - 11.00 = 1.70)
+    alt_minutes = np.array([slot_minutes(g, "alt") for g in groups], dtype=float).reshape(-1, 2)
+    alt_start = alt_minutes[:, 0] / 60
+    alt_end = alt_minutes[:, 1] / 60
+    duration_alt = alt_end - alt_start
+    hour = np.asarray(hours, dtype=float)
+    room_capacity = np.array([r["capacity"] for r in rooms], dtype=float)
+
+    shape = (len(groups), len(hour), len(room_capacity))
+    group_axis, hour_axis, room_axis = 0, 1, 2
+
+    duration_main = 1
+    columns = [
+        _along(size, group_axis, shape),
+        _along(priority, group_axis, shape),
+        _along(hour, hour_axis, shape),                  # main_start
+        _along(hour + duration_main, hour_axis, shape),  # main_end
+        _along(alt_start, group_axis, shape),
+        _along(alt_end, group_axis, shape),
+        np.full(shape, duration_main, dtype=float),
+        _along(duration_alt, group_axis, shape),
+        _along(room_capacity, room_axis, shape),
+        _along(hour, hour_axis, shape),
+    ]
+    return np.stack(columns, axis=-1).reshape(-1, len(FEATURES))
+
+
+@span("forecast.total")
+def forecast_hourly_demand(groups, rooms, rf_model, day_start=8, day_end=18, max_end=18):
+    """
+    ค่าเฉลี่ย demand รายชั่วโมงจาก rf_model
+    เรียก predict ครั้งเดียวกับทุก (group, hour, room) แล้วเฉลี่ยด้วย NumPy
+    ชั่วโมงที่ main_end (hour + 1) เกิน max_end จะได้ค่า 0
+    """
+    hours = [h for h in range(day_start, day_end) if h + 1 <= max_end]
+    avg_time_demand = {hour: 0 for hour in range(day_start, day_end)}
+    if not groups or not rooms or not hours:
+        return avg_time_demand
+
+    with span("forecast.features"):
+        features = build_forecast_features(groups, rooms, hours)
+    with span("forecast.predict"):
+        demand = rf_model.predict(features).reshape(len(groups), len(hours), len(rooms))
+    count("predictions", len(features))
+    hourly = demand.mean(axis=(0, 2))
+
+    for hour, avg in zip(hours, hourly):
+        avg_time_demand[hour] = float(avg)
+    return avg_time_demand
+
+
+# -----------------------------
+# [AI] สร้างข้อมูลเทรน
+# -----------------------------
+def sample_booking(priorities, rng=random):
+    """
+    สุ่มคำขอจองหนึ่งรายการ (การกระจายเดียวกับข้อมูลเทรน ใช้ใน benchmark ด้วย)
+    คืนค่า (priority, main_start, main_end, alt_start, alt_end, size) เวลาเป็นชั่วโมงเต็ม
+    """
+    priority = rng.choice(priorities)
+
+    duration_main = rng.randint(1, 3)
+    main_start = rng.randint(8, 18 - duration_main)
+    main_end = main_start + duration_main
+    duration_alt = rng.randint(1, 3)
+    alt_start = rng.randint(8, 17 - duration_alt)
+    alt_end = alt_start + duration_alt
+    size = rng.randint(1, 10)
+    return priority, main_start, main_end, alt_start, alt_end, size
+
+
+def generate_training_data(priorities, rooms, num_samples=1000, rng=random):
+    import numpy as np
+
+    data = []
+    labels = []
+    for _ in range(num_samples):
+        priority, main_start, main_end, alt_start, alt_end, size = sample_booking(priorities, rng)
+        duration_main = main_end - main_start
+        duration_alt = alt_end - alt_start
+        hour = main_start
+        room = rng.choice(rooms)
+        room_capacity = room["capacity"]
+        demand = (0.5 * priority + 0.2 * size + 0.1 * (room_capacity - size) + 0.1 * (12 - abs(hour - 12))) + rng.uniform(-0.5, 0.5)
+        data.append([size, priority, main_start, main_end, alt_start, alt_end, duration_main, duration_alt, room_capacity, hour])
+        labels.append(demand)
+    return np.array(data), np.array(labels)
+
+# -----------------------------
+# [AI] Model cache: เทรนครั้งเดียวแล้วเก็บไฟล์ไว้ใช้ซ้ำ
+# -----------------------------
+MODEL_DIR = os.path.join("Data", "models")
+
+def model_config(priorities, rooms, n_estimators=100, num_samples=1000, seed=0):
+    """ค่าที่มีผลต่อโมเดล ถ้าค่าใดเปลี่ยนจะต้องเทรนใหม่"""
+    import sklearn
+
+    return {
+        "schema": FEATURE_SCHEMA_VERSION,
+        "features": FEATURES,
+        "priorities": list(priorities),
+        "room_capacities": [r["capacity"] for r in rooms],
+        "n_estimators": n_estimators,
+        "num_samples": num_samples,
+        "seed": seed,
+        "sklearn": sklearn.__version__,
+    }
+
+
+def config_hash(config):
+    payload = json.dumps(config, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+
+def train_model(config):
+    from sklearn.ensemble import RandomForestRegressor
+
+    rng = random.Random(config["seed"])
+    rooms = [{"capacity": capacity} for capacity in config["room_capacities"]]
+    X_train, y_train = generate_training_data(config["priorities"], rooms, config["num_samples"], rng)
+    rf_model = RandomForestRegressor(n_estimators=config["n_estimators"], random_state=config["seed"])
+    rf_model.fit(X_train, y_train)
+    return rf_model
+
+
+def load_or_train_model(priorities, rooms, n_estimators=100, num_samples=1000, seed=0,
+                        model_dir=None):
+    """
+    โหลดโมเดลจาก Data/models/demand_rf_<hash>.joblib ถ้ามี config ตรงกัน
+    ถ้าไม่มี (หรือ schema/config เปลี่ยน) จะเทรนใหม่แล้วบันทึกไว้
+    """
+    import joblib
+
+    model_dir = model_dir or MODEL_DIR
+    config = model_config(priorities, rooms, n_estimators, num_samples, seed)
+    path = os.path.join(model_dir, f"demand_rf_{config_hash(config)}.joblib")
+
+    try:
+        artifact = joblib.load(path)
+        if artifact.get("config") == config:
+            return artifact["model"]
+        print(f"⚠️ config ของโมเดลใน {path} ไม่ตรงกัน ระบบจะเทรนใหม่")
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"⚠️ โหลดโมเดลจาก {path} ไม่ได้ ({e}) ระบบจะเทรนใหม่")
+
+    rf_model = train_model(config)
+
+    os.makedirs(model_dir, exist_ok=True)
+    tmp_path = path + ".tmp"
+    joblib.dump({"config": config, "model": rf_model}, tmp_path)
+    os.replace(tmp_path, path)
+    return rf_model
+
+
+class LazyDemandModel:
+    """
+    ตัวแทนโมเดลที่ยังไม่โหลด: เรียก load_or_train_model ตอน predict ครั้งแรก
+    เมนูที่ไม่ได้ใช้การพยากรณ์จึงไม่ต้องโหลด sklearn เลย
+    """
+
+    def __init__(self, priorities, rooms, **kwargs):
+        self.priorities = list(priorities)
+        self.rooms = rooms
+        self.kwargs = kwargs
+        self._model = None
+
+    @property
+    def model(self):
+        if self._model is None:
+            with span("forecast.model_load"):
+                self._model = load_or_train_model(self.priorities, self.rooms, **self.kwargs)
+        return self._model
+
+    def predict(self, features):
+        return self.model.predict(features)
@@ -0,0 +1,103 @@
+"""
+จัดตารางหลายวัน (ทั้งสัปดาห์ / ทั้งเดือน) ในครั้งเดียว
+
+    python -m bookingroom.horizon 2025-12-08 2025-12-14                ทั้งสัปดาห์
+    python -m bookingroom.horizon 2025-12-01 2025-12-31 --workers 4 --slots main,alt --save
+
+แต่ละวันไม่เกี่ยวข้องกัน จึงจัดตารางแยกวันใน process pool: process ลูกโหลดข้อมูลของวันนั้นเอง
+(ส่งไปแค่วันที่ ไม่ต้องส่งข้อมูลกลุ่มข้าม process) และโหลดเฉพาะวันที่มีการจอง
+(ไฟล์ Data/Booking_<วันที่>.txt หรือ index ของตาราง groups ใน SQLite)
+"""
+import os
+import sys
+import argparse
+from datetime import date as _date, timedelta
+
+from bookingroom.config import ROOMS
+from bookingroom.storage import open_storage
+from bookingroom.scheduler import schedule_groups
+
+# -----------------------------
+# โหลดข้อมูลหลายวัน
+# -----------------------------
+def iter_horizon_groups(start, end, storage=None):
+    """อ่านทีละวัน (lazy) คืนค่า (วันที่, groups) เฉพาะวันที่มีการจอง"""
+    storage = storage or open_storage()
+    for date in storage.booking_dates(start, end):
+        yield date, storage.load_groups(date)
+
+# -----------------------------
+# จัดตารางแยกวัน
+# -----------------------------
+def schedule_day(date, rooms=ROOMS, slots=("main",), profile=None, backend=None):
+    """โหลดและจัดตารางหนึ่งวัน (รันใน process ลูก) คืนค่า (วันที่, จำนวนกลุ่ม, assignments)"""
+    storage = open_storage(backend)
+    try:
+        groups = storage.load_groups(date)
+        return date, len(groups), schedule_groups(groups, rooms, slots, profile=profile)
+    finally:
+        storage.close()
+
+
+def schedule_horizon(start, end, rooms=ROOMS, slots=("main",), profile=None, backend=None,
+                     workers=None, storage=None):
+    """
+    จัดตารางทุกวันที่มีการจองใน [start, end]
+    คืนค่า dict {วันที่: (จำนวนกลุ่ม, assignments)} เรียงตามวัน
+    workers=1 จัดทีละวันใน process นี้
+    """
+    backend = backend or os.environ.get("BOOKING_STORAGE", "jsonl")
+    storage = storage or open_storage(backend)
+    dates = storage.booking_dates(start, end)
+    workers = min(workers or os.cpu_count() or 1, len(dates)) or 1
+
+    if workers == 1:
+        results = {}
+        for date, groups in iter_horizon_groups(start, end, storage):
+            results[date] = (len(groups), schedule_groups(groups, rooms, slots, profile=profile))
+        return results
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(schedule_day, date, rooms, slots, profile, backend) for date in dates]
+        return {date: (count, assignments)
+                for date, count, assignments in (future.result() for future in futures)}
+
+# -----------------------------
+# Command line
+# -----------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="จัดตารางห้องประชุมหลายวัน")
+    parser.add_argument("start", help="วันแรก YYYY-MM-DD")
+    parser.add_argument("end", nargs="?", help="วันสุดท้าย YYYY-MM-DD (ค่าเริ่มต้น: start + 6 วัน)")
+    parser.add_argument("--slots", default="main", help="slot ที่ให้เลือก เช่น main หรือ main,alt")
+    parser.add_argument("--profile", help="scoring profile (ค่าเริ่มต้นตาม BOOKING_SCORING)")
+    parser.add_argument("--workers", type=int, help="จำนวน process (ค่าเริ่มต้นตามจำนวน CPU)")
+    parser.add_argument("--save", action="store_true", help="บันทึกผลการจัดตารางลง storage")
+    args = parser.parse_args(argv)
+
+    end = args.end or (_date.fromisoformat(args.start) + timedelta(days=6)).isoformat()
+    storage = open_storage()
+    results = schedule_horizon(args.start, end, slots=tuple(args.slots.split(",")),
+                               profile=args.profile, workers=args.workers, storage=storage)
+    if not results:
+        print(f"❌ ไม่มีการจองในช่วง {args.start} ถึง {end}")
+        storage.close()
+        return 1
+
+    print(f"\n📅 ผลการจัดตาราง {args.start} ถึง {end}")
+    total_groups = total_assigned = 0
+    for date, (count, assignments) in results.items():
+        print(f"{date}: ได้ห้อง {len(assignments)}/{count} กลุ่ม")
+        total_groups += count
+        total_assigned += len(assignments)
+        if args.save:
+            storage.save_assignments(assignments, date)
+    print(f"รวม {len(results)} วัน ได้ห้อง {total_assigned}/{total_groups} กลุ่ม")
+    storage.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,212 @@
+import time
+from collections import defaultdict
+
+from bookingroom.metrics import span
+from bookingroom.records import Assignment
+from bookingroom.timeutil import slot_minutes
+
+# PuLP ถูก import ภายในฟังก์ชัน (โหลดเฉพาะตอนสร้างโมเดล ILP)
+
+# -----------------------------
+# โหมดการสร้างเงื่อนไข "ห้ามเวลาชนกันในห้องเดียวกัน"
+# -----------------------------
+#   "pairwise" -> x[g1,r,s1] + x[g2,r,s2] <= 1 ทุกคู่ที่เวลาชนกัน (แบบเดิม, O(G² · R · slot²))
+#   "clique"   -> sum(x ที่ครอบคลุมจุดเวลาเดียวกัน) <= 1 หนึ่งเงื่อนไขต่อ clique ต่อห้อง
+#                 หา clique ด้วย sweep-line จำนวนเงื่อนไขจึงไม่เกินจำนวนตัวเลือกในห้องนั้น
+CONSTRAINT_MODES = ("pairwise", "clique")
+
+
+def _overlaps(s1, e1, s2, e2):
+    # เงื่อนไขเดียวกับโค้ดเดิม: ช่วงเวลาแบบ [start, end)
+    return not (e1 <= s2 or e2 <= s1)
+
+
+def pairwise_conflicts(intervals):
+    """intervals: list ของ (start, end, key) (เวลาเป็นนาที) คืนค่า list ของคู่ (key1, key2) ที่เวลาชนกัน"""
+    pairs = []
+    for i in range(len(intervals)):
+        s1, e1, k1 = intervals[i]
+        for j in range(i + 1, len(intervals)):
+            s2, e2, k2 = intervals[j]
+            if _overlaps(s1, e1, s2, e2):
+                pairs.append((k1, k2))
+    return pairs
+
+
+def overlap_cliques(intervals):
+    """
+    หากลุ่มของช่วงเวลาที่ครอบคลุมจุดเวลาเดียวกัน (maximal clique ของ interval graph) ด้วย sweep-line
+
+    เรียงจุดปลายทั้งหมด (end ก่อน start ถ้าเวลาเท่ากัน เพราะ [a, b) กับ [b, c) ไม่ชนกัน)
+    แล้วบันทึกชุดที่กำลังใช้งานอยู่ทุกครั้งที่มีช่วงเวลาจบหลังจากมีช่วงใหม่เพิ่มเข้ามา
+    ทุกคู่ที่ชนกันจะอยู่ใน clique อย่างน้อยหนึ่งชุดเสมอ จึงแทนเงื่อนไขแบบ pairwise ได้พอดี
+    (ข้าม clique ที่มีสมาชิกตัวเดียว เพราะ x <= 1 อยู่แล้ว)
+
+    ช่วงเวลาที่ end <= start ไม่มีจุดเวลาให้ sweep จึงคืนค่าแยกเป็นคู่ที่ชน (ตามเงื่อนไขเดิม)
+    คืนค่า (cliques, extra_pairs)
+    """
+    regular = [(s, e, k) for s, e, k in intervals if s < e]
+    degenerate = [(s, e, k) for s, e, k in intervals if not s < e]
+
+    events = []
+    for index, (start, end, _) in enumerate(regular):
+        events.append((start, 1, index))
+        events.append((end, 0, index))
+    events.sort()
+
+    cliques = []
+    active = {}
+    grew = False
+    for _, is_start, index in events:
+        if is_start:
+            active[index] = regular[index][2]
+            grew = True
+        else:
+            if grew and len(active) > 1:
+                cliques.append(list(active.values()))
+            grew = False
+            del active[index]
+
+    extra_pairs = []
+    for i, (s1, e1, k1) in enumerate(degenerate):
+        for s2, e2, k2 in regular + degenerate[i + 1:]:
+            if _overlaps(s1, e1, s2, e2):
+                extra_pairs.append((k1, k2))
+    return cliques, extra_pairs
+
+# -----------------------------
+# สร้างโมเดล ILP
+# -----------------------------
+def priority_objective(group, room, slot):
+    return group["priority"]
+
+
+def build_room_model(groups, rooms, slots=("main", "alt"), mode="clique",
+                     objective=priority_objective, name="Room_Scheduling"):
+    """
+    สร้างโมเดล PuLP (maximize ผลรวม objective) คืนค่า (model, x)
+    x[(ลำดับกลุ่ม, ลำดับห้อง, slot)] มีเฉพาะตัวเลือกที่ขนาดห้องพอ
+    (ใช้ index แทน id เพราะ id อาจซ้ำหรือเป็นภาษาไทยซึ่งใช้เป็นชื่อตัวแปรของ solver ไม่ได้)
+    """
+    from pulp import LpProblem, LpVariable, LpMaximize, LpBinary, lpSum
+
+    if mode not in CONSTRAINT_MODES:
+        raise ValueError(f"ไม่รู้จักโหมด '{mode}' (เลือกได้: {', '.join(CONSTRAINT_MODES)})")
+
+    model = LpProblem(name, LpMaximize)
+
+    # ตัวแปรตัดสินใจ (ไม่สร้างตัวแปรของห้องที่เล็กเกินไป แทนการบังคับ x == 0)
+    x = {}
+    weights = {}
+    by_group = defaultdict(list)
+    room_intervals = defaultdict(list)
+    for gi, g in enumerate(groups):
+        for ri, r in enumerate(rooms):
+            if g["size"] > r["capacity"]:
+                continue
+            for slot in slots:
+                key = (gi, ri, slot)
+                x[key] = LpVariable(f"x_{gi}_{ri}_{slot}", cat=LpBinary)
+                weights[key] = objective(g, r, slot)
+                by_group[g["id"]].append(x[key])
+                room_intervals[ri].append(slot_minutes(g, slot) + (key,))
+
+    # Objective
+    model += lpSum(weights[key] * var for key, var in x.items())
+
+    # เงื่อนไข: กลุ่มหนึ่ง (id เดียวกัน) เลือกได้แค่ช่วงเดียวและห้องเดียว
+    for variables in by_group.values():
+        if len(variables) > 1:
+            model += lpSum(variables) <= 1
+
+    # เงื่อนไข: ห้ามเวลาชนกันในห้องเดียวกัน
+    for intervals in room_intervals.values():
+        if mode == "pairwise":
+            pairs = pairwise_conflicts(intervals)
+        else:
+            cliques, pairs = overlap_cliques(intervals)
+            for clique in cliques:
+                model += lpSum(x[key] for key in clique) <= 1
+        for k1, k2 in pairs:
+            model += x[k1] + x[k2] <= 1
+
+    return model, x
+
+
+def selected_assignments(groups, rooms, x):
+    """อ่านคำตอบจากโมเดลที่ solve แล้ว คืนค่า list ของ (group, room, slot) ตามลำดับกลุ่ม"""
+    chosen = [key for key, var in x.items() if var.value() is not None and var.value() > 0.5]
+    return [(groups[gi], rooms[ri], slot) for gi, ri, slot in chosen]
+
+# -----------------------------
+# จัดตารางแบบ Optimal (MILP) ด้วยคะแนนเดียวกับ greedy
+# -----------------------------
+@span("ilp.solve")
+def schedule_optimal(groups, rooms, slots=("main",), time_limit=10, mode="clique", profile=None):
+    """
+    หา assignment ที่ผลรวมคะแนน heuristic (ตาม profile) สูงสุด
+    เริ่มจากคำตอบของ greedy (warm start) และหยุดเมื่อครบ time_limit วินาที (นับรวมเวลาสร้างโมเดล
+    ส่วนเวลาที่ PuLP เขียนไฟล์โมเดล / เปิด CBC / อ่านคำตอบ อยู่นอก timeLimit ของ solver)
+    คืนค่า (assignments, result) โดย assignments อยู่ในรูปแบบเดียวกับ schedule_with_heuristic
+    result: dict ของ status, objective, greedy_objective, bound, gap
+    (bound / gap เป็น None เมื่อหมดเวลาก่อนหาขอบบนได้)
+    """
+    from pulp import PULP_CBC_CMD, LpSolutionOptimal, LpStatusOptimal, value
+    from bookingroom.scheduler import schedule_with_heuristic
+    from bookingroom.scoring import get_profile
+
+    profile = get_profile(profile)
+    deadline = time.monotonic() + time_limit
+    greedy = schedule_with_heuristic(groups, rooms, slots, profile)
+    greedy_objective = sum(a.score for a in greedy)
+
+    model, x = build_room_model(groups, rooms, slots, mode=mode,
+                                objective=profile.score)
+    if not x:
+        return greedy, {"status": "empty", "objective": 0, "greedy_objective": 0,
+                        "bound": 0, "gap": 0.0}
+
+    # Warm start: ตั้งค่าเริ่มต้นของตัวแปรตามผล greedy
+    group_index = {id(g): gi for gi, g in enumerate(groups)}
+    room_index = {id(r): ri for ri, r in enumerate(rooms)}
+    chosen = {(group_index[id(a.group)], room_index[id(a.room)], a.slot) for a in greedy}
+    for key, var in x.items():
+        var.setInitialValue(1 if key in chosen else 0)
+
+    # เวลาที่เหลือส่วนใหญ่ให้ MILP ส่วนที่เหลือเผื่อไว้หาขอบบน (LP relaxation) ถ้าหาคำตอบ optimal ไม่ทัน
+    # solver แต่ละครั้งได้เวลาไม่เกินที่เหลือจริง ถ้าหมดเวลาตั้งแต่สร้างโมเดลแล้วใช้ผล greedy
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        return greedy, {"status": "time_limit", "objective": greedy_objective,
+                        "greedy_objective": greedy_objective, "bound": None, "gap": None}
+    model.solve(PULP_CBC_CMD(msg=0, warmStart=True, timeLimit=remaining * 0.8))
+
+    assignments = []
+    for g, r, slot in selected_assignments(groups, rooms, x):
+        start, end = slot_minutes(g, slot)
+        assignments.append(Assignment(g, r, slot, profile.score(g, r, slot), start, end))
+    objective = sum(a.score for a in assignments)
+
+    # ถ้า solver ไม่ได้คำตอบที่ดีกว่า (เช่นหมดเวลาก่อนโหลด warm start) ใช้ผล greedy
+    if objective < greedy_objective:
+        assignments, objective = greedy, greedy_objective
+    assignments = sorted(assignments, key=lambda a: a.score, reverse=True) # ไม่แก้ list ของ greedy ที่ผู้เรียกอาจถืออยู่
+
+    bound = None
+    if model.sol_status == LpSolutionOptimal:
+        status, bound = "optimal", objective
+    else:
+        # หมดเวลา: ใช้ค่า LP relaxation เป็นขอบบนของคำตอบ (ถ้ายังเหลือเวลา)
+        status = "time_limit"
+        remaining = deadline - time.monotonic()
+        if remaining > 0:
+            model.solve(PULP_CBC_CMD(msg=0, mip=False, timeLimit=remaining))
+            if model.status == LpStatusOptimal: # LP relaxation แก้เสร็จทันเวลา
+                bound = max(value(model.objective) or 0, objective)
+
+    if bound is None:
+        gap = None
+    else:
+        gap = (bound - objective) / abs(bound) if bound else 0.0
+    return assignments, {"status": status, "objective": objective,
+                         "greedy_objective": greedy_objective, "bound": bound, "gap": gap}
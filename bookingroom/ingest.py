@@ -0,0 +1,180 @@
+"""
+นำเข้าคำขอจองจำนวนมากจากไฟล์ (เช่น คำตอบที่ export จากแบบฟอร์ม)
+
+    python -m bookingroom.ingest requests.csv
+    python -m bookingroom.ingest requests.jsonl --workers 4 --date 2025-12-09 --errors failed.jsonl
+
+ไฟล์ CSV ต้องมีคอลัมน์ name และ text / ไฟล์ JSONL หนึ่งบรรทัดต่อหนึ่ง object {"name": ..., "text": ...}
+ทุกแถวที่ผ่านการตรวจสอบจะถูกบันทึกพร้อมกันครั้งเดียว แถวที่แปลงไม่ได้จะถูกรายงานแยกโดยไม่หยุดทำงาน
+"""
+import os
+import csv
+import sys
+import json
+import argparse
+from collections import deque
+
+from bookingroom.config import DAY_START, DAY_END
+from bookingroom.nlp import parse_booking_text
+from bookingroom.records import make_group
+from bookingroom.timeutil import to_hhmm, format_time
+
+# -----------------------------
+# อ่านไฟล์ทีละแถว (generator)
+# -----------------------------
+def read_rows(path):
+    """คืนค่า (เลขบรรทัด, name, text, ข้อผิดพลาดตอนอ่าน หรือ None) ทีละแถว รองรับ .csv และ .jsonl"""
+    if path.lower().endswith(".csv"):
+        with open(path, "r", encoding="utf-8-sig", newline="") as file:
+            reader = csv.DictReader(file)
+            for row in reader:
+                yield reader.line_num, (row.get("name") or "").strip(), row.get("text"), None
+    else:
+        with open(path, "r", encoding="utf-8") as file:
+            for line_no, line in enumerate(file, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError:
+                    yield line_no, "", None, "JSON ผิดรูปแบบ"
+                    continue
+                if not isinstance(row, dict):
+                    yield line_no, "", None, "แต่ละบรรทัดต้องเป็น JSON object"
+                    continue
+                yield line_no, str(row.get("name") or "").strip(), row.get("text"), None
+
+# -----------------------------
+# แยกข้อมูลจากประโยค (รันใน process pool)
+# -----------------------------
+def parse_row(row):
+    """คืนค่า (เลขบรรทัด, name, ผลจาก parse_booking_text หรือ None, ข้อผิดพลาด หรือ None)"""
+    line_no, name, text, error = row
+    if error is not None:
+        return line_no, name, None, error
+    if not isinstance(text, str) or not text.strip():
+        return line_no, name, None, "ไม่มีข้อความรายละเอียดกิจกรรม (text)"
+    try:
+        return line_no, name, parse_booking_text(text), None
+    except Exception as e:
+        return line_no, name, None, f"แยกข้อมูลไม่สำเร็จ: {e}"
+
+
+def _parse_chunk(rows):
+    return [parse_row(row) for row in rows]
+
+
+def _chunks(rows, size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def parse_rows(rows, workers=None, chunksize=64):
+    """
+    แยกข้อมูลทุกแถวตามลำดับเดิม ถ้า workers > 1 จะตัดคำใน process pool
+    ส่งงานล่วงหน้าไม่เกิน 2 ชุดต่อ worker เพื่อไม่ให้อ่านทั้งไฟล์ขึ้นมาในหน่วยความจำ
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for row in rows:
+            yield parse_row(row)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in _chunks(rows, chunksize):
+            pending.append(pool.submit(_parse_chunk, chunk))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+# -----------------------------
+# ตรวจสอบและสร้างข้อมูลกลุ่ม
+# -----------------------------
+def validate(parsed):
+    """คืนค่าข้อความผิดพลาด หรือ None ถ้าข้อมูลใช้ได้ (เงื่อนไขเดียวกับการกรอกเอง)"""
+    if parsed["start"] is None:
+        return "ไม่พบช่วงเวลาในข้อความ"
+    if not DAY_START * 60 <= parsed["start"] < parsed["end"] <= DAY_END * 60:
+        return f"เวลา {format_time(parsed['start'])} - {format_time(parsed['end'])} ไม่อยู่ในช่วง {DAY_START}.00 - {DAY_END}.00 น."
+    if parsed["size"] < 1:
+        return "จำนวนผู้เข้าร่วมต้องมากกว่า 0"
+    return None
+
+
+def build_groups(results, first_order=1, taken_ids=()):
+    """คืนค่า (groups, failures) โดย failures เป็น list ของ dict: line, name, error"""
+    taken_ids = set(taken_ids)
+    groups = []
+    failures = []
+    for line_no, name, parsed, error in results:
+        order = first_order + len(groups)
+        group_id = name or f"Group_{order}"
+        if error is None:
+            error = validate(parsed)
+        if error is None and group_id in taken_ids:
+            error = f"ชื่อกลุ่ม {group_id!r} ซ้ำกับการจองที่มีอยู่"
+        if error is not None:
+            failures.append({"line": line_no, "name": name, "error": error})
+            continue
+
+        taken_ids.add(group_id)
+        groups.append(make_group(order, group_id, parsed["activity"], parsed["priority"],
+                                 to_hhmm(parsed["start"]), to_hhmm(parsed["end"]), parsed["size"]))
+    return groups, failures
+
+
+def ingest_file(path, storage, date=None, workers=None, dry_run=False):
+    """อ่าน แยกข้อมูล ตรวจสอบ แล้วบันทึกทุกกลุ่มที่ผ่านในครั้งเดียว คืนค่า (groups, failures)"""
+    existing = storage.load_groups(date)
+    groups, failures = build_groups(parse_rows(read_rows(path), workers),
+                                    first_order=len(existing) + 1,
+                                    taken_ids=(g["id"] for g in existing))
+    if groups and not dry_run:
+        storage.add_groups(groups, date)
+    return groups, failures
+
+# -----------------------------
+# Command line
+# -----------------------------
+def main(argv=None):
+    from bookingroom.storage import open_storage
+
+    parser = argparse.ArgumentParser(description="นำเข้าคำขอจองห้องจากไฟล์ CSV / JSONL")
+    parser.add_argument("path", help="ไฟล์ .csv (คอลัมน์ name, text) หรือ .jsonl")
+    parser.add_argument("--date", help="วันที่ของการจอง (YYYY-MM-DD, ค่าเริ่มต้นวันนี้)")
+    parser.add_argument("--workers", type=int, help="จำนวน process สำหรับตัดคำ (ค่าเริ่มต้นตามจำนวน CPU)")
+    parser.add_argument("--errors", help="บันทึกแถวที่นำเข้าไม่ได้ลงไฟล์ JSONL")
+    parser.add_argument("--dry-run", action="store_true", help="ตรวจสอบอย่างเดียว ไม่บันทึก")
+    args = parser.parse_args(argv)
+
+    storage = open_storage()
+    try:
+        groups, failures = ingest_file(args.path, storage, args.date, args.workers, args.dry_run)
+    finally:
+        storage.close()
+
+    for failure in failures:
+        print(f"❌ บรรทัด {failure['line']} ({failure['name'] or '-'}): {failure['error']}")
+    if args.errors:
+        with open(args.errors, "w", encoding="utf-8") as f:
+            for failure in failures:
+                f.write(json.dumps(failure, ensure_ascii=False) + "\n")
+
+    action = "ตรวจสอบ" if args.dry_run else "บันทึก"
+    print(f"✅ {action}การจอง {len(groups)} กลุ่ม, นำเข้าไม่ได้ {len(failures)} แถว")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+from difflib import SequenceMatcher
+
+# -----------------------------
+# Aho–Corasick: หาว่ามี keyword ไหนเป็น substring ของคำบ้าง ในการอ่านคำรอบเดียว
+# -----------------------------
+class AhoCorasick:
+    def __init__(self, patterns):
+        """patterns: list ของ (keyword, label)"""
+        self.goto = [{}]      # state -> {ตัวอักษร: state ถัดไป}
+        self.fail = [0]
+        self.output = [set()] # state -> label ของ keyword ที่จบที่ state นี้ (รวมตาม fail link)
+
+        for keyword, label in patterns:
+            state = 0
+            for char in keyword:
+                next_state = self.goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto[state][char] = next_state
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append(set())
+                state = next_state
+            self.output[state].add(label)
+
+        # สร้าง fail link แบบ BFS
+        queue = list(self.goto[0].values())
+        for state in queue:
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(char, 0)
+                self.output[next_state] |= self.output[self.fail[next_state]]
+
+    def labels_in(self, text):
+        """คืนค่า set ของ label ที่ keyword ปรากฏอยู่ใน text"""
+        found = set(self.output[0]) # keyword ว่าง "" เป็น substring ของทุกคำ
+        goto, fail, output = self.goto, self.fail, self.output
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found |= output[state]
+        return found
+
+# -----------------------------
+# จับคู่คำกับหมวดกิจกรรม (ผลลัพธ์เหมือน substring + difflib.get_close_matches ทุกประการ)
+# -----------------------------
+class ActivityMatcher:
+    """
+    สร้างครั้งเดียวจาก ACTIVITY_CONFIG แล้วใช้ซ้ำ:
+    - substring ใช้ Aho–Corasick
+    - fuzzy คัด keyword ด้วยเงื่อนไขเดียวกับ real_quick_ratio / quick_ratio ของ difflib
+      (ความยาว และจำนวนตัวอักษรที่ตรงกันจาก index ตัวอักษร) ก่อนคำนวณ ratio() จริง
+    - จำผลของแต่ละคำไว้ใน cache
+    """
+
+    def __init__(self, activity_config, cutoff=0.75, cache_size=100_000):
+        self.categories = [(group["category"], group["priority"]) for group in activity_config]
+        self.cutoff = cutoff
+        self.cache_size = cache_size
+        self._cache = {}
+
+        self._substring = AhoCorasick(
+            (keyword, index)
+            for index, group in enumerate(activity_config) for keyword in group["keywords"])
+
+        # index ตัวอักษร -> [(ลำดับ keyword, จำนวนตัวอักษรนั้นใน keyword)]
+        self._keywords = []  # (keyword, ลำดับหมวด)
+        self._char_index = {}
+        for index, group in enumerate(activity_config):
+            for keyword in group["keywords"]:
+                keyword_id = len(self._keywords)
+                self._keywords.append((keyword, index))
+                counts = {}
+                for char in keyword:
+                    counts[char] = counts.get(char, 0) + 1
+                for char, count in counts.items():
+                    self._char_index.setdefault(char, []).append((keyword_id, count))
+
+    def _fuzzy(self, token):
+        cutoff = self.cutoff
+        token_length = len(token)
+
+        # จำนวนตัวอักษรที่ตรงกันแบบนับซ้ำ (ตัวเศษของ quick_ratio)
+        counts = {}
+        for char in token:
+            counts[char] = counts.get(char, 0) + 1
+        shared = {}
+        for char, token_count in counts.items():
+            for keyword_id, keyword_count in self._char_index.get(char, ()):
+                shared[keyword_id] = shared.get(keyword_id, 0) + min(token_count, keyword_count)
+
+        found = set()
+        matcher = None
+        for keyword_id, matches in shared.items():
+            keyword, index = self._keywords[keyword_id]
+            if index in found:
+                continue
+            length = len(keyword) + token_length
+            # real_quick_ratio() และ quick_ratio() ตามสูตรของ difflib
+            if 2.0 * min(len(keyword), token_length) / length < cutoff:
+                continue
+            if 2.0 * matches / length < cutoff:
+                continue
+            if matcher is None:
+                matcher = SequenceMatcher()
+                matcher.set_seq2(token)
+            matcher.set_seq1(keyword)
+            if matcher.ratio() >= cutoff:
+                found.add(index)
+        return found
+
+    def match(self, token):
+        """คืนค่า tuple ลำดับหมวด (เรียงตาม config) ที่คำนี้ตรงแบบ substring หรือ fuzzy"""
+        result = self._cache.get(token)
+        if result is None:
+            found = self._substring.labels_in(token)
+            found |= self._fuzzy(token)
+            result = tuple(sorted(found))
+            if len(self._cache) >= self.cache_size:
+                self._cache.clear()
+            self._cache[token] = result
+        return result
+
+
+_matchers = {}
+
+def get_matcher(activity_config):
+    """คืนค่า ActivityMatcher ของ config นี้ (สร้างใหม่เมื่อ config ถูกแก้ไข)"""
+    key = tuple((group["category"], group["priority"], tuple(group["keywords"]))
+                for group in activity_config)
+    matcher = _matchers.get(key)
+    if matcher is None:
+        matcher = _matchers[key] = ActivityMatcher(activity_config)
+    return matcher
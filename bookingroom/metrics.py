@@ -0,0 +1,247 @@
+"""
+จับเวลาแต่ละขั้นตอน (span) และนับจำนวน (counter) ของ hot path
+
+    from bookingroom.metrics import span, count
+
+    with span("scheduler.solve"):
+        ...
+    count("candidates", len(candidates))
+
+บันทึกตลอดเวลา (ใช้แค่ perf_counter กับ dict) แสดง / ส่งออกได้ด้วย environment variable:
+    BOOKING_METRICS=1                      แสดงตารางสรุปตอนจบโปรแกรม
+    BOOKING_METRICS=json | prom            พิมพ์ JSON / Prometheus text ตอนจบโปรแกรม
+    BOOKING_METRICS=Data/metrics.json      เขียนลงไฟล์ (.prom / .txt = Prometheus text)
+    BOOKING_PROFILE=cprofile               cProfile ทั้งโปรแกรม -> Data/profile.pstats + แสดง 20 อันดับแรก
+    BOOKING_PROFILE=tracemalloc            บันทึกหน่วยความจำสูงสุดของแต่ละ span และจุดที่จองหน่วยความจำมากที่สุด
+    (ใช้พร้อมกันได้: BOOKING_PROFILE=cprofile,tracemalloc)
+"""
+import os
+import sys
+import time
+import atexit
+
+PROFILE_PATH = os.path.join("Data", "profile.pstats")
+
+# -----------------------------
+# ที่เก็บค่า
+# -----------------------------
+class SpanStats:
+    __slots__ = ("count", "total", "max", "last", "peak_bytes")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+        self.peak_bytes = 0
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.last = seconds
+        if seconds > self.max:
+            self.max = seconds
+
+
+class Registry:
+    def __init__(self):
+        self.spans = {}
+        self.counters = {}
+        self.track_memory = False
+        self._stack = [] # [หน่วยความจำตอนเริ่ม, peak] ของ span ที่เปิดอยู่ (ใช้เมื่อ track_memory)
+
+    def stats(self, name):
+        stats = self.spans.get(name)
+        if stats is None:
+            stats = self.spans[name] = SpanStats()
+        return stats
+
+    def count(self, name, value=1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def reset(self):
+        self.spans.clear()
+        self.counters.clear()
+
+    def snapshot(self):
+        """dict ที่ส่งออกเป็น JSON ได้ (เวลาเป็นวินาที)"""
+        spans = {}
+        for name, s in sorted(self.spans.items()):
+            spans[name] = {"count": s.count, "total": s.total, "max": s.max, "last": s.last}
+            if self.track_memory:
+                spans[name]["peak_bytes"] = s.peak_bytes
+        return {"spans": spans, "counters": dict(sorted(self.counters.items()))}
+
+
+METRICS = Registry()
+
+
+class span:
+    """context manager / decorator จับเวลาหนึ่งขั้นตอน"""
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        if METRICS.track_memory:
+            _memory_enter()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        stats = METRICS.stats(self.name)
+        stats.add(elapsed)
+        if METRICS.track_memory:
+            _memory_exit(stats)
+        return False
+
+    def __call__(self, function):
+        name = self.name
+
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return function(*args, **kwargs)
+
+        wrapper.__name__ = function.__name__
+        wrapper.__doc__ = function.__doc__
+        wrapper.__wrapped__ = function
+        return wrapper
+
+
+def count(name, value=1):
+    METRICS.count(name, value)
+
+
+def snapshot():
+    return METRICS.snapshot()
+
+# -----------------------------
+# หน่วยความจำต่อ span (BOOKING_PROFILE=tracemalloc)
+# -----------------------------
+# tracemalloc มี peak ค่าเดียว: ก่อนเปิด span ลูกจะเก็บ peak ของ span แม่ไว้ก่อน reset
+# แล้วส่ง peak ของลูกกลับไปรวมกับแม่ตอนปิด peak_bytes = peak ระหว่าง span - หน่วยความจำตอนเริ่ม span
+def _memory_enter():
+    import tracemalloc
+
+    current, peak = tracemalloc.get_traced_memory()
+    if METRICS._stack:
+        METRICS._stack[-1][1] = max(METRICS._stack[-1][1], peak)
+    tracemalloc.reset_peak()
+    METRICS._stack.append([current, 0])
+
+
+def _memory_exit(stats):
+    import tracemalloc
+
+    start, peak = METRICS._stack.pop()
+    peak = max(peak, tracemalloc.get_traced_memory()[1])
+    stats.peak_bytes = max(stats.peak_bytes, peak - start)
+    if METRICS._stack:
+        METRICS._stack[-1][1] = max(METRICS._stack[-1][1], peak)
+
+# -----------------------------
+# ส่งออก
+# -----------------------------
+def _metric_name(name):
+    return "".join(c if c.isalnum() else "_" for c in name)
+
+
+def to_prometheus(registry=METRICS):
+    """Prometheus text exposition format"""
+    lines = ["# TYPE booking_span_seconds summary"]
+    for name, s in sorted(registry.spans.items()):
+        lines.append(f'booking_span_seconds_count{{span="{name}"}} {s.count}')
+        lines.append(f'booking_span_seconds_sum{{span="{name}"}} {s.total:.9f}')
+    lines.append("# TYPE booking_span_seconds_max gauge")
+    for name, s in sorted(registry.spans.items()):
+        lines.append(f'booking_span_seconds_max{{span="{name}"}} {s.max:.9f}')
+    if registry.track_memory:
+        lines.append("# TYPE booking_span_peak_bytes gauge")
+        for name, s in sorted(registry.spans.items()):
+            lines.append(f'booking_span_peak_bytes{{span="{name}"}} {s.peak_bytes}')
+    for name, value in sorted(registry.counters.items()):
+        metric = f"booking_{_metric_name(name)}_total"
+        lines.append(f"# TYPE {metric} counter")
+        lines.append(f"{metric} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def to_json(registry=METRICS):
+    import json
+
+    return json.dumps(registry.snapshot(), ensure_ascii=False, indent=2)
+
+
+def print_report(registry=METRICS):
+    """ตารางสรุปเวลาแต่ละขั้นตอน"""
+    print("\n=== ⏱️ เวลาแต่ละขั้นตอน ===")
+    print(f"{'ขั้นตอน':<28} {'ครั้ง':>6} {'รวม (ms)':>10} {'เฉลี่ย (ms)':>11} {'สูงสุด (ms)':>11} {'ล่าสุด (ms)':>11}")
+    for name, s in sorted(registry.spans.items()):
+        print(f"{name:<28} {s.count:>6} {s.total * 1000:>10.1f} {s.total / s.count * 1000:>11.2f} "
+              f"{s.max * 1000:>11.2f} {s.last * 1000:>11.2f}")
+    for name, value in sorted(registry.counters.items()):
+        print(f"🔢 {name}: {value:,}")
+
+
+def dump(target):
+    """target: 1 / print, json, prom หรือ path ของไฟล์ (.json / .prom / .txt)"""
+    if target in ("1", "print"):
+        print_report()
+    elif target == "json":
+        print(to_json())
+    elif target == "prom":
+        print(to_prometheus(), end="")
+    else:
+        text = to_json() if target.endswith(".json") else to_prometheus()
+        os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+        with open(target, "w", encoding="utf-8") as file:
+            file.write(text)
+        print(f"📈 บันทึก metrics ใน {target}")
+
+# -----------------------------
+# เปิดใช้งานด้วย environment variable
+# -----------------------------
+def _start_profilers(modes):
+    if "tracemalloc" in modes:
+        import tracemalloc
+
+        tracemalloc.start()
+        METRICS.track_memory = True
+    if "cprofile" in modes:
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        atexit.register(_stop_cprofile, profiler)
+    if METRICS.track_memory:
+        atexit.register(_report_tracemalloc)
+
+
+def _stop_cprofile(profiler):
+    import pstats
+
+    profiler.disable()
+    os.makedirs(os.path.dirname(PROFILE_PATH), exist_ok=True)
+    profiler.dump_stats(PROFILE_PATH)
+    print(f"\n🔬 cProfile บันทึกใน {PROFILE_PATH} (20 อันดับแรกตาม cumulative time)")
+    pstats.Stats(profiler, stream=sys.stdout).sort_stats("cumulative").print_stats(20)
+
+
+def _report_tracemalloc():
+    import tracemalloc
+
+    current, peak = tracemalloc.get_traced_memory()
+    print(f"\n🧠 tracemalloc: ใช้อยู่ {current / 1e6:.1f} MB, สูงสุด {peak / 1e6:.1f} MB จุดที่จองมากที่สุด:")
+    for stat in tracemalloc.take_snapshot().statistics("lineno")[:10]:
+        print(f"   {stat}")
+
+
+_profile_modes = {m.strip() for m in os.environ.get("BOOKING_PROFILE", "").lower().split(",") if m.strip()}
+if _profile_modes:
+    _start_profilers(_profile_modes)
+
+_metrics_target = os.environ.get("BOOKING_METRICS", "").strip()
+if _metrics_target and _metrics_target != "0":
+    atexit.register(dump, _metrics_target)
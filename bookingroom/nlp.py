@@ -0,0 +1,233 @@
+import re
+import difflib
+
+from bookingroom.config import ACTIVITY_CONFIG
+from bookingroom.matcher import get_matcher
+from bookingroom.metrics import span
+from bookingroom.timeutil import to_minutes
+
+# --- NLP Library ---
+# ใช้ PyThaiNLP แทน custom import เพื่อความเสถียร (หรือเปลี่ยนกลับเป็น newmm_tokenizer ของคุณได้)
+# โหลด library ตอนตัดคำครั้งแรก ไม่ให้หน่วงตอนเปิดโปรแกรม
+_tokenizer = None
+
+def _split_tokenize(text, engine="newmm"):
+    # Dummy function เพื่อกันโปรแกรมพังถ้ารันโดยไม่มี lib
+    return text.split()
+
+def word_tokenize(text, engine="newmm"):
+    global _tokenizer
+    if _tokenizer is None:
+        try:
+            from pythainlp.tokenize import word_tokenize as _tokenizer
+        except ImportError:
+            # Fallback หรือแจ้งเตือนให้ลง library
+            print("⚠️ ไม่พบ PyThaiNLP: กรุณาติดตั้งโดยใช้ 'pip install pythainlp'")
+            _tokenizer = _split_tokenize
+    return _tokenizer(text, engine=engine)
+
+# ---------------
+# ดึงกิจกรรม
+# ---------------
+def get_activity(text, activity_config=ACTIVITY_CONFIG):
+    tokens = word_tokenize(text, engine="newmm")
+    matcher = get_matcher(activity_config) # สร้างครั้งแรกครั้งเดียว แล้วใช้ซ้ำ
+
+    found_act = "General" # ค่าเริ่มต้น
+    max_prio = 1
+
+    # วนลูปตรวจสอบแต่ละ Token
+    for token in tokens:
+        token_clean = token.lower().strip() # แปลงเป็นตัวเล็ก ตัดช่องว่าง
+
+        if len(token_clean) < 2: continue # ข้ามคำสั้นๆ
+
+        # หมวดที่ keyword เป็น substring หรือใกล้เคียง (difflib cutoff=0.75) เรียงตาม config
+        for index in matcher.match(token_clean):
+            category, priority = matcher.categories[index]
+            if priority > max_prio:
+                max_prio = priority
+                found_act = category
+
+    return found_act, max_prio
+
+
+def get_activity_reference(text, activity_config=ACTIVITY_CONFIG):
+    """เวอร์ชันเดิม (ไล่ difflib ทุกคำ ทุกหมวด) ใช้ตรวจผลของ get_activity ใน tests/test_matcher.py"""
+    tokens = word_tokenize(text, engine="newmm")
+
+    found_act = "General"
+    max_prio = 1
+
+    for token in tokens:
+        token_clean = token.lower().strip()
+
+        if len(token_clean) < 2: continue
+
+        for group in activity_config:
+            is_substring = any(k in token_clean for k in group["keywords"])
+            close_matches = difflib.get_close_matches(token_clean, group["keywords"], n=1, cutoff=0.75)
+
+            if is_substring or close_matches:
+                if group["priority"] > max_prio:
+                    max_prio = group["priority"]
+                    found_act = group["category"]
+
+    return found_act, max_prio
+
+# -----------------------------
+# Regex ที่ compile ไว้ครั้งเดียวตอน import
+# -----------------------------
+_SIZE_UNITS = r"(?:คน|ท่าน|ที่|ที่นั่ง|seats|participants)"
+# ตัวเลขที่ต่อจากตัวเลข / . / : เป็นนาทีของเวลา (เช่น 00 ใน "10.00 ที่ห้อง") ไม่ใช่จำนวนคน
+_SIZE_PATTERN = re.compile(rf"(?<![\d.:])(\d+)\s*{_SIZE_UNITS}")
+_NUMBER_PATTERN = re.compile(r"(\d+\.?\d*)")
+
+def _time_chunk(prefix):
+    # รูปแบบเวลาหนึ่งจุด เช่น 9.30, 10 โมง, เที่ยง, บ่ายโมง, บ่าย 2 (โมง), 5 โมงเย็น, 2 ทุ่ม (+ ครึ่ง)
+    # ใช้ชื่อ group ขึ้นต้นด้วย prefix เพื่อใช้ซ้ำทั้งเวลาเริ่มและเวลาจบใน pattern เดียวกัน
+    return (rf"(?:(?P<{prefix}noon>เที่ยง)"
+            rf"|(?P<{prefix}one_pm>บ่ายโมง)"
+            rf"|บ่าย\s*(?P<{prefix}pm>\d+)(?:\s*โมง)?"
+            rf"|(?P<{prefix}hour>\d{{1,2}})[:.](?P<{prefix}minute>\d{{2}})"
+            rf"|(?P<{prefix}num>\d{{1,2}})\s*(?P<{prefix}unit>โมงเย็น|โมง|น\.|นาฬิกา|ทุ่ม))"
+            rf"(?P<{prefix}half>\s*ครึ่ง)?")
+
+_CHUNK_FIELDS = ("noon", "one_pm", "pm", "hour", "minute", "num", "unit", "half")
+_CHUNK_GROUPS = {prefix: tuple(prefix + field for field in _CHUNK_FIELDS)
+                 for prefix in ("start_", "end_")}
+
+# ช่วงเวลา "เริ่ม ถึง/- จบ" หรือจำนวนคน: อ่านข้อความรอบเดียวได้ทั้งสองอย่าง
+# lookahead ด้านหน้าให้ข้ามตำแหน่งที่ไม่ใช่ตัวเลข / เ / บ ได้ทันทีโดยไม่ต้องลองทุกทางเลือก
+_BOOKING_PATTERN = re.compile(
+    rf"(?=[\dเบ])(?:(?P<range>{_time_chunk('start_')}\s*(?:ถึง|-)\s*{_time_chunk('end_')})"
+    rf"|(?<![\d.:])(?P<size>\d+)\s*{_SIZE_UNITS})")
+
+# ---------------
+# ดึงจำนวนคน
+# ---------------
+def get_size(text):
+    matches = _SIZE_PATTERN.findall(text)
+
+    if matches:
+        people = [int(x) for x in matches]
+        return people
+    return []
+
+# ---------------
+# ดึงเวลา (จากข้อความเวลาหนึ่งจุด) คืนค่าเป็นนาทีนับจากเที่ยงคืน เช่น "9 โมงครึ่ง" -> 570
+# ---------------
+def get_time(text):
+    text = text.strip()
+    minutes = 0
+
+    # เช็คคำว่า ครึ่ง
+    if "ครึ่ง" in text:
+        minutes = 30
+        text = text.replace("ครึ่ง", "").strip()
+
+    if "เที่ยง" in text:
+        return 12 * 60 + minutes
+
+    if "บ่ายโมง" in text:
+        return 13 * 60 + minutes
+
+    text = text.replace(":", ".")
+
+    nums = _NUMBER_PATTERN.findall(text)
+
+    if not nums: return 0 # ถ้าไม่เจอเวลา
+    val = to_minutes(float(nums[0])) # 9.30 -> 570
+
+    if "บ่าย" in text:
+        if val <= 4 * 60:
+            return (val + 12 * 60) + minutes
+        else:
+            return val + minutes
+    elif "ทุ่ม" in text:
+        return (val + 18 * 60) + minutes
+    elif "โมง" in text:
+        if "เย็น" in text and val <= 6 * 60:
+            return (val + 12 * 60) + minutes
+        return val + minutes
+
+    return val + minutes
+
+
+def _chunk_time(match, prefix):
+    """แปลงเวลาหนึ่งจุดจาก group ของ regex เป็นนาที (ผลเหมือน get_time)"""
+    noon, one_pm, pm, hour, minute, num, unit, half = match.group(*_CHUNK_GROUPS[prefix])
+    minutes = 30 if half else 0
+
+    if noon:
+        return 12 * 60 + minutes
+    if one_pm:
+        return 13 * 60 + minutes
+
+    if pm is not None:
+        val = int(pm) * 60
+        return (val + 12 * 60) + minutes if val <= 4 * 60 else val + minutes
+
+    if hour is not None:
+        return int(hour) * 60 + int(minute) + minutes
+
+    val = int(num) * 60
+    if unit == "ทุ่ม":
+        return (val + 18 * 60) + minutes
+    if unit == "โมงเย็น" and val <= 6 * 60:
+        return (val + 12 * 60) + minutes
+    return val + minutes
+
+# ---------------
+# ดึงช่วงเวลาและจำนวนคนในการอ่านรอบเดียว
+# ---------------
+def extract_time_and_size(text):
+    """
+    คืนค่า ((start, end) หรือ None, จำนวนคน หรือ None) จากช่วงเวลาแรกและจำนวนคนแรกที่เจอ
+    start / end เป็นนาทีนับจากเที่ยงคืน
+    ตัวเลขในช่วงเวลาที่จับได้ และนาทีของเวลาที่เขียนแบบ 10.00 / 10:30 ไม่ถูกนับเป็นจำนวนคน
+    ("10.00 ที่ห้อง" -> (None, None)) ส่วนเวลาแบบอื่นที่อยู่เดี่ยว ๆ เช่น "10 ที่ห้อง" ยังอ่านเป็นจำนวนคน
+    """
+    time_range = None
+    size = None
+    for match in _BOOKING_PATTERN.finditer(text):
+        if match.group("range"):
+            if time_range is None:
+                time_range = (_chunk_time(match, "start_"), _chunk_time(match, "end_"))
+        elif size is None:
+            size = int(match.group("size"))
+        if time_range is not None and size is not None:
+            break
+    return time_range, size
+
+# ---------------
+# หาช่วงเวลา "เริ่ม - จบ" ในประโยค
+# ---------------
+def find_time_range(text):
+    """คืนค่า (start, end) เป็นนาที ของช่วงเวลาแรกที่เจอ หรือ None ถ้าไม่เจอ"""
+    return extract_time_and_size(text)[0]
+
+# -----------------------------
+# แยกข้อมูลการจองจากประโยค
+# -----------------------------
+@span("nlp.parse")
+def parse_booking_text(text):
+    """
+    คืนค่า dict: activity, priority, start, end, size
+    start/end เป็นนาที (None ถ้าหาช่วงเวลาไม่เจอ), size เป็น 1 ถ้าไม่ระบุจำนวนคน
+    """
+    with span("nlp.activity"): # ตัดคำ + หากิจกรรม
+        activity_name, priority = get_activity(text)
+
+    time_range, size = extract_time_and_size(text)
+    start_time, end_time = time_range if time_range else (None, None)
+    if size is None:
+        size = 1
+
+    return {
+        "activity": activity_name,
+        "priority": priority,
+        "start": start_time,
+        "end": end_time,
+        "size": size,
+    }
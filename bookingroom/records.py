@@ -0,0 +1,165 @@
+from bookingroom.timeutil import to_hhmm, to_hours, to_minutes
+
+# -----------------------------
+# Record แบบ __slots__ (ใช้แทน dict ในหน่วยความจำ)
+# -----------------------------
+# ไม่มี __dict__ ต่อ object จึงใช้หน่วยความจำน้อยกว่า dict หลายเท่า และอ่าน field แบบ attribute ได้เร็ว
+# ยังอ่าน/เขียนแบบ dict ได้ (record["main_start"], record.get(...), dict(record))
+# โค้ดเดิมที่ใช้ key จึงทำงานได้เหมือนเดิม แปลงเป็น dict จริงเฉพาะตอนเขียน JSON (to_dict)
+class _Record:
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except (AttributeError, TypeError):
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in self.__slots__ and hasattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key, default) if key in self.__slots__ else default
+
+    def keys(self):
+        return [key for key in self.__slots__ if hasattr(self, key)]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def items(self):
+        return [(key, getattr(self, key)) for key in self.keys()]
+
+    def to_dict(self):
+        return dict(self.items())
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+class Group(_Record):
+    """
+    ข้อมูลกลุ่มหนึ่งการจอง (field และลำดับเดียวกับบรรทัดในไฟล์ Booking_<วันที่>.txt)
+    date ("YYYY-MM-DD") มีเฉพาะกลุ่มที่ระบุวันไว้ (จองล่วงหน้า / โหลดจากหลายวัน)
+    ไฟล์เดิมที่ไม่มี date จึงอ่านและเขียนกลับได้เหมือนเดิม
+    """
+    __slots__ = ("order", "id", "activity", "main_start", "main_end", "priority", "size",
+                 "duration_main", "alt_start", "alt_end", "duration_alt", "date", "extra")
+
+    def __init__(self, **fields):
+        extra = None # key อื่นนอกจาก field หลัก (เก็บไว้และเขียนกลับลงไฟล์ครบ)
+        for key, value in fields.items():
+            if key in _GROUP_FIELDS:
+                setattr(self, key, value)
+            else:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+        self.extra = extra
+
+    @classmethod
+    def from_dict(cls, data):
+        """สร้างจาก dict ที่อ่านจาก JSON"""
+        return cls(**data)
+
+    def __getitem__(self, key):
+        if key != "extra":
+            try:
+                return getattr(self, key)
+            except (AttributeError, TypeError):
+                pass
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key in _GROUP_FIELDS:
+            setattr(self, key, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __contains__(self, key):
+        return key in self.keys()
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        keys = [key for key in self.__slots__[:-1] if hasattr(self, key)]
+        if self.extra:
+            keys.extend(self.extra)
+        return keys
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+
+_GROUP_FIELDS = frozenset(Group.__slots__[:-1])
+
+
+class Assignment(_Record):
+    """ตัวเลือก / ผลการจัด (group, room, slot) หนึ่งรายการ start / end เป็นนาที"""
+    __slots__ = ("group", "room", "slot", "score", "start", "end")
+
+    def __init__(self, group, room, slot, score, start, end):
+        self.group = group
+        self.room = room
+        self.slot = slot
+        self.score = score
+        self.start = start
+        self.end = end
+
+
+def as_dict(record):
+    """แปลงเป็น dict สำหรับ json.dumps (dict เดิมคืนค่าตัวเดิม)"""
+    return record.to_dict() if isinstance(record, _Record) else record
+
+# -----------------------------
+# สร้างข้อมูลกลุ่ม (รูปแบบเดียวกับที่บันทึกในไฟล์ Booking_<วันที่>.txt)
+# -----------------------------
+# เวลาในข้อมูลกลุ่มเป็นแบบ ชั่วโมง.นาที (9.30) ตามไฟล์เดิม ส่วน duration เป็นชั่วโมงจริง (1.5)
+def _duration(start, end):
+    # 9.30 - 11.00 = 1.5 ชั่วโมง (ไม่ใช่ 1.70 จากการลบทศนิยมตรงๆ)
+    return to_hours(to_minutes(end) - to_minutes(start))
+
+
+def make_group(order, group_id, activity, priority, main_start, main_end, size,
+               alt_start=None, alt_end=None, date=None):
+    # ถ้าไม่มีเวลาสำรอง ให้เท่ากับเวลาหลัก (ฟังก์ชัน AI ต้องใช้ key alt_*)
+    if alt_start is None:
+        alt_start, alt_end = main_start, main_end
+
+    group = Group(
+        order=order,
+        id=group_id,
+        activity=activity,
+        main_start=main_start,
+        main_end=main_end,
+        priority=priority,
+        size=size,
+        duration_main=_duration(main_start, main_end),
+        alt_start=alt_start,
+        alt_end=alt_end,
+        duration_alt=_duration(alt_start, alt_end)
+    )
+    if date is not None:
+        group.date = date
+    return group
+
+
+def set_main_time(group, start, end):
+    """เปลี่ยนเวลาหลักของกลุ่มเป็น [start, end) ที่ระบุเป็นนาที (เช่นเวลาที่ระบบแนะนำ)"""
+    group["main_start"] = to_hhmm(start)
+    group["main_end"] = to_hhmm(end)
+    group["duration_main"] = to_hours(end - start)
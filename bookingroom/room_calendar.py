@@ -0,0 +1,129 @@
+from bisect import bisect_left, bisect_right
+
+from bookingroom.availability import TICK_MINUTES, AvailabilityGrid
+
+# -----------------------------
+# ปฏิทินการจองของแต่ละห้อง (Sorted interval list + bisect)
+# -----------------------------
+# ช่วงเวลาที่ถูกจองในห้องเดียวกันจะไม่ทับกัน ดังนั้นเมื่อเรียงตามเวลาเริ่ม
+# เวลาสิ้นสุดก็จะเรียงตามไปด้วย ทำให้หาช่วงที่ชนกันได้ด้วย bisect แบบ O(log n)
+# แทนการวนเช็คทุกการจองในห้อง
+#
+# เวลาเป็นนาที และมี AvailabilityGrid (bitset ช่องละ 5 นาที) คู่กัน:
+# is_free ตอบ "ว่าง" จาก bitset ได้ทันที ถ้า bitset บอกว่าอาจไม่ว่างจึงค่อย bisect
+class RoomCalendar:
+    def __init__(self):
+        self.grid = AvailabilityGrid()
+        self.starts = []
+        self.ends = []
+        self.items = []
+        # ช่วงเวลาที่ผิดรูป (end < start) เก็บแยกและเช็คแบบเดิม
+        self.irregular = []
+        # จำนวนการจองที่ไม่ลงเส้นช่องของ bitset (หรือยาวศูนย์) ถ้าเป็น 0 bitset ตรงกับปฏิทินพอดี
+        self.off_grid = 0
+
+    def __len__(self):
+        return len(self.starts) + len(self.irregular)
+
+    def _span(self, start, end):
+        # ช่วง index [lo, hi) ของการจองที่ทับกับ [start, end)
+        lo = bisect_right(self.ends, start)
+        hi = bisect_left(self.starts, end)
+        return lo, hi
+
+    def overlapping(self, start, end):
+        """คืนค่า item ของทุกการจองที่ทับกับช่วง [start, end)"""
+        found = []
+        if start <= end:
+            lo, hi = self._span(start, end)
+            found.extend(self.items[lo:hi])
+        else:
+            found.extend(item for s, e, item in zip(self.starts, self.ends, self.items)
+                         if end > s and start < e)
+        found.extend(item for s, e, item in self.irregular if end > s and start < e)
+        return found
+
+    def is_free(self, start, end):
+        """ห้องว่างในช่วง [start, end) หรือไม่"""
+        if start <= end and not self.irregular:
+            if self.grid.is_free(start, end):
+                return True
+            lo, hi = self._span(start, end)
+            return lo >= hi
+        return not self.overlapping(start, end)
+
+    def insert(self, start, end, item=None):
+        """บันทึกการจองช่วง [start, end) (ต้องตรวจสอบ is_free ก่อน)"""
+        if end < start:
+            self.irregular.append((start, end, item))
+            return
+        self.grid.mark(start, end)
+        self.off_grid += self._off_grid(start, end)
+        # เรียงตาม (start, end) เพื่อให้ ends ยังเรียงอยู่ในกรณีช่วงยาวศูนย์
+        i = bisect_right(self.starts, start)
+        while i > 0 and self.starts[i - 1] == start and self.ends[i - 1] > end:
+            i -= 1
+        self.starts.insert(i, start)
+        self.ends.insert(i, end)
+        self.items.insert(i, item)
+
+    def remove(self, start, end, item=None):
+        """ลบการจองช่วง [start, end) ที่มี item ตรงกัน"""
+        if end < start:
+            self.irregular.remove((start, end, item))
+            return
+        i = bisect_left(self.starts, start)
+        while i < len(self.starts) and self.starts[i] == start:
+            if self.ends[i] == end and self.items[i] is item:
+                del self.starts[i]
+                del self.ends[i]
+                del self.items[i]
+                self.off_grid -= self._off_grid(start, end)
+                # ช่องของ bitset อาจถูกการจองข้างเคียงใช้ร่วมอยู่ จึงสร้างใหม่จากการจองที่เหลือ
+                self.grid.clear()
+                for s, e in zip(self.starts, self.ends):
+                    self.grid.mark(s, e)
+                return
+            i += 1
+        raise ValueError(f"ไม่พบการจอง {start} - {end}")
+
+    def _off_grid(self, start, end):
+        # 1 ถ้าช่วงนี้ทำให้ bitset กว้างกว่าการจองจริง (ขอบไม่ลงเส้นช่อง หรือยาวศูนย์)
+        grid = self.grid
+        return int(start == end or (start - grid.day_start) % grid.tick != 0
+                   or (end - grid.day_start) % grid.tick != 0)
+
+    def free_gaps(self, day_start, day_end):
+        """ช่วงว่าง [start, end) ระหว่างการจองที่เรียงตามเวลาแล้ว (sweep ครั้งเดียว)"""
+        cursor = day_start
+        for start, end in zip(self.starts, self.ends):
+            if start > cursor:
+                yield cursor, min(start, day_end)
+            cursor = max(cursor, end)
+            if cursor >= day_end:
+                return
+        yield cursor, day_end
+
+    def free_starts(self, duration, granularity=TICK_MINUTES):
+        """
+        เวลาเริ่ม (นาที) ทุก granularity นาทีนับจากต้นวันทำการ ที่ห้องว่างต่อเนื่อง duration นาที
+        ถ้าทุกการจอง ความยาว และ granularity ลงเส้นช่อง ใช้ shift-AND ของ bitset (AvailabilityGrid.free_starts)
+        ไม่อย่างนั้นไล่ช่วงว่างจากการจองที่เรียงไว้ ผลเหมือนกันและเรียงจากเช้าไปเย็น
+        """
+        grid = self.grid
+        if (not self.irregular and not self.off_grid
+                and duration % grid.tick == 0 and granularity % grid.tick == 0):
+            return grid.free_starts(duration, granularity // grid.tick)
+
+        starts = []
+        for gap_start, gap_end in self.free_gaps(grid.day_start, grid.day_end):
+            first = grid.day_start - (grid.day_start - gap_start) // granularity * granularity
+            for start in range(first, gap_end - duration + 1, granularity):
+                if self.irregular and not self.is_free(start, start + duration):
+                    continue
+                starts.append(start)
+        return starts
+
+    def intervals(self):
+        """คืนค่า (start, end) ของทุกการจองเรียงตามเวลาเริ่ม"""
+        return list(zip(self.starts, self.ends))
@@ -0,0 +1,211 @@
+"""
+Cache ผลการจัดตาราง greedy ตาม fingerprint ของข้อมูลที่ใช้จัด
+
+fingerprint = (ห้อง (id, ความจุ), น้ำหนักของ scoring profile, slot, ข้อมูลของทุกกลุ่มที่มีผลต่อผล)
+- ชุดข้อมูลเดิมทั้งชุด (เช่น โหลดไฟล์เดิมใหม่) ดึงผลจาก cache ได้ทันที
+- แยกกลุ่มเป็นส่วน (component) ที่ไม่เกี่ยวข้องกัน: สองกลุ่มอยู่ส่วนเดียวกันเมื่อมีตัวเลือกในห้องเดียวกัน
+  ที่เวลาทับกัน (หรือ id ซ้ำกัน) greedy ของแต่ละส่วนไม่ขึ้นกับส่วนอื่น เมื่อเพิ่ม / แก้ไขกลุ่ม
+  จึงจัดใหม่เฉพาะส่วนที่เปลี่ยน ส่วนของห้อง / ช่วงเวลาอื่นใช้ผลเดิม
+- ผลรวมเรียงตาม (คะแนนจากมากไปน้อย, ลำดับกลุ่ม, ลำดับห้อง, ลำดับ slot) เหมือน sort แบบ stable
+  ใน greedy_select จึงได้ assignments ตรงกับการจัดใหม่ทั้งหมดทุกรายการ
+
+ขนาดของ cache นับเป็นจำนวนกลุ่มรวมของทุกรายการ (LRU) กำหนดด้วย BOOKING_SCHEDULE_CACHE
+(ค่าเริ่มต้น 50000, 0 = ไม่ใช้ cache)
+"""
+import os
+from collections import OrderedDict
+
+from bookingroom.metrics import count
+from bookingroom.records import Assignment
+from bookingroom.room_calendar import RoomCalendar
+from bookingroom.scoring import get_profile
+from bookingroom.timeutil import slot_minutes
+
+# -----------------------------
+# fingerprint
+# -----------------------------
+def room_fingerprint(rooms):
+    return tuple((r["id"], r["capacity"]) for r in rooms)
+
+
+def group_fingerprint(group, slots):
+    """ข้อมูลของกลุ่มที่มีผลต่อคะแนนและเวลาชน (เวลาแบบ HH.MM ตามที่เก็บ ไม่ต้องแปลงเป็นนาที)"""
+    return (group["id"], group["order"], group["priority"], group["size"]) + \
+        tuple(group[f"{slot}_{edge}"] for slot in slots for edge in ("start", "end"))
+
+# -----------------------------
+# แยกกลุ่มเป็นส่วนที่ไม่เกี่ยวข้องกัน (union-find)
+# -----------------------------
+def split_components(groups, rooms, times):
+    """คืนค่า list ของ list ลำดับกลุ่ม (เรียงจากน้อยไปมาก) ของแต่ละส่วน"""
+    parent = list(range(len(groups)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(i, j):
+        i, j = find(i), find(j)
+        if i != j:
+            parent[max(i, j)] = min(i, j)
+
+    # id ซ้ำ: greedy ให้ห้องได้แค่กลุ่มเดียว
+    first = {}
+    for i, g in enumerate(groups):
+        union(first.setdefault(g["id"], i), i)
+
+    # ช่วงเวลาของตัวเลือกในแต่ละห้อง (ห้อง id เดียวกันใช้ปฏิทินเดียวกัน)
+    spans = []
+    for i, g in enumerate(groups):
+        for start, end in times[i]:
+            if end < start: # ช่วงผิดรูป ตรวจแบบครอบคลุมไว้ก่อน
+                start, end = end, start + 1
+            spans.append((start, end, i, g["size"]))
+    spans.sort()
+
+    intervals = {}
+    for r in rooms:
+        capacity = r["capacity"]
+        intervals.setdefault(r["id"], []).append([span for span in spans if span[3] <= capacity])
+
+    # sweep: ช่วงที่เริ่มก่อนเวลาสิ้นสุดที่ไกลที่สุดของส่วนปัจจุบันอาจชนกัน -> ส่วนเดียวกัน
+    for buckets in intervals.values():
+        bucket = buckets[0] if len(buckets) == 1 else sorted(span for b in buckets for span in b)
+        reach = None
+        for start, end, i, _ in bucket:
+            if reach is not None and start < reach:
+                if i != current:
+                    union(current, i)
+                if end > reach:
+                    reach = end
+            else:
+                current, reach = i, end
+
+    components = {}
+    for i in range(len(groups)):
+        components.setdefault(find(i), []).append(i)
+    return list(components.values())
+
+# -----------------------------
+# LRU cache
+# -----------------------------
+class ScheduleCache:
+    def __init__(self, max_groups=50000):
+        self.max_groups = max_groups
+        self.size = 0 # จำนวนกลุ่มรวมของทุกรายการ
+        self._entries = OrderedDict() # key -> (rows, จำนวนกลุ่ม)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        self._entries.clear()
+        self.size = 0
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, rows, weight):
+        if weight > self.max_groups:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.size -= old[1]
+        self._entries[key] = (rows, weight)
+        self.size += weight
+        while self.size > self.max_groups:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.size -= evicted
+
+    def schedule(self, groups, rooms, slots, profile, solve):
+        """
+        ผลเหมือน solve(groups, rooms, slots, profile) คืนค่า (assignments, calendars)
+        ดึงส่วนที่เคยจัดแล้วจาก cache และเรียก solve ครั้งเดียวกับทุกส่วนที่ยังไม่มี
+        """
+        profile = get_profile(profile)
+        slots = tuple(slots)
+        context = (room_fingerprint(rooms), profile.key(), slots)
+        prints = [group_fingerprint(g, slots) for g in groups]
+
+        full_key = (context, tuple(prints))
+        rows = self.get(full_key)
+        if rows is not None:
+            count("schedule_cache_hits")
+        else:
+            rows, result = self._solve_components(groups, rooms, slots, profile, solve, context, prints)
+            self.put(full_key, rows, len(groups))
+            if result is not None:
+                return result # ไม่มีส่วนไหนอยู่ใน cache: ใช้ผลของ solve ได้เลย
+
+        assignments = []
+        calendars = {}
+        for gi, ri, si, score, start, end in rows:
+            assignment = Assignment(groups[gi], rooms[ri], slots[si], score, start, end)
+            assignments.append(assignment)
+            calendar = calendars.get(rooms[ri]["id"])
+            if calendar is None:
+                calendar = calendars[rooms[ri]["id"]] = RoomCalendar()
+            calendar.insert(start, end, assignment)
+        return assignments, calendars
+
+    def _solve_components(self, groups, rooms, slots, profile, solve, context, prints):
+        """
+        คืนค่า (rows, result) rows: (ลำดับกลุ่ม, ลำดับห้อง, ลำดับ slot, score, start, end) ของ assignment ที่เลือก
+        result: ผลของ solve เมื่อต้องจัดทุกกลุ่มใหม่ (ไม่มีส่วนไหนอยู่ใน cache) ไม่อย่างนั้นเป็น None
+        """
+        times = [tuple(slot_minutes(g, slot) for slot in slots) for g in groups]
+        rows = []
+        missing = []
+        result = None
+        components = split_components(groups, rooms, times)
+        for component in components:
+            key = (context, tuple(prints[i] for i in component))
+            cached = self.get(key)
+            if cached is None:
+                missing.append((component, key))
+            else:
+                rows.extend((component[row[0]],) + row[1:] for row in cached)
+        count("schedule_cache_component_hits", len(components) - len(missing))
+        count("schedule_cache_component_misses", len(missing))
+
+        if missing:
+            # ส่วนที่ไม่เกี่ยวข้องกันจัดรวมกันได้ในครั้งเดียว (ผลของแต่ละส่วนเหมือนจัดแยก)
+            indices = sorted(i for component, _ in missing for i in component)
+            subset = groups if len(indices) == len(groups) else [groups[i] for i in indices]
+            assignments, calendars = solve(subset, rooms, slots, profile)
+            if subset is groups:
+                result = (assignments, calendars)
+
+            group_index = {}
+            for i in indices:
+                group_index.setdefault(id(groups[i]), i)
+            room_index = {}
+            for ri, r in enumerate(rooms):
+                room_index.setdefault(id(r), ri)
+
+            solved = {}
+            for a in assignments:
+                gi = group_index[id(a.group)]
+                solved[gi] = (gi, room_index[id(a.room)], slots.index(a.slot), a.score, a.start, a.end)
+            for component, key in missing:
+                local = tuple((li,) + solved[gi][1:] for li, gi in enumerate(component) if gi in solved)
+                self.put(key, local, len(component))
+                rows.extend(solved[gi] for gi in component if gi in solved)
+
+        rows.sort(key=_row_order)
+        return tuple(rows), result
+
+
+def _row_order(row):
+    # ลำดับเดียวกับ sorted(candidates, key=score, reverse=True) ที่เรียงตัวเลือกตาม กลุ่ม -> ห้อง -> slot
+    gi, ri, si, score = row[:4]
+    return (-score, gi, ri, si)
+
+
+SCHEDULE_CACHE = ScheduleCache(int(os.environ.get("BOOKING_SCHEDULE_CACHE", "50000")))
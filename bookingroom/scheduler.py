@@ -0,0 +1,327 @@
+import os
+import sys
+import heapq
+from operator import attrgetter
+
+from bookingroom.config import DAY_START, DAY_END
+from bookingroom.metrics import span, count
+from bookingroom.records import Assignment
+from bookingroom.room_calendar import RoomCalendar
+from bookingroom.schedule_cache import SCHEDULE_CACHE
+from bookingroom.scoring import get_profile
+from bookingroom.timeutil import slot_minutes
+
+# -----------------------------
+# คำนวณคะแนน
+# -----------------------------
+# น้ำหนักอยู่ใน SCORING_PROFILES (config.py) profile: ScoringProfile, ชื่อ profile หรือ None (BOOKING_SCORING)
+def calculate_heuristic_score(group, room, slot, profile=None):
+    return get_profile(profile).score(group, room, slot)
+
+# -----------------------------
+# สร้างตัวเลือก (group, room, slot) ที่เป็นไปได้
+# -----------------------------
+# ตัวเลือกแต่ละรายการเป็น Assignment (__slots__) อ่านได้ทั้ง a.score และ a["score"]
+# start / end ของตัวเลือก (และ assignment) เป็นนาทีนับจากเที่ยงคืน เช็คเวลาชนด้วยจำนวนเต็ม
+# ส่วนของคะแนนที่ขึ้นกับกลุ่มอย่างเดียว / slot อย่างเดียว คำนวณครั้งเดียวแล้วประกอบรายคู่
+def build_candidates(groups, rooms, slots=("main",), profile=None):
+    profile = get_profile(profile)
+    slot_terms = profile.slot_terms(slots)
+    combine = profile.combine
+    possible_assignments = []
+
+    for g in groups:
+        priority_term, order_term = profile.group_terms(g)
+        times = [slot_minutes(g, slot) for slot in slots]
+        for r in rooms:
+            if g["size"] <= r["capacity"]:
+                wasted_term = profile.wasted_term(r, g)
+                for (slot, slot_term), (start, end) in zip(slot_terms, times):
+                    score = combine(priority_term, slot_term, wasted_term, order_term)
+                    possible_assignments.append(Assignment(g, r, slot, score, start, end))
+
+    count("candidates", len(possible_assignments))
+    return possible_assignments
+
+# -----------------------------
+# Greedy selection
+# -----------------------------
+_by_score = attrgetter("score")
+
+def greedy_select(possible_assignments):
+    """เลือกการจับคู่ตามคะแนนจากมากไปน้อย คืนค่า (assignments, calendars)"""
+    sorted_assignments = sorted(possible_assignments, key=_by_score, reverse=True)
+
+    final_assignments = []
+    assigned_groups = set()
+    calendars = {} # RoomCalendar ของแต่ละห้อง (ค้นหาเวลาชนแบบ O(log n))
+    checks = 0
+
+    for assignment in sorted_assignments:
+        group_id = assignment.group["id"]
+        room_id = assignment.room["id"]
+        start_time = assignment.start
+        end_time = assignment.end
+
+        if group_id in assigned_groups:
+            continue
+
+        calendar = calendars.get(room_id)
+        if calendar is None:
+            calendar = calendars[room_id] = RoomCalendar()
+
+        checks += 1
+        if not calendar.is_free(start_time, end_time):
+            continue
+
+        final_assignments.append(assignment)
+        assigned_groups.add(group_id)
+
+        calendar.insert(start_time, end_time, assignment)
+
+    count("conflict_checks", checks)
+    return final_assignments, calendars
+
+# -----------------------------
+# จัดสรรตาราง
+# -----------------------------
+# ตั้งแต่จำนวนตัวเลือก (กลุ่ม x ห้อง x slot) เท่านี้ขึ้นไป คำนวณคะแนนและเรียงด้วย NumPy
+# ถ้ายังไม่เคยโหลด NumPy ต้องคุ้มกับเวลาโหลด (~0.1 วินาที) จึงใช้เกณฑ์ที่สูงกว่า
+VECTORIZE_MIN_CANDIDATES = 2000
+VECTORIZE_MIN_CANDIDATES_COLD = 50000
+
+@span("scheduler.solve")
+def schedule_greedy(groups, rooms, slots=("main",), profile=None):
+    """
+    greedy_select ของทุกตัวเลือก คืนค่า (assignments, calendars) เลือกใช้ NumPy เมื่อข้อมูลมาก
+    ส่วนของตารางที่ข้อมูลไม่เปลี่ยนจากครั้งก่อนดึงจาก SCHEDULE_CACHE (ดู schedule_cache.py)
+    """
+    if groups and SCHEDULE_CACHE.max_groups > 0:
+        return SCHEDULE_CACHE.schedule(groups, rooms, slots, profile, _solve_greedy)
+    return _solve_greedy(groups, rooms, slots, profile)
+
+
+def _solve_greedy(groups, rooms, slots=("main",), profile=None):
+    threshold = VECTORIZE_MIN_CANDIDATES if "numpy" in sys.modules else VECTORIZE_MIN_CANDIDATES_COLD
+    if len(groups) * len(rooms) * len(slots) >= threshold:
+        try:
+            from bookingroom.vectorized import greedy_select_vectorized
+            return greedy_select_vectorized(groups, rooms, slots, profile)
+        except ImportError:
+            pass # ไม่มี NumPy ใช้แบบเดิม
+    return greedy_select(build_candidates(groups, rooms, slots, profile))
+
+
+def schedule_with_heuristic(groups, rooms, slots=("main",), profile=None):
+    final_assignments, _ = schedule_greedy(groups, rooms, slots, profile)
+    return final_assignments
+
+# -----------------------------
+# เลือกวิธีจัดตาราง
+# -----------------------------
+#   "greedy"   -> schedule_with_heuristic (ค่าเริ่มต้น)
+#   "optimize" -> MILP ที่ใช้คะแนนเดียวกัน เริ่มจากผล greedy และจำกัดเวลาด้วย BOOKING_TIME_LIMIT (วินาที)
+SCHEDULER_MODES = ("greedy", "optimize")
+
+def schedule_groups(groups, rooms, slots=("main",), mode=None, time_limit=None, profile=None):
+    """เลือกวิธีจากพารามิเตอร์ หรือ environment variable BOOKING_SCHEDULER (ค่าเริ่มต้น greedy)"""
+    mode = mode or os.environ.get("BOOKING_SCHEDULER", "greedy")
+    if mode not in SCHEDULER_MODES:
+        raise ValueError(f"ไม่รู้จักวิธีจัดตาราง: {mode!r} (เลือกได้: {', '.join(SCHEDULER_MODES)})")
+    if mode == "greedy" or not groups:
+        return schedule_with_heuristic(groups, rooms, slots, profile)
+
+    from bookingroom.ilp import schedule_optimal
+
+    if time_limit is None:
+        time_limit = float(os.environ.get("BOOKING_TIME_LIMIT", "10"))
+    assignments, result = schedule_optimal(groups, rooms, slots, time_limit=time_limit, profile=profile)
+    state = "optimal" if result["status"] == "optimal" else f"หมดเวลา {time_limit:g} วินาที"
+    gap = "ไม่ทราบ" if result["gap"] is None else f"{result['gap']:.1%}"
+    print(f"🧮 optimize ({state}): คะแนนรวม {result['objective']:.2f} "
+          f"(greedy {result['greedy_objective']:.2f}), gap {gap}")
+    return assignments
+
+# -----------------------------
+# จัดสรรตารางแบบเพิ่มทีละกลุ่ม (Incremental)
+# -----------------------------
+# เก็บผลการจัดตารางปัจจุบันไว้ในหน่วยความจำ เมื่อมีกลุ่มใหม่จะตรวจเฉพาะ
+# ตัวเลือกของกลุ่มนั้น (จำนวนห้อง x slot) แทนการจัดตารางใหม่ทั้งหมด
+#
+# ผลลัพธ์ตรงกับ schedule_with_heuristic(groups + [group]) เสมอ:
+# ตัวเลือกของกลุ่มใหม่ที่ชนกับการจองที่คะแนน >= ตัวเอง จะถูกปฏิเสธเหมือนใน greedy
+# แต่ถ้าชนเฉพาะการจองที่คะแนนต่ำกว่า แปลว่ากลุ่มใหม่จะแย่งที่กลุ่มเดิม
+# กรณีนี้เท่านั้นที่ต้อง re-solve ทั้งหมด
+class IncrementalScheduler:
+    def __init__(self, rooms, groups=None, slots=("main",), profile=None):
+        self.rooms = rooms
+        self.slots = slots
+        self.profile = get_profile(profile)
+        self.rebuild(groups or [])
+
+    def plan_rebuild(self, groups):
+        """Dry run ของ rebuild: คืนค่า (assignments, calendars) ของรายการกลุ่มนี้ โดยไม่แก้ไขตารางปัจจุบัน"""
+        return schedule_greedy(list(groups), self.rooms, self.slots, self.profile)
+
+    def rebuild(self, groups, result=None):
+        """จัดตารางใหม่ทั้งหมดจากรายการกลุ่ม (result: ผลของ plan_rebuild กับรายการเดียวกัน ถ้ามี)"""
+        self.groups = list(groups)
+        if result is None:
+            result = schedule_greedy(self.groups, self.rooms, self.slots, self.profile)
+        self.assignments, self.calendars = result
+        self.group_ids = {g["id"] for g in self.groups}
+        self._pending = None
+
+    def _plan_key(self, group):
+        # ใช้ตรวจว่าผล dry run ยังใช้ได้ (กลุ่มอาจถูกแก้เวลาหลังจาก plan)
+        return (id(group), group["size"], group["priority"], group["order"]) + \
+            tuple(group[f"{slot}_{edge}"] for slot in self.slots for edge in ("start", "end"))
+
+    def _calendar(self, room_id):
+        calendar = self.calendars.get(room_id)
+        if calendar is None:
+            calendar = self.calendars[room_id] = RoomCalendar()
+        return calendar
+
+    @span("scheduler.plan")
+    def plan(self, group):
+        """
+        Dry run: หาว่ากลุ่มใหม่จะได้ห้องไหน โดยไม่แก้ไขตารางปัจจุบัน
+        คืนค่า assignment ของกลุ่มใหม่ หรือ None ถ้าจัดไม่ได้
+        """
+        if group["id"] in self.group_ids:
+            return self._plan_full(group)
+
+        candidates = build_candidates([group], self.rooms, self.slots, self.profile)
+        candidates.sort(key=_by_score, reverse=True)
+
+        for candidate in candidates:
+            calendar = self.calendars.get(candidate.room["id"])
+            if calendar is None:
+                conflicts = []
+            else:
+                conflicts = calendar.overlapping(candidate.start, candidate.end)
+                count("conflict_checks")
+
+            if not conflicts:
+                self._pending = (self._plan_key(group), candidate, None)
+                return candidate
+
+            # การจองเดิมที่คะแนนเท่ากันถูกพิจารณาก่อน (sort แบบ stable)
+            if any(a.score >= candidate.score for a in conflicts):
+                continue
+
+            # กลุ่มใหม่จะแย่งที่กลุ่มเดิม -> ต้องจัดใหม่ทั้งหมด
+            return self._plan_full(group)
+
+        self._pending = (self._plan_key(group), None, None)
+        return None
+
+    def _plan_full(self, group):
+        result = schedule_greedy(self.groups + [group], self.rooms, self.slots, self.profile)
+        assignment = next((a for a in result[0] if a.group is group), None)
+        self._pending = (self._plan_key(group), assignment, result)
+        return assignment
+
+    @span("scheduler.add")
+    def add_group(self, group):
+        """เพิ่มกลุ่มใหม่เข้าตาราง คืนค่า assignment ของกลุ่มนั้น หรือ None"""
+        if self._pending is None or self._pending[0] != self._plan_key(group):
+            self.plan(group)
+        _, assignment, full_result = self._pending
+        self._pending = None
+
+        self.groups.append(group)
+        self.group_ids.add(group["id"])
+
+        if full_result is not None:
+            self.assignments, self.calendars = full_result
+        elif assignment is not None:
+            self.assignments.append(assignment)
+            self._calendar(assignment.room["id"]).insert(
+                assignment.start, assignment.end, assignment)
+
+        return assignment
+
+# -----------------------------
+# ปฏิทินของทุกห้องจากผลการจัดตาราง
+# -----------------------------
+def room_calendars(assignments, rooms):
+    """คืนค่า dict: room_id -> RoomCalendar (รวม bitset ช่วงว่าง) สร้างครั้งเดียวแทนการกรอง assignments ทุกห้อง"""
+    calendars = {room["id"]: RoomCalendar() for room in rooms}
+    for a in assignments:
+        calendar = calendars.get(a["room"]["id"])
+        if calendar is not None:
+            calendar.insert(a["start"], a["end"], a)
+    return calendars
+
+# -----------------------------
+# แนะนำช่วงเวลาใกล้เคียงเมื่อเวลาซ้ำกัน
+# -----------------------------
+def _room_density(calendar, day_start, day_end):
+    # สัดส่วนเวลาที่ห้องถูกจองในวันนั้น
+    booked = sum(max(0, min(end, day_end) - max(start, day_start)) for start, end in calendar.intervals())
+    ratio = booked / (day_end - day_start)
+    if ratio < 0.3:
+        return "ต่ำ"
+    return "ปานกลาง" if ratio < 0.6 else "สูง"
+
+
+def score_alternative(group, room, start, end, demand=None, profile=None):
+    """คะแนนของช่วงเวลาแนะนำ: คะแนน heuristic ของห้อง หักระยะห่างจากเวลาที่ขอ และความต้องการใช้ห้องที่พยากรณ์ไว้"""
+    w_distance = 2   # น้ำหนักติดลบต่อชั่วโมงที่ห่างจากเวลาที่ขอ
+    w_demand = 1     # น้ำหนักติดลบสำหรับ demand เฉลี่ยของชั่วโมงที่ใช้ห้อง
+
+    requested_start, _ = slot_minutes(group, "main")
+    distance = abs(start - requested_start) / 60
+
+    busy_demand = 0
+    if demand:
+        hours = range(start // 60, -(-end // 60))
+        busy_demand = sum(demand.get(hour, 0) for hour in hours) / len(hours)
+
+    return calculate_heuristic_score(group, room, "main", profile) - \
+           (w_distance * distance) - \
+           (w_demand * busy_demand)
+
+
+@span("scheduler.alternatives")
+def suggest_alternative_times(group, assignments, rooms, k=3, granularity=30, demand=None, profile=None):
+    """
+    คืนค่าช่วงเวลาว่าง k อันดับแรก (dict: room, start, end, density, score) เรียงตามคะแนน
+    - เวลาเริ่มที่ว่างของแต่ละห้องทุก granularity นาที (นับจาก DAY_START) จาก RoomCalendar.free_starts
+      (shift-AND ของ bitset เมื่อการจองลงเส้นช่อง 5 นาที ไม่อย่างนั้นไล่ช่วงว่างจากการจองที่เรียงแล้ว)
+    - ข้ามห้องที่เล็กกว่าจำนวนผู้เข้าร่วม
+    - demand: dict ชั่วโมง -> ค่าพยากรณ์ (ผลจาก forecast_hourly_demand) ถ้ามี
+    - profile: ScoringProfile / ชื่อ profile ที่ใช้ให้คะแนน (ควรเป็นตัวเดียวกับที่จัดตาราง)
+    start / end เป็นนาที ยาวเท่าเวลาหลักของกลุ่ม
+    """
+    main_start, main_end = slot_minutes(group, "main")
+    duration = main_end - main_start
+    day_start, day_end = DAY_START * 60, DAY_END * 60
+    if duration <= 0:
+        return []
+    calendars = room_calendars(assignments, rooms)
+
+    def candidates():
+        for room in rooms:
+            if group["size"] > room["capacity"]:
+                continue
+            calendar = calendars[room["id"]]
+            density = _room_density(calendar, day_start, day_end)
+            for start in calendar.free_starts(duration, granularity):
+                end = start + duration
+                yield {
+                    "room": room["id"],
+                    "start": start,
+                    "end": end,
+                    "density": density,
+                    "score": score_alternative(group, room, start, end, demand, profile)
+                }
+
+    # เท่ากับ sorted(..., reverse=True)[:k] (คะแนนเท่ากันคงลำดับห้อง / เวลาเดิม)
+    return heapq.nlargest(k, candidates(), key=lambda x: x["score"])
+
+
+# ชื่อเดิม (BookingWithAI_Full_Version.py รุ่นก่อน)
+find_alternative_times = suggest_alternative_times
@@ -0,0 +1,75 @@
+import os
+
+from bookingroom.config import SCORING_PROFILES
+
+# -----------------------------
+# ชุดน้ำหนักของคะแนน heuristic
+# -----------------------------
+# score = ((priority * P) + (main_slot * [slot == main])) - (wasted_space * ที่ว่างในห้อง) + (order * 1/O)
+# คำนวณตามลำดับนี้เสมอ (ทั้งแบบทีละคู่ แบบ precompute และแบบ NumPy) ค่า float จึงตรงกันทุกบิต
+class ScoringProfile:
+    def __init__(self, name="default", order=1, priority=10, main_slot=5, wasted_space=0.5):
+        self.name = name
+        self.order = order
+        self.priority = priority
+        self.main_slot = main_slot
+        self.wasted_space = wasted_space
+
+    @classmethod
+    def from_config(cls, name, profiles=SCORING_PROFILES):
+        try:
+            weights = profiles[name]
+        except KeyError:
+            raise ValueError(f"ไม่รู้จัก scoring profile {name!r} (เลือกได้: {', '.join(profiles)})") from None
+        return cls(name, **weights)
+
+    def __repr__(self):
+        return (f"ScoringProfile({self.name!r}, order={self.order}, priority={self.priority}, "
+                f"main_slot={self.main_slot}, wasted_space={self.wasted_space})")
+
+    def key(self):
+        """น้ำหนักทั้งหมด (ส่วนหนึ่งของ fingerprint ใน schedule_cache)"""
+        return (self.order, self.priority, self.main_slot, self.wasted_space)
+
+    # --- คำนวณทีละคู่ (ตัวอ้างอิง) ---
+    def score(self, group, room, slot):
+        priority = group["priority"]
+        bonus_main = 1 if slot == "main" else 0
+        wasted_space = max(0, room["capacity"] - group["size"])
+
+        return (self.priority * priority) + \
+               (self.main_slot * bonus_main) - \
+               (self.wasted_space * wasted_space) + \
+               (self.order * (1 / group["order"]))
+
+    # --- ส่วนที่คำนวณครั้งเดียวต่อการจัดตาราง ---
+    def group_terms(self, group):
+        """(ส่วนของ priority, ส่วนของลำดับการจอง) ของกลุ่ม ไม่ขึ้นกับห้อง / slot"""
+        return self.priority * group["priority"], self.order * (1 / group["order"])
+
+    def slot_terms(self, slots):
+        """list ของ (slot, โบนัสเวลาหลัก)"""
+        return [(slot, self.main_slot * (1 if slot == "main" else 0)) for slot in slots]
+
+    def wasted_term(self, room, group):
+        return self.wasted_space * max(0, room["capacity"] - group["size"])
+
+    @staticmethod
+    def combine(priority_term, slot_term, wasted_term, order_term):
+        return ((priority_term + slot_term) - wasted_term) + order_term
+
+
+_profiles = {}
+
+def get_profile(profile=None):
+    """
+    คืนค่า ScoringProfile จาก object, ชื่อใน SCORING_PROFILES
+    หรือ environment variable BOOKING_SCORING (ค่าเริ่มต้น default)
+    """
+    if isinstance(profile, ScoringProfile):
+        return profile
+    name = profile or os.environ.get("BOOKING_SCORING", "default")
+    cached = _profiles.get(name)
+    if cached is None:
+        cached = _profiles[name] = ScoringProfile.from_config(name)
+    return cached
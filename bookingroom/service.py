@@ -0,0 +1,464 @@
+"""
+Booking service: ถือตารางการจองไว้ในหน่วยความจำ ให้หลาย client จองพร้อมกันได้โดยข้อมูลไม่หาย
+
+    python -m bookingroom.service                          Unix socket Data/booking.sock
+    python -m bookingroom.service --port 8765              TCP 127.0.0.1:8765
+
+Protocol: JSON หนึ่งบรรทัดต่อคำขอ และตอบกลับ JSON หนึ่งบรรทัด
+    {"op": "schedule", "date": "2025-12-09"}
+    {"op": "add", "group": {"id": "A", "activity": "ประชุม", "priority": 3, "main_start": 9.30,
+                           "main_end": 11.00, "size": 6}}
+    {"op": "add", "name": "A", "text": "ประชุมทีม 9 โมงครึ่งถึง 11 โมง 6 คน"}
+    {"op": "update", "group": {...}, "version": 2}
+    {"op": "cancel", "id": "A", "version": 3}
+ตอบกลับ {"ok": true, ...} หรือ {"ok": false, "error": "...", "conflict": true, "version": n}
+
+- คำขออ่าน (schedule / groups / alternatives) ตอบจากหน่วยความจำทันที พร้อมกันได้หลาย client
+- คำขอเขียน (add / update / cancel) เข้าคิวให้ writer task เดียวทำทีละรายการ
+  จึงไม่มีการเขียนทับกัน และไม่ต้องโหลดไฟล์ใหม่ทุกคำขอ
+- update / cancel ต้องส่ง version ของกลุ่มที่อ่านมาได้ (compare-and-swap): ถ้ามีคนแก้ไปก่อน
+  version จะไม่ตรงและได้ conflict กลับไป ให้ client อ่านใหม่แล้วลองอีกครั้ง
+  update ที่ทำให้กลุ่มไม่ได้ห้องจะถูกปฏิเสธ (การจองเดิมยังอยู่) พร้อมช่วงเวลาแนะนำเหมือน add
+- งานที่ใช้ CPU มาก (ตัดคำจาก text, forecast, optimize) ส่งไปทำใน WorkerPool (bookingroom/workers.py)
+  ถ้างานค้างเต็มจะได้ {"ok": false, "busy": true} และถ้าเกินเวลาได้ {"ok": false, "timeout": true}
+    {"op": "forecast", "date": "2025-12-09"}           demand รายชั่วโมง (ใช้จัดอันดับ alternatives ต่อ)
+    {"op": "optimize", "date": "2025-12-09", "time_limit": 10}   ตาราง optimal (ไม่แก้ไขตารางจริง)
+- {"op": "metrics"} / {"op": "metrics", "format": "prometheus"} เวลาแต่ละขั้นตอนและ counter ของ service
+  (ไม่รวมงานที่ทำใน process ลูกของ WorkerPool)
+เวลาใน protocol เป็นแบบ ชั่วโมง.นาที (9.30) เหมือนไฟล์ Booking_<วันที่>.txt
+"""
+import os
+import sys
+import json
+import asyncio
+import argparse
+from datetime import date as _date
+
+from bookingroom.config import ACTIVITY_CONFIG, ROOMS, DAY_START, DAY_END
+from bookingroom.metrics import span, snapshot, to_prometheus
+from bookingroom.records import as_dict, make_group
+from bookingroom.scheduler import IncrementalScheduler, suggest_alternative_times
+from bookingroom.storage import DATA_DIR, open_storage
+from bookingroom.timeutil import to_hhmm, to_minutes
+from bookingroom.workers import PoolBusy, TaskTimeout, WorkerPool, parse_task, forecast_task, optimize_task
+
+SOCKET_PATH = os.path.join(DATA_DIR, "booking.sock")
+LINE_LIMIT = 16 * 1024 * 1024 # ขนาดสูงสุดของหนึ่งบรรทัด (ตารางทั้งวัน)
+
+
+class BookingConflict(Exception):
+    """version ที่ client ส่งมาไม่ตรงกับข้อมูลปัจจุบัน (มีคนแก้ไขไปก่อน)"""
+
+    def __init__(self, message, version):
+        super().__init__(message)
+        self.version = version
+
+
+class BookingRejected(Exception):
+    """จัดห้องให้กลุ่มไม่ได้ (ส่งช่วงเวลาแนะนำกลับไปด้วย)"""
+
+    def __init__(self, message, alternatives):
+        super().__init__(message)
+        self.alternatives = alternatives
+
+# -----------------------------
+# สถานะของหนึ่งวัน
+# -----------------------------
+class DayBook:
+    """กลุ่ม ผลการจัดตาราง และ version ของวันหนึ่งวัน (แก้ไขโดย writer task เท่านั้น)"""
+
+    def __init__(self, date, groups, rooms, slots, profile):
+        self.date = date
+        self.scheduler = IncrementalScheduler(rooms, groups, slots, profile)
+        self.version = 0 # เพิ่มทุกครั้งที่วันนี้มีการเขียน
+        self.group_versions = {g["id"]: 1 for g in self.scheduler.groups}
+        self.demand = None # ผล forecast ล่าสุดของวันนี้ (ใช้จัดอันดับช่วงเวลาแนะนำ)
+
+    def find(self, group_id):
+        """กลุ่มล่าสุดที่มี id นี้ (ไฟล์จาก Full CLI อาจมีชื่อซ้ำ storage.update_group ก็แก้รายการล่าสุด)"""
+        groups = self.scheduler.groups
+        for i in range(len(groups) - 1, -1, -1):
+            if groups[i]["id"] == group_id:
+                return i, groups[i]
+        raise KeyError(group_id)
+
+    def check_version(self, group_id, expected):
+        current = self.group_versions.get(group_id)
+        if current is None:
+            raise LookupError(f"ไม่พบกลุ่ม {group_id!r} ในวันที่ {self.date}")
+        if expected is None:
+            raise ValueError(f"ต้องส่ง version ของกลุ่ม {group_id!r} (อ่านได้จาก op groups)")
+        if isinstance(expected, bool) or not isinstance(expected, int):
+            raise ValueError(f"version ต้องเป็นจำนวนเต็ม: {expected!r}")
+        if expected != current:
+            raise BookingConflict(f"กลุ่ม {group_id!r} ถูกแก้ไขไปแล้ว (version {current})", current)
+
+# -----------------------------
+# แปลงข้อมูลเข้า / ออก
+# -----------------------------
+def _check_date(date):
+    # ใช้เป็นชื่อไฟล์ด้วย จึงต้องเป็นวันที่จริงเท่านั้น
+    if date is None:
+        return _date.today().isoformat()
+    try:
+        return _date.fromisoformat(date).isoformat()
+    except (TypeError, ValueError):
+        raise ValueError(f"วันที่ไม่ถูกต้อง: {date!r} (ใช้รูปแบบ YYYY-MM-DD)") from None
+
+
+def _check_times(start, end, label):
+    start_min, end_min = to_minutes(start), to_minutes(end)
+    if not DAY_START * 60 <= start_min < end_min <= DAY_END * 60:
+        raise ValueError(f"เวลา{label} {start} - {end} ไม่อยู่ในช่วง {DAY_START}.00 - {DAY_END}.00 น.")
+
+
+def group_from_request(data, order, date=None):
+    """สร้าง Group จาก dict ที่ client ส่งมา (id, activity, priority, main_start, main_end, size, alt_*)"""
+    try:
+        group_id = str(data["id"]).strip()
+        activity = str(data["activity"])
+        priority = int(data["priority"])
+        size = int(data["size"])
+        main_start, main_end = float(data["main_start"]), float(data["main_end"])
+        alt_start = data.get("alt_start")
+        alt_end = data.get("alt_end")
+        if alt_start is not None:
+            alt_start, alt_end = float(alt_start), float(alt_end)
+    except KeyError as e:
+        raise ValueError(f"ข้อมูลกลุ่มไม่ครบ: ไม่มี {e.args[0]!r}") from None
+    except (TypeError, ValueError):
+        raise ValueError("ข้อมูลกลุ่มผิดรูปแบบ") from None
+
+    if not group_id:
+        raise ValueError("ต้องระบุชื่อกลุ่ม (id)")
+    if size < 1:
+        raise ValueError("จำนวนผู้เข้าร่วมต้องมากกว่า 0")
+    _check_times(main_start, main_end, "หลัก")
+    if alt_start is not None:
+        _check_times(alt_start, alt_end, "สำรอง")
+    return make_group(order, group_id, activity, priority, main_start, main_end, size,
+                      alt_start, alt_end, date)
+
+
+def assignment_to_json(assignment):
+    return {
+        "group": assignment.group["id"],
+        "room": assignment.room["id"],
+        "slot": assignment.slot,
+        "start": to_hhmm(assignment.start),
+        "end": to_hhmm(assignment.end),
+        "score": assignment.score,
+    }
+
+
+def alternative_to_json(alternative):
+    return dict(alternative, start=to_hhmm(alternative["start"]), end=to_hhmm(alternative["end"]))
+
+# -----------------------------
+# Service
+# -----------------------------
+class BookingService:
+    """
+    ถือ DayBook ของทุกวันที่มีการใช้งานไว้ในหน่วยความจำ (โหลดจาก storage ครั้งแรกที่ถูกเรียก)
+    ทุกอย่างรันใน event loop เดียว การแก้ไขแต่ละรายการทำจนจบโดยไม่มี await คั่น
+    คำขออ่านจึงเห็นข้อมูลก่อนหรือหลังการเขียนแต่ละครั้งเสมอ ไม่เห็นครึ่ง ๆ กลาง ๆ
+    """
+
+    READ_OPS = ("schedule", "groups", "alternatives")
+    POOL_OPS = ("forecast", "optimize")
+    WRITE_OPS = ("add", "update", "cancel")
+
+    def __init__(self, storage=None, rooms=ROOMS, slots=("main",), profile=None, queue_size=1024,
+                 pool=None):
+        self.storage = storage or open_storage()
+        self.pool = pool or WorkerPool()
+        self.rooms = rooms
+        self.slots = slots
+        self.profile = profile
+        self.queue_size = queue_size
+        self.days = {}
+        self._writes = None
+        self._writer = None
+
+    def day(self, date):
+        book = self.days.get(date)
+        if book is None:
+            groups = self.storage.load_groups(date)
+            book = self.days[date] = DayBook(date, groups, self.rooms, self.slots, self.profile)
+        return book
+
+    async def start(self):
+        self._writes = asyncio.Queue(self.queue_size)
+        self._writer = asyncio.create_task(self._write_loop())
+
+    async def stop(self):
+        if self._writer is not None:
+            self._writer.cancel()
+            try:
+                await self._writer
+            except asyncio.CancelledError:
+                pass
+            self._writer = None
+        self.pool.shutdown()
+        self.storage.close()
+
+    async def handle(self, request):
+        """รับคำขอ (dict) คืนค่าคำตอบ (dict)"""
+        try:
+            if not isinstance(request, dict):
+                raise ValueError("คำขอต้องเป็น JSON object")
+            op = request.get("op")
+            if op == "metrics":
+                if request.get("format") == "prometheus":
+                    return {"ok": True, "text": to_prometheus()}
+                return {"ok": True, **snapshot()}
+            date = _check_date(request.get("date"))
+            if op in self.READ_OPS:
+                return {"ok": True, **getattr(self, f"_read_{op}")(self.day(date), request)}
+            if op in self.POOL_OPS:
+                return {"ok": True, **await getattr(self, f"_pool_{op}")(self.day(date), request)}
+            if op in self.WRITE_OPS:
+                request = await self._prepare(op, request)
+                future = asyncio.get_running_loop().create_future()
+                await self._writes.put((op, date, request, future))
+                return {"ok": True, **await future}
+            raise ValueError(f"ไม่รู้จักคำสั่ง {op!r}")
+        except BookingConflict as e:
+            return {"ok": False, "error": str(e), "conflict": True, "version": e.version}
+        except PoolBusy as e:
+            return {"ok": False, "error": str(e), "busy": True}
+        except TaskTimeout as e:
+            return {"ok": False, "error": str(e), "timeout": True}
+        except BookingRejected as e:
+            return {"ok": False, "error": str(e),
+                    "alternatives": [alternative_to_json(a) for a in e.alternatives]}
+        except (ValueError, LookupError) as e:
+            return {"ok": False, "error": str(e)}
+        except Exception as e:
+            return {"ok": False, "error": f"เกิดข้อผิดพลาด: {e}"}
+
+    async def _prepare(self, op, request):
+        # งานที่ไม่ต้องแตะสถานะ (เช่นแยกข้อมูลจากประโยค) ทำก่อนเข้าคิว writer
+        if op == "add" and "group" not in request and "text" in request:
+            parsed = await self.pool.run(parse_task, str(request["text"]))
+            request = dict(request, group=self._parsed_group(request, parsed))
+        return request
+
+    @staticmethod
+    def _parsed_group(request, parsed):
+        if parsed["start"] is None:
+            raise ValueError("ไม่พบช่วงเวลาในข้อความ")
+        return {"id": request.get("name") or request.get("id") or "", "activity": parsed["activity"],
+                "priority": parsed["priority"], "size": parsed["size"],
+                "main_start": to_hhmm(parsed["start"]), "main_end": to_hhmm(parsed["end"])}
+
+    # ---------- อ่าน (ตอบจากหน่วยความจำ) ----------
+    def _read_schedule(self, book, request):
+        return {"date": book.date, "version": book.version,
+                "assignments": [assignment_to_json(a) for a in book.scheduler.assignments]}
+
+    def _read_groups(self, book, request):
+        return {"date": book.date, "version": book.version,
+                "groups": [dict(as_dict(g), version=book.group_versions[g["id"]])
+                           for g in book.scheduler.groups]}
+
+    def _read_alternatives(self, book, request):
+        group = group_from_request(request.get("group") or {}, len(book.scheduler.groups) + 1)
+        alternatives = suggest_alternative_times(group, book.scheduler.assignments, self.rooms,
+                                                 k=int(request.get("k", 3)), demand=book.demand,
+                                                 profile=self.profile)
+        return {"date": book.date, "alternatives": [alternative_to_json(a) for a in alternatives]}
+
+    # ---------- งานหนัก (WorkerPool, ไม่แก้ไขสถานะ) ----------
+    # ส่งสำเนาข้อมูล ณ ตอนที่รับคำขอไปให้ process ลูก การเขียนที่เกิดขึ้นระหว่างรอจึงไม่กระทบผล
+    async def _pool_forecast(self, book, request):
+        priorities = [c["priority"] for c in ACTIVITY_CONFIG]
+        demand = await self.pool.run(forecast_task, book.scheduler.groups, self.rooms, priorities)
+        book.demand = demand
+        return {"date": book.date, "demand": {str(hour): value for hour, value in demand.items()}}
+
+    async def _pool_optimize(self, book, request):
+        time_limit = float(request.get("time_limit", 10))
+        assignments, result = await self.pool.run(
+            optimize_task, book.scheduler.groups, self.rooms, self.slots, time_limit, self.profile,
+            timeout=max(self.pool.timeout, time_limit + 5))
+        return {"date": book.date, "status": result["status"], "objective": result["objective"],
+                "greedy_objective": result["greedy_objective"], "gap": result["gap"],
+                "assignments": [assignment_to_json(a) for a in assignments]}
+
+    # ---------- เขียน (writer task เดียว) ----------
+    async def _write_loop(self):
+        while True:
+            op, date, request, future = await self._writes.get()
+            try:
+                with span(f"service.{op}"):
+                    result = getattr(self, f"_write_{op}")(self.day(date), request)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                if not future.done():
+                    future.set_result(result)
+            finally:
+                self._writes.task_done()
+
+    def _written(self, book, group_id):
+        book.version += 1
+        result = {"date": book.date, "version": book.version,
+                  "group_version": book.group_versions.get(group_id)}
+        assignment = next((a for a in book.scheduler.assignments if a.group["id"] == group_id), None)
+        result["assignment"] = assignment_to_json(assignment) if assignment is not None else None
+        return result
+
+    def _write_add(self, book, request):
+        scheduler = book.scheduler
+        group = group_from_request(request.get("group") or {}, len(scheduler.groups) + 1, book.date)
+        if group["id"] in book.group_versions:
+            raise BookingConflict(f"ชื่อกลุ่ม {group['id']!r} ซ้ำกับการจองที่มีอยู่",
+                                  book.group_versions[group["id"]])
+
+        if scheduler.plan(group) is None:
+            alternatives = suggest_alternative_times(group, scheduler.assignments, self.rooms,
+                                                     profile=self.profile)
+            raise BookingRejected("ไม่มีห้องว่างในเวลาที่ขอ", alternatives)
+
+        scheduler.add_group(group)
+        self.storage.add_group(group, book.date)
+        book.group_versions[group["id"]] = 1
+        return self._written(book, group["id"])
+
+    def _write_update(self, book, request):
+        data = request.get("group") or {}
+        group_id = str(data.get("id", "")).strip()
+        book.check_version(group_id, request.get("version"))
+        index, old = book.find(group_id)
+        group = group_from_request(data, old["order"], book.date)
+
+        groups = list(book.scheduler.groups)
+        groups[index] = group
+        result = book.scheduler.plan_rebuild(groups)
+        if not any(a.group is group for a in result[0]):
+            alternatives = suggest_alternative_times(group, result[0], self.rooms, profile=self.profile)
+            raise BookingRejected("ไม่มีห้องว่างในเวลาที่แก้ไข (การจองเดิมยังไม่เปลี่ยน)", alternatives)
+        book.scheduler.rebuild(groups, result)
+        self.storage.update_group(group, book.date)
+        book.group_versions[group_id] += 1
+        return self._written(book, group_id)
+
+    def _write_cancel(self, book, request):
+        group_id = str(request.get("id", "")).strip()
+        book.check_version(group_id, request.get("version"))
+
+        book.scheduler.rebuild([g for g in book.scheduler.groups if g["id"] != group_id])
+        self.storage.cancel_group(group_id, book.date)
+        del book.group_versions[group_id]
+        book.version += 1
+        return {"date": book.date, "version": book.version}
+
+# -----------------------------
+# Server / client (JSON lines)
+# -----------------------------
+async def _serve_connection(service, reader, writer):
+    # คำขอจาก connection เดียวกันตอบตามลำดับ ส่วนหลาย connection ทำงานพร้อมกัน
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError:
+                response = {"ok": False, "error": "JSON ผิดรูปแบบ"}
+            else:
+                response = await service.handle(request)
+            writer.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+            await writer.drain()
+    except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+        pass
+    except asyncio.CancelledError:
+        # ปิด server ขณะ client ยังเชื่อมต่ออยู่ (จบ connection เงียบ ๆ ไม่ต้องแสดง traceback)
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(service, path=None, host="127.0.0.1", port=None):
+    """เปิด server (Unix socket ถ้าไม่ระบุ port) จนกว่าจะถูกยกเลิก"""
+    await service.start()
+    handler = lambda reader, writer: _serve_connection(service, reader, writer)
+    if port is None:
+        path = path or SOCKET_PATH
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        if os.path.exists(path):
+            os.remove(path)
+        server = await asyncio.start_unix_server(handler, path, limit=LINE_LIMIT)
+        address = path
+    else:
+        server = await asyncio.start_server(handler, host, port, limit=LINE_LIMIT)
+        address = f"{host}:{port}"
+
+    print(f"🚀 Booking service พร้อมใช้งานที่ {address}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
+        if port is None and os.path.exists(path):
+            os.remove(path)
+
+
+class BookingClient:
+    """client แบบ asyncio: await client.request({"op": "schedule"})"""
+
+    def __init__(self, path=None, host="127.0.0.1", port=None):
+        self.path = path or SOCKET_PATH
+        self.host = host
+        self.port = port
+        self._reader = self._writer = None
+
+    async def connect(self):
+        if self.port is None:
+            self._reader, self._writer = await asyncio.open_unix_connection(self.path, limit=LINE_LIMIT)
+        else:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port, limit=LINE_LIMIT)
+        return self
+
+    async def request(self, payload):
+        if self._writer is None:
+            await self.connect()
+        self._writer.write(json.dumps(payload, ensure_ascii=False).encode("utf-8") + b"\n")
+        await self._writer.drain()
+        line = await self._reader.readline()
+        if not line:
+            raise ConnectionError("service ปิดการเชื่อมต่อ")
+        return json.loads(line)
+
+    async def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            await self._writer.wait_closed()
+            self._reader = self._writer = None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Booking service (JSON lines)")
+    parser.add_argument("--socket", help=f"Unix socket (ค่าเริ่มต้น {SOCKET_PATH})")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, help="ใช้ TCP แทน Unix socket")
+    parser.add_argument("--slots", default="main", help="slot ที่ให้เลือก เช่น main หรือ main,alt")
+    parser.add_argument("--workers", type=int, help="จำนวน process สำหรับงานหนัก (ค่าเริ่มต้นตามจำนวน CPU)")
+    parser.add_argument("--max-pending", type=int, help="งานหนักค้างได้สูงสุดกี่งาน (ค่าเริ่มต้น 4 x workers)")
+    parser.add_argument("--timeout", type=float, default=30.0, help="เวลาสูงสุดต่องานหนัก (วินาที)")
+    args = parser.parse_args(argv)
+
+    pool = WorkerPool(args.workers, args.max_pending, args.timeout)
+    service = BookingService(slots=tuple(args.slots.split(",")), pool=pool)
+    try:
+        asyncio.run(serve(service, args.socket, args.host, args.port))
+    except KeyboardInterrupt:
+        print("\nปิด Booking service แล้ว 🙏")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
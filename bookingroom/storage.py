@@ -0,0 +1,499 @@
+import os
+import json
+import time
+import threading
+from datetime import datetime
+
+from bookingroom.metrics import span
+from bookingroom.records import Group, as_dict
+from bookingroom.timeutil import to_hhmm
+
+# -----------------------------
+# ตำแหน่งไฟล์ข้อมูลการจอง
+# -----------------------------
+DATA_DIR = "Data"
+
+def booking_filename(date=None):
+    if date is None:
+        date = datetime.now().strftime("%Y-%m-%d")
+    return os.path.join(DATA_DIR, f"Booking_{date}.txt")
+
+def _write_groups(groups, filename):
+    # เขียนลงไฟล์ชั่วคราวก่อนแล้วค่อยแทนที่ กันไฟล์เสียถ้าโปรแกรมหยุดกลางคัน
+    tmp_filename = filename + ".tmp"
+    with open(tmp_filename, "w", encoding="utf-8") as f:
+        for group in groups:
+            json_line = json.dumps(as_dict(group), ensure_ascii=False)
+            f.write(json_line + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_filename, filename)
+
+# ---------------
+# บันทึกข้อมูลลง ไฟล์ .txt (เขียนทับทั้งไฟล์)
+# ---------------
+@span("storage.save_groups")
+def save_groups(groups, filename=None, date=None):
+    os.makedirs(DATA_DIR, exist_ok=True)
+    if filename is None:
+        filename = booking_filename(date)
+
+    _write_groups(groups, filename)
+    print(f"✅ บันทึกข้อมูล {len(groups)} กลุ่มเรียบร้อยแล้ว")
+    print("-----------------------------")
+
+# ---------------
+# โหลดข้อมูลจาก ไฟล์ .txt
+# ---------------
+@span("storage.load_groups")
+def load_groups(filename=None, date=None):
+    os.makedirs(DATA_DIR, exist_ok=True)
+    if filename is None:
+        filename = booking_filename(date)
+
+    try:
+        with open(filename, "r", encoding="utf-8") as file:
+            groups, _ = replay_journal(file)
+    except FileNotFoundError:
+        print(f"⚠️ ยังไม่มีไฟล์ข้อมูลการจองของวัน{date or 'นี้'} (ระบบจะสร้างใหม่เมื่อมีการจอง)")
+        groups = []
+    return groups
+
+# ---------------
+# วันที่ที่มีไฟล์การจอง (สำหรับโหลดหลายวัน)
+# ---------------
+def booking_file_dates(start, end):
+    """วันที่ ("YYYY-MM-DD") ที่มีไฟล์ Booking_<วันที่>.txt ในช่วง [start, end] เรียงตามวัน"""
+    prefix, suffix = "Booking_", ".txt"
+    try:
+        names = os.listdir(DATA_DIR)
+    except FileNotFoundError:
+        return []
+    dates = (name[len(prefix):-len(suffix)] for name in names
+             if name.startswith(prefix) and name.endswith(suffix))
+    return sorted(date for date in dates if start <= date <= end)
+
+# -----------------------------
+# Journal แบบ append-only
+# -----------------------------
+# แต่ละบรรทัดในไฟล์คือ record หนึ่งรายการ:
+#   {"order": 1, "id": "A", ...}                  -> เพิ่มการจอง (รูปแบบเดิมของไฟล์)
+#   {"_op": "update", "group": {...}}             -> แก้ไขการจองที่มี id เดียวกัน
+#   {"_op": "cancel", "id": "A"}                  -> ยกเลิกการจอง (tombstone)
+# ไฟล์ที่ไม่มี "_op" เลยจึงอ่านได้เหมือนไฟล์เดิมทุกประการ
+OP_KEY = "_op"
+
+def replay_journal(lines):
+    """อ่าน record ทั้งหมดตามลำดับ คืนค่า (groups ที่ยังใช้งานอยู่, จำนวน record ทั้งหมด)"""
+    groups = []
+    records = 0
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            print(f"❌ JSON ผิดรูปแบบในบรรทัด: {line}")
+            continue
+        records += 1
+
+        op = record.get(OP_KEY)
+        if op is None:
+            groups.append(Group.from_dict(record))
+        elif op == "update":
+            group = Group.from_dict(record["group"])
+            for i in range(len(groups) - 1, -1, -1):
+                if groups[i]["id"] == group["id"]:
+                    groups[i] = group
+                    break
+            else:
+                groups.append(group)
+        elif op == "cancel":
+            groups = [g for g in groups if g["id"] != record["id"]]
+        else:
+            print(f"❌ ไม่รู้จักคำสั่ง {op!r} ในบรรทัด: {line}")
+    return groups, records
+
+
+class BookingJournal:
+    """
+    เขียนการจองเพิ่มท้ายไฟล์ทีละบรรทัด (O(1) ต่อการจอง) แทนการเขียนทับทั้งไฟล์
+
+    - fsync เป็นชุด: ทุก ๆ fsync_every record หรือไม่เกิน fsync_interval วินาทีหลังจากเขียน
+      (ถ้าไม่มีการเขียนต่อ timer จะ fsync ให้เมื่อครบเวลา)
+    - compact(): เขียนไฟล์ใหม่ให้เหลือเฉพาะการจองที่ใช้งานอยู่ จะทำอัตโนมัติ
+      เมื่อจำนวน record ที่ไม่ใช้แล้วมากกว่า compact_ratio เท่าของการจองที่ใช้งาน
+    """
+
+    def __init__(self, filename=None, fsync_every=16, fsync_interval=1.0,
+                 compact_ratio=1.0, compact_min_records=64):
+        os.makedirs(DATA_DIR, exist_ok=True)
+        self.filename = filename or booking_filename()
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.compact_ratio = compact_ratio
+        self.compact_min_records = compact_min_records
+
+        try:
+            with open(self.filename, "r", encoding="utf-8") as file:
+                self.groups, self.records = replay_journal(file)
+        except FileNotFoundError:
+            print(f"⚠️ ยังไม่มีไฟล์ {os.path.basename(self.filename)} (ระบบจะสร้างใหม่เมื่อมีการจอง)")
+            self.groups, self.records = [], 0
+        self._file = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._lock = threading.Lock() # timer fsync จาก thread อื่น
+        self._timer = None
+
+    def _open(self):
+        if self._file is None:
+            self._file = open(self.filename, "a", encoding="utf-8")
+        return self._file
+
+    def _write(self, record):
+        with self._lock:
+            f = self._open()
+            f.write(json.dumps(as_dict(record), ensure_ascii=False) + "\n")
+            f.flush()
+            self.records += 1
+            self._unsynced += 1
+
+            now = time.monotonic()
+            if self._unsynced >= self.fsync_every or now - self._last_sync >= self.fsync_interval:
+                self._sync()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.fsync_interval, self._timer_sync)
+                self._timer.daemon = True
+                self._timer.start()
+
+        garbage = self.records - len(self.groups)
+        if self.records >= self.compact_min_records and garbage > self.compact_ratio * len(self.groups):
+            self.compact()
+
+    def sync(self):
+        with self._lock:
+            self._sync()
+
+    def _sync(self):
+        if self._file is not None and self._unsynced:
+            os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _timer_sync(self):
+        with self._lock:
+            if self._timer is threading.current_thread():
+                self._timer = None
+            self._sync()
+
+    def append(self, group):
+        """เพิ่มการจองใหม่ (หนึ่งบรรทัด)"""
+        self.groups.append(group)
+        self._write(group)
+
+    def extend(self, groups):
+        """เพิ่มการจองหลายรายการด้วยการเขียนและ fsync ครั้งเดียว (ใช้ตอนนำเข้าข้อมูลจำนวนมาก)"""
+        if not groups:
+            return
+        with self._lock:
+            f = self._open()
+            f.write("".join(json.dumps(as_dict(group), ensure_ascii=False) + "\n" for group in groups))
+            f.flush()
+            self.groups.extend(groups)
+            self.records += len(groups)
+            self._unsynced += len(groups)
+            self._sync()
+
+    def update(self, group):
+        """แก้ไขการจองที่มี id เดียวกัน"""
+        for i in range(len(self.groups) - 1, -1, -1):
+            if self.groups[i]["id"] == group["id"]:
+                self.groups[i] = group
+                break
+        else:
+            self.groups.append(group)
+        self._write({OP_KEY: "update", "group": as_dict(group)})
+
+    def cancel(self, group_id):
+        """ยกเลิกการจองด้วย tombstone record"""
+        self.groups[:] = [g for g in self.groups if g["id"] != group_id]
+        self._write({OP_KEY: "cancel", "id": group_id})
+
+    def compact(self):
+        """เขียนไฟล์ใหม่ให้เหลือเฉพาะการจองที่ใช้งานอยู่"""
+        self.close()
+        _write_groups(self.groups, self.filename)
+        self.records = len(self.groups)
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._sync()
+                self._file.close()
+                self._file = None
+
+
+# -----------------------------
+# Storage backends
+# -----------------------------
+# ทุก backend มีเมธอดชุดเดียวกัน:
+#   save_rooms(rooms), load_rooms(),
+#   load_groups(date=None), booking_dates(start, end),
+#   add_group(group, date=None), add_groups(groups, date=None),
+#   update_group(group, date=None),
+#   cancel_group(group_id, date=None), save_assignments(assignments, date=None),
+#   occupants(room_id, start, end, date=None), close()
+# add_group / update_group ที่ไม่ระบุ date ใช้ group["date"] ถ้ามี (จองล่วงหน้า) ไม่เช่นนั้นเป็นวันนี้
+# เวลาในไฟล์ / ตาราง assignments เป็นแบบ ชั่วโมง.นาที (9.30) ส่วน start / end ที่รับและส่งในโค้ดเป็นนาที
+def _today():
+    return datetime.now().strftime("%Y-%m-%d")
+
+
+class JsonlStorage:
+    """เก็บข้อมูลในไฟล์ Data/Booking_<วันที่>.txt (หนึ่ง BookingJournal ต่อวัน)"""
+
+    def __init__(self):
+        self.journals = {}
+        self.assignments = {}
+        self.rooms = []
+
+    def journal(self, date=None):
+        date = date or _today()
+        journal = self.journals.get(date)
+        if journal is None:
+            journal = self.journals[date] = BookingJournal(booking_filename(date))
+        return journal
+
+    def save_rooms(self, rooms):
+        # ข้อมูลห้องอยู่ในโค้ด ไม่ได้เขียนลงไฟล์
+        self.rooms = list(rooms)
+
+    def load_rooms(self):
+        return list(self.rooms)
+
+    @span("storage.load_groups")
+    def load_groups(self, date=None):
+        return list(self.journal(date).groups)
+
+    def booking_dates(self, start, end):
+        return booking_file_dates(start, end)
+
+    @span("storage.add_group")
+    def add_group(self, group, date=None):
+        self.journal(date or group.get("date")).append(group)
+
+    def add_groups(self, groups, date=None):
+        """เพิ่มหลายกลุ่มโดยเขียนต่อท้ายไฟล์ครั้งเดียว"""
+        self.journal(date).extend(groups)
+
+    def update_group(self, group, date=None):
+        self.journal(date or group.get("date")).update(group)
+
+    def cancel_group(self, group_id, date=None):
+        self.journal(date).cancel(group_id)
+
+    @span("storage.save_assignments")
+    def save_assignments(self, assignments, date=None):
+        # ไฟล์ .txt เก็บเฉพาะกลุ่ม ผลการจัดตารางเก็บไว้ในหน่วยความจำเท่านั้น
+        self.assignments[date or _today()] = list(assignments)
+
+    def occupants(self, room_id, start, end, date=None):
+        """กลุ่มที่ใช้ห้อง room_id ในช่วง [start, end) (สแกนผลการจัดตารางล่าสุด)"""
+        found = []
+        for a in self.assignments.get(date or _today(), []):
+            if a["room"]["id"] == room_id and end > a["start"] and start < a["end"]:
+                found.append(a["group"])
+        return sorted(found, key=lambda g: g["main_start"])
+
+    def close(self):
+        # compact เฉพาะไฟล์ที่มี record ที่ไม่ใช้แล้ว (วันที่แค่โหลดมาอ่านจะไม่ถูกเขียนใหม่)
+        for journal in self.journals.values():
+            if journal.records > len(journal.groups):
+                journal.compact()
+            journal.close()
+
+
+class SqliteStorage:
+    """
+    เก็บกลุ่ม ห้อง และผลการจัดตารางใน SQLite (WAL mode)
+    มี index (date, room_id, start, end) สำหรับค้นหาว่าใครใช้ห้องช่วงเวลาใด
+    โดยไม่ต้องโหลดข้อมูลทั้งวันขึ้นมา
+    แต่ละกลุ่มมี seq ของตัวเอง (ชื่อ / id ซ้ำกันได้เหมือนใน BookingJournal) และโหลดตามลำดับที่เพิ่ม
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS rooms (
+            id TEXT PRIMARY KEY,
+            capacity INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS groups (
+            seq INTEGER PRIMARY KEY,
+            date TEXT NOT NULL,
+            id TEXT NOT NULL,
+            ord INTEGER NOT NULL,
+            data TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_groups_date_id
+            ON groups (date, id);
+        CREATE TABLE IF NOT EXISTS assignments (
+            date TEXT NOT NULL,
+            group_id TEXT NOT NULL,
+            group_ord INTEGER NOT NULL,
+            room_id TEXT NOT NULL,
+            slot TEXT NOT NULL,
+            start REAL NOT NULL,
+            "end" REAL NOT NULL,
+            score REAL NOT NULL,
+            PRIMARY KEY (date, group_id)
+        );
+        CREATE INDEX IF NOT EXISTS idx_assignments_room_time
+            ON assignments (date, room_id, start, "end");
+        CREATE INDEX IF NOT EXISTS idx_assignments_room
+            ON assignments (room_id, start, "end");
+    """
+
+    def __init__(self, path=None):
+        import sqlite3
+
+        os.makedirs(DATA_DIR, exist_ok=True)
+        self.path = path or os.path.join(DATA_DIR, "bookings.db")
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._migrate()
+        self.conn.executescript(self.SCHEMA)
+
+    def _columns(self, table):
+        return [row[1] for row in self.conn.execute(f"PRAGMA table_info({table})")]
+
+    def _migrate(self):
+        # ฐานข้อมูลรุ่นก่อนใช้ (date, id) เป็น primary key: กลุ่มที่ชื่อซ้ำถูกเขียนทับ
+        # ย้ายข้อมูลไปตารางใหม่ที่มี seq ส่วน assignments สร้างใหม่ได้จากการจัดตารางครั้งถัดไป
+        groups = self._columns("groups")
+        if groups and "seq" not in groups:
+            with self.conn:
+                # index ย้ายตามตารางตอน RENAME (ชื่อเดิมจะทำให้ CREATE INDEX IF NOT EXISTS ข้ามไป) จึงลบก่อน
+                self.conn.execute("DROP INDEX IF EXISTS idx_groups_date_id")
+                self.conn.execute("ALTER TABLE groups RENAME TO groups_old")
+            self.conn.executescript(self.SCHEMA)
+            with self.conn:
+                self.conn.execute("INSERT INTO groups (date, id, ord, data) "
+                                  "SELECT date, id, ord, data FROM groups_old ORDER BY date, ord")
+                self.conn.execute("DROP TABLE groups_old")
+        assignments = self._columns("assignments")
+        if assignments and "group_ord" not in assignments:
+            with self.conn:
+                self.conn.execute("DROP TABLE assignments")
+
+    def save_rooms(self, rooms):
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO rooms (id, capacity) VALUES (?, ?)",
+                [(r["id"], r["capacity"]) for r in rooms])
+
+    def load_rooms(self):
+        rows = self.conn.execute("SELECT id, capacity FROM rooms ORDER BY id")
+        return [{"id": room_id, "capacity": capacity} for room_id, capacity in rows]
+
+    @span("storage.load_groups")
+    def load_groups(self, date=None):
+        rows = self.conn.execute(
+            "SELECT data FROM groups WHERE date = ? ORDER BY seq", (date or _today(),))
+        return [Group.from_dict(json.loads(data)) for (data,) in rows]
+
+    def booking_dates(self, start, end):
+        """วันที่ที่มีการจองในช่วง [start, end] (ใช้ index (date, id) ไม่ต้องอ่านข้อมูลกลุ่ม)"""
+        rows = self.conn.execute(
+            "SELECT DISTINCT date FROM groups WHERE date BETWEEN ? AND ? ORDER BY date", (start, end))
+        return [date for (date,) in rows]
+
+    @span("storage.add_group")
+    def add_group(self, group, date=None):
+        self.add_groups([group], date or group.get("date"))
+
+    def add_groups(self, groups, date=None):
+        """เพิ่มหลายกลุ่มใน transaction เดียว (ชื่อซ้ำกับกลุ่มเดิมได้ ไม่เขียนทับ)"""
+        with self.conn:
+            self._insert_groups(groups, date or _today())
+
+    def _insert_groups(self, groups, date):
+        self.conn.executemany(
+            "INSERT INTO groups (date, id, ord, data) VALUES (?, ?, ?, ?)",
+            [(date, g["id"], g["order"], json.dumps(as_dict(g), ensure_ascii=False)) for g in groups])
+
+    def update_group(self, group, date=None):
+        """แก้ไขกลุ่มล่าสุดที่มี id เดียวกัน (เหมือน BookingJournal.update) ถ้าไม่มีจะเพิ่มใหม่"""
+        date = date or group.get("date") or _today()
+        with self.conn:
+            updated = self.conn.execute(
+                "UPDATE groups SET ord = ?, data = ? "
+                "WHERE seq = (SELECT MAX(seq) FROM groups WHERE date = ? AND id = ?)",
+                (group["order"], json.dumps(as_dict(group), ensure_ascii=False), date, group["id"]))
+            if updated.rowcount == 0:
+                self._insert_groups([group], date)
+
+    def cancel_group(self, group_id, date=None):
+        date = date or _today()
+        with self.conn:
+            self.conn.execute("DELETE FROM groups WHERE date = ? AND id = ?", (date, group_id))
+            self.conn.execute("DELETE FROM assignments WHERE date = ? AND group_id = ?", (date, group_id))
+
+    @span("storage.save_assignments")
+    def save_assignments(self, assignments, date=None):
+        date = date or _today()
+        with self.conn:
+            self.conn.execute("DELETE FROM assignments WHERE date = ?", (date,))
+            self.conn.executemany(
+                'INSERT INTO assignments (date, group_id, group_ord, room_id, slot, start, "end", score) '
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(date, a["group"]["id"], a["group"]["order"], a["room"]["id"], a["slot"],
+                  to_hhmm(a["start"]), to_hhmm(a["end"]), a["score"])
+                 for a in assignments])
+
+    def occupants(self, room_id, start, end, date=None):
+        """กลุ่มที่ใช้ห้อง room_id ในช่วง [start, end) (ใช้ index ไม่ต้องโหลดทั้งวัน)"""
+        rows = self.conn.execute(
+            "SELECT g.data FROM assignments a "
+            "JOIN groups g ON g.date = a.date AND g.id = a.group_id AND g.ord = a.group_ord "
+            'WHERE a.date = ? AND a.room_id = ? AND a.start < ? AND a."end" > ? '
+            "ORDER BY a.start",
+            (date or _today(), room_id, to_hhmm(end), to_hhmm(start)))
+        return [Group.from_dict(json.loads(data)) for (data,) in rows]
+
+    def import_jsonl(self, filename, date):
+        """นำเข้าไฟล์ Booking_<วันที่>.txt"""
+        with open(filename, "r", encoding="utf-8") as file:
+            groups, _ = replay_journal(file)
+        with self.conn:
+            self.conn.execute("DELETE FROM groups WHERE date = ?", (date,))
+            self._insert_groups(groups, date)
+        return len(groups)
+
+    def export_jsonl(self, date, filename=None):
+        """ส่งออกเป็นไฟล์ Booking_<วันที่>.txt"""
+        groups = self.load_groups(date)
+        _write_groups(groups, filename or booking_filename(date))
+        return len(groups)
+
+    def close(self):
+        self.conn.close()
+
+
+STORAGE_BACKENDS = {
+    "jsonl": JsonlStorage,
+    "sqlite": SqliteStorage,
+}
+
+def open_storage(backend=None):
+    """เลือก backend จากพารามิเตอร์ หรือ environment variable BOOKING_STORAGE (ค่าเริ่มต้น jsonl)"""
+    backend = backend or os.environ.get("BOOKING_STORAGE", "jsonl")
+    try:
+        storage_class = STORAGE_BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"ไม่รู้จัก storage backend: {backend!r} (เลือกได้: {', '.join(STORAGE_BACKENDS)})")
+    return storage_class()
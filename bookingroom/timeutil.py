@@ -0,0 +1,36 @@
+# -----------------------------
+# เวลาแบบจำนวนเต็ม: นาทีนับจากเที่ยงคืน (9.30 น. = 570)
+# -----------------------------
+# ไฟล์การจองและ input ของผู้ใช้ยังเป็นทศนิยมแบบ ชั่วโมง.นาที (9.30 = 9 โมง 30 นาที)
+# แปลงเป็นนาทีทันทีที่อ่านเข้ามา และแปลงกลับเฉพาะตอนบันทึก / แสดงผล
+# ภายในระบบ (ช่วงเวลา การชนกัน ระยะเวลา) จึงคำนวณด้วยจำนวนเต็มทั้งหมด
+
+MINUTES_PER_HOUR = 60
+
+
+def to_minutes(hhmm):
+    """แปลงเวลาแบบ ชั่วโมง.นาที (เช่น 9.30) เป็นนาทีนับจากเที่ยงคืน (570)"""
+    hours = int(hhmm)
+    return hours * MINUTES_PER_HOUR + round((hhmm - hours) * 100)
+
+
+def to_hhmm(minutes):
+    """แปลงนาทีนับจากเที่ยงคืนกลับเป็นทศนิยมแบบ ชั่วโมง.นาที (รูปแบบที่บันทึกในไฟล์)"""
+    hours, rest = divmod(minutes, MINUTES_PER_HOUR)
+    return round(hours + rest / 100, 2)
+
+
+def to_hours(minutes):
+    """นาทีเป็นจำนวนชั่วโมง (ทศนิยมปกติ เช่น 90 -> 1.5) ใช้กับระยะเวลาและ feature ของโมเดล"""
+    return minutes / MINUTES_PER_HOUR
+
+
+def format_time(minutes):
+    """แสดงผลแบบเดิม เช่น 570 -> '09.30'"""
+    hours, rest = divmod(minutes, MINUTES_PER_HOUR)
+    return f"{hours:02d}.{rest:02d}"
+
+
+def slot_minutes(group, slot):
+    """คืนค่า (start, end) เป็นนาที ของช่วงเวลา main / alt ของกลุ่ม"""
+    return to_minutes(group[f"{slot}_start"]), to_minutes(group[f"{slot}_end"])
@@ -0,0 +1,106 @@
+from bookingroom.metrics import count
+from bookingroom.records import Assignment
+from bookingroom.room_calendar import RoomCalendar
+
+# NumPy ถูก import ภายในฟังก์ชัน (ใช้เฉพาะตอนจัดตารางข้อมูลจำนวนมาก)
+
+# -----------------------------
+# คำนวณคะแนนทุก (group, room, slot) ในครั้งเดียว
+# -----------------------------
+def score_tensor(groups, rooms, slots=("main",), profile=None):
+    """
+    คืนค่า (score, feasible) เป็น array ขนาด (กลุ่ม, ห้อง, slot)
+    score คำนวณลำดับเดียวกับ ScoringProfile.score จึงได้ค่า float ตรงกันทุกบิต
+    feasible = ห้องจุผู้เข้าร่วมได้
+    """
+    import numpy as np
+    from bookingroom.scoring import get_profile
+
+    profile = get_profile(profile)
+
+    size = np.array([g["size"] for g in groups], dtype=float)
+    priority = np.array([g["priority"] for g in groups], dtype=float)
+    order = np.array([g["order"] for g in groups], dtype=float)
+    capacity = np.array([r["capacity"] for r in rooms], dtype=float)
+    bonus_main = np.array([1 if slot == "main" else 0 for slot in slots], dtype=float)
+
+    wasted_space = np.maximum(0, capacity[None, :] - size[:, None])
+    score = (profile.priority * priority)[:, None, None] + \
+            (profile.main_slot * bonus_main)[None, None, :] - \
+            (profile.wasted_space * wasted_space)[:, :, None] + \
+            (profile.order * (1 / order))[:, None, None]
+
+    feasible = np.broadcast_to((size[:, None] <= capacity[None, :])[:, :, None], score.shape)
+    return score, feasible
+
+
+def slot_minutes_array(groups, slots=("main",)):
+    """คืนค่า (start, end) เป็น array นาที ขนาด (กลุ่ม, slot) (ผลเหมือน timeutil.slot_minutes)"""
+    import numpy as np
+
+    def minutes(field):
+        hhmm = np.array([[g[f"{slot}_{field}"] for slot in slots] for g in groups],
+                        dtype=float).reshape(len(groups), len(slots))
+        hours = np.trunc(hhmm)
+        return (hours * 60 + np.rint((hhmm - hours) * 100)).astype(np.int64)
+
+    return minutes("start"), minutes("end")
+
+
+def ranked_candidates(groups, rooms, slots=("main",), profile=None):
+    """
+    คืนค่า list ของ (ลำดับกลุ่ม, ลำดับห้อง, ลำดับ slot, score, start, end) ที่ห้องจุพอ
+    เรียงตามคะแนนจากมากไปน้อย (start / end เป็นนาที)
+    ใช้ argsort แบบ stable กับ -score: คะแนนเท่ากันคงลำดับ กลุ่ม -> ห้อง -> slot
+    เหมือน sorted(build_candidates(...), key=score, reverse=True)
+    """
+    import numpy as np
+
+    score, feasible = score_tensor(groups, rooms, slots, profile)
+    starts, ends = slot_minutes_array(groups, slots)
+    group_index, room_index, slot_index = np.nonzero(feasible)
+    order = np.argsort(-score[group_index, room_index, slot_index], kind="stable")
+    group_index, room_index, slot_index = group_index[order], room_index[order], slot_index[order]
+    return list(zip(group_index.tolist(), room_index.tolist(), slot_index.tolist(),
+                    score[group_index, room_index, slot_index].tolist(),
+                    starts[group_index, slot_index].tolist(), ends[group_index, slot_index].tolist()))
+
+# -----------------------------
+# Greedy selection จากลำดับที่เรียงแล้ว
+# -----------------------------
+def greedy_select_vectorized(groups, rooms, slots=("main",), profile=None):
+    """
+    ผลเหมือน greedy_select(build_candidates(groups, rooms, slots)) คืนค่า (assignments, calendars)
+    สร้าง Assignment เฉพาะตัวเลือกที่ถูกเลือก ไม่ต้องสร้างทุกคู่
+    """
+    ranked = ranked_candidates(groups, rooms, slots, profile)
+    group_ids = [g["id"] for g in groups]
+    room_ids = [r["id"] for r in rooms]
+
+    final_assignments = []
+    assigned_groups = set()
+    calendars = {}
+    checks = 0
+
+    for gi, ri, si, score, start_time, end_time in ranked:
+        group_id = group_ids[gi]
+        if group_id in assigned_groups:
+            continue
+
+        calendar = calendars.get(room_ids[ri])
+        if calendar is None:
+            calendar = calendars[room_ids[ri]] = RoomCalendar()
+
+        checks += 1
+        if not calendar.is_free(start_time, end_time):
+            continue
+
+        assignment = Assignment(groups[gi], rooms[ri], slots[si], score, start_time, end_time)
+        final_assignments.append(assignment)
+        assigned_groups.add(group_id)
+
+        calendar.insert(start_time, end_time, assignment)
+
+    count("candidates", len(ranked))
+    count("conflict_checks", checks)
+    return final_assignments, calendars
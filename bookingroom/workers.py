@@ -0,0 +1,100 @@
+"""
+Process pool สำหรับงานที่ใช้ CPU มาก (ตัดคำ, พยากรณ์ด้วย Random Forest, แก้ ILP) ใน booking service
+
+    pool = WorkerPool(workers=2, max_pending=8, timeout=30)
+    parsed = await pool.run(parse_task, "ประชุมทีม 9 โมงถึง 10 โมง 5 คน")
+
+- event loop ไม่ถูกบล็อก: คำขอที่ตอบจากหน่วยความจำได้ (ดูตาราง) ยังตอบได้ทันทีระหว่างที่งานหนักทำงาน
+- backpressure: ถ้ามีงานค้าง (รอคิว + กำลังทำ) ครบ max_pending จะปฏิเสธทันทีด้วย PoolBusy
+  แทนการรับงานไปกองไว้จนทุกคำขอช้าลง
+- timeout ต่องาน: เกินเวลาแล้วได้ TaskTimeout งานที่ยังรอคิวจะถูกยกเลิก ส่วนงานที่กำลังทำ
+  จะทำต่อจนจบใน process ลูก (ยังนับเป็นงานค้างจนเสร็จจริง)
+"""
+import os
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+
+class PoolBusy(Exception):
+    """มีงานค้างครบ max_pending แล้ว (ให้ client ลองใหม่ภายหลัง)"""
+
+
+class TaskTimeout(Exception):
+    """งานใช้เวลาเกิน timeout"""
+
+
+class WorkerPool:
+    def __init__(self, workers=None, max_pending=None, timeout=30.0):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or 4 * self.workers
+        self.timeout = timeout
+        self._pool = None # สร้าง process ตอนมีงานแรก
+        self._inflight = set()
+
+    @property
+    def pending(self):
+        """จำนวนงานที่ยังไม่เสร็จ (รอคิว + กำลังทำ)"""
+        self._inflight = {future for future in self._inflight if not future.done()}
+        return len(self._inflight)
+
+    def _submit(self, function, args):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        try:
+            return self._pool.submit(function, *args)
+        except BrokenProcessPool:
+            # process ลูกตายไปก่อนหน้า (เช่นหน่วยความจำไม่พอ) สร้าง pool ใหม่แล้วส่งอีกครั้ง
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            return self._pool.submit(function, *args)
+
+    async def run(self, function, *args, timeout=None):
+        """รัน function(*args) ใน process pool แล้วรอผล (function ต้องอยู่ระดับ module จึง pickle ได้)"""
+        if self.pending >= self.max_pending:
+            raise PoolBusy(f"ระบบกำลังประมวลผล {self.max_pending} งาน กรุณาลองใหม่อีกครั้ง")
+
+        future = self._submit(function, args)
+        self._inflight.add(future)
+        timeout = timeout or self.timeout
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            raise TaskTimeout(f"งานใช้เวลาเกิน {timeout:g} วินาที") from None
+        except BrokenProcessPool:
+            self._pool = None
+            raise RuntimeError("process ที่ประมวลผลหยุดทำงาน กรุณาลองใหม่อีกครั้ง") from None
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        self._inflight.clear()
+
+# -----------------------------
+# งานที่รันใน process ลูก
+# -----------------------------
+def parse_task(text):
+    """parse_booking_text (PyThaiNLP โหลดครั้งเดียวต่อ process ลูก)"""
+    from bookingroom.nlp import parse_booking_text
+
+    return parse_booking_text(text)
+
+
+_models = {} # โมเดลพยากรณ์ที่โหลดแล้วใน process ลูก (ไม่ต้องโหลดจากดิสก์ทุกงาน)
+
+def forecast_task(groups, rooms, priorities, n_estimators=100):
+    """forecast_hourly_demand ด้วยโมเดลที่ cache ไว้ใน process นี้"""
+    from bookingroom.forecast import LazyDemandModel, forecast_hourly_demand
+
+    key = (tuple(priorities), tuple((r["id"], r["capacity"]) for r in rooms), n_estimators)
+    model = _models.get(key)
+    if model is None:
+        model = _models[key] = LazyDemandModel(priorities, rooms, n_estimators=n_estimators)
+    return forecast_hourly_demand(groups, rooms, model)
+
+
+def optimize_task(groups, rooms, slots, time_limit, profile=None):
+    """schedule_optimal (PuLP) คืนค่า (assignments, result)"""
+    from bookingroom.ilp import schedule_optimal
+
+    return schedule_optimal(groups, rooms, slots, time_limit=time_limit, profile=profile)
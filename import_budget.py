@@ -0,0 +1,134 @@
+"""
+วัดเวลา import และเวลาเปิดโปรแกรมของแต่ละโมดูล (ใช้ python -X importtime)
+
+    python import_budget.py            แสดงผลการวัด
+    python import_budget.py --check    คืนค่า exit code 1 ถ้ามีรายการที่เกิน budget
+
+แต่ละรายการจะแสดงด้วยว่ามี library หนัก (HEAVY_MODULES) ถูกโหลดตอนเริ่มหรือไม่
+"""
+import os
+import sys
+import time
+import tempfile
+import subprocess
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# library ที่ไม่ควรถูกโหลดตอนเปิดโปรแกรม
+HEAVY_MODULES = ["numpy", "sklearn", "scipy", "joblib", "pulp", "pythainlp", "sqlite3"]
+
+# budget ของการ import โมดูล (มิลลิวินาที, cumulative)
+# โมดูลย่อยวัดเฉพาะเวลาของตัวเอง (ไม่รวม bookingroom/__init__.py ที่ถูกโหลดก่อน ดู own_import_ms)
+MODULE_BUDGET_MS = {
+    "bookingroom": 80,
+    "bookingroom.room_calendar": 30,
+    "bookingroom.availability": 30,
+    "bookingroom.scheduler": 30,
+    "bookingroom.storage": 50,    # json / datetime
+    "bookingroom.forecast": 50,
+    "bookingroom.nlp": 30,
+    "bookingroom.matcher": 30,
+    "bookingroom.cli": 50,
+    "bookingroom.ilp": 30,
+    "bookingroom.ingest": 50,     # csv / argparse
+    "bookingroom.timeutil": 30,
+    "bookingroom.records": 30,
+    "bookingroom.vectorized": 30,
+    "bookingroom.metrics": 30,
+    "bookingroom.schedule_cache": 30,
+    "bookingroom.scoring": 30,
+    "bookingroom.abtest": 50,     # argparse
+    "bookingroom.horizon": 50,    # argparse / datetime
+    "bookingroom.service": 160,   # server: โหลด asyncio ตอน import (~70 ms)
+    "bookingroom.workers": 160,   # เหมือน service
+}
+
+# budget ของการเปิดโปรแกรมจนถึงเมนู แล้วกด 4 เพื่อออก (มิลลิวินาที, wall time)
+SCRIPT_BUDGET_MS = {
+    "BookingMeetingRoom.py": 500,
+    "BMR-Update_Table.py": 500,
+    "HeuristicTest.py": 500,
+    "BookingMeetingRoomWithAI.py": 500,
+    "BookingWithAI_Full_Version.py": 500,
+}
+
+
+def parse_importtime(stderr):
+    """คืนค่า list ของ (ชื่อโมดูล, cumulative (us)) ตามลำดับใน output ของ -X importtime"""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        try:
+            entries.append((name.strip(), int(cumulative)))
+        except ValueError:
+            continue  # บรรทัดหัวตาราง
+    return entries
+
+
+def heavy_loaded(entries):
+    return sorted({name.split(".")[0] for name, _ in entries} & set(HEAVY_MODULES))
+
+
+def own_import_ms(entries, module, package="bookingroom"):
+    """
+    เวลา import ของโมดูลเอง (ไม่รวม bookingroom/__init__.py ที่ถูกโหลดก่อน)
+    โมดูลที่ __init__ import อยู่แล้ว: ใช้บรรทัดแรก (ที่ซ้อนอยู่ใน package)
+    โมดูลที่ไม่ได้อยู่ใน __init__: package โหลดเสร็จก่อนโมดูล จึงหัก cumulative ของ package ออก
+    """
+    names = [name for name, _ in entries]
+    if module not in names:
+        return 0.0
+    index = names.index(module)
+    cumulative = entries[index][1]
+    if module != package and package in names[:index]:
+        cumulative -= entries[names.index(package)][1]
+    return cumulative / 1000
+
+
+def measure_module(module):
+    env = dict(os.environ, PYTHONPATH=REPO_DIR)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True, env=env, cwd=REPO_DIR)
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} ไม่สำเร็จ:\n{result.stderr}")
+    entries = parse_importtime(result.stderr)
+    return own_import_ms(entries, module), heavy_loaded(entries)
+
+
+def measure_script(script):
+    # รันในโฟลเดอร์ชั่วคราว เพื่อไม่ให้ไปสร้าง/แก้ไฟล์ใน Data/ จริง
+    env = dict(os.environ, PYTHONPATH=REPO_DIR)
+    with tempfile.TemporaryDirectory() as workdir:
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, "-X", "importtime", os.path.join(REPO_DIR, script)],
+                                input="4\n", capture_output=True, text=True, env=env, cwd=workdir)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+    if result.returncode != 0:
+        raise RuntimeError(f"รัน {script} ไม่สำเร็จ:\n{result.stderr[-2000:]}")
+    return elapsed_ms, heavy_loaded(parse_importtime(result.stderr))
+
+
+def main(argv):
+    check = "--check" in argv
+    over_budget = []
+
+    print(f"{'รายการ':<40} {'เวลา (ms)':>10} {'budget':>8}  library หนักที่ถูกโหลด")
+    print("-" * 80)
+    for kind, budgets, measure in [("import", MODULE_BUDGET_MS, measure_module),
+                                   ("startup", SCRIPT_BUDGET_MS, measure_script)]:
+        for name, budget in budgets.items():
+            elapsed_ms, heavy = measure(name)
+            mark = "" if elapsed_ms <= budget else "  ❌"
+            if mark:
+                over_budget.append(name)
+            print(f"{kind + ' ' + name:<40} {elapsed_ms:>10.1f} {budget:>8}  {', '.join(heavy) or '-'}{mark}")
+
+    if over_budget:
+        print(f"\n❌ เกิน budget: {', '.join(over_budget)}")
+    return 1 if check and over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
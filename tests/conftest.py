@@ -0,0 +1,43 @@
+import random
+
+import pytest
+
+from bookingroom.records import make_group
+
+# -----------------------------
+# ข้อมูลการจองแบบสุ่ม (seed คงที่ต่อ test)
+# -----------------------------
+ROOMS = [
+    {"id": "R1", "capacity": 6},
+    {"id": "R2", "capacity": 10},
+    {"id": "R3", "capacity": 20},
+]
+
+
+def random_time(rng, start=8, end=18):
+    """(เริ่ม, สิ้นสุด) แบบ HH.MM ทุก 30 นาที ยาว 0.5 - 3 ชั่วโมง"""
+    begin = rng.randrange(start * 2, end * 2 - 1)
+    finish = min(end * 2, begin + rng.randint(1, 6))
+    as_hhmm = lambda half: half // 2 + (0.3 if half % 2 else 0.0)
+    return as_hhmm(begin), as_hhmm(finish)
+
+
+def random_groups(rng, n, first_order=1, id_pool=None):
+    groups = []
+    for order in range(first_order, first_order + n):
+        main_start, main_end = random_time(rng)
+        alt_start, alt_end = random_time(rng)
+        group_id = rng.choice(id_pool) if id_pool else f"G{order}"
+        groups.append(make_group(order, group_id, "ประชุม", rng.randint(1, 5), main_start, main_end,
+                                 rng.randint(1, 22), alt_start, alt_end))
+    return groups
+
+
+@pytest.fixture
+def rooms():
+    return [dict(room) for room in ROOMS]
+
+
+@pytest.fixture(params=range(5))
+def rng(request):
+    return random.Random(request.param)
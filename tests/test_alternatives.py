@@ -0,0 +1,80 @@
+import pytest
+
+from bookingroom.config import DAY_START, DAY_END
+from bookingroom.records import make_group
+from bookingroom.room_calendar import RoomCalendar
+from bookingroom.scheduler import calculate_heuristic_score, score_alternative, suggest_alternative_times
+
+
+def random_bookings(rng, rooms, n, aligned):
+    """การจองแบบ dict (เวลาเป็นนาที) ไม่ทับกันในห้องเดียวกัน aligned=False ให้ขอบไม่ลงเส้น 5 นาทีและมีช่วงยาวศูนย์"""
+    bookings = []
+    for room in rooms:
+        calendar = RoomCalendar()
+        for _ in range(n):
+            step = 5 if aligned else 1
+            start = rng.randrange(DAY_START * 60 - 60, DAY_END * 60 + 30, step)
+            end = start + rng.randrange(0 if not aligned else step, 180, step)
+            if calendar.is_free(start, end):
+                booking = {"room": room, "start": start, "end": end}
+                calendar.insert(start, end, booking)
+                bookings.append(booking)
+    return bookings
+
+
+def brute_force_starts(bookings, room_id, duration, granularity):
+    starts = []
+    for start in range(DAY_START * 60, DAY_END * 60 - duration + 1, granularity):
+        end = start + duration
+        if all(not (end > b["start"] and start < b["end"])
+               for b in bookings if b["room"]["id"] == room_id):
+            starts.append(start)
+    return starts
+
+
+@pytest.mark.parametrize("aligned", [True, False])
+@pytest.mark.parametrize("granularity", [5, 15, 30, 7])
+def test_free_starts_match_brute_force(rooms, rng, aligned, granularity):
+    bookings = random_bookings(rng, rooms, 8, aligned)
+    for room in rooms:
+        calendar = RoomCalendar()
+        for b in bookings:
+            if b["room"] is room:
+                calendar.insert(b["start"], b["end"], b)
+        for duration in (5, 30, 45, 62, 120):
+            assert calendar.free_starts(duration, granularity) == \
+                brute_force_starts(bookings, room["id"], duration, granularity)
+
+
+def test_free_starts_after_remove(rooms):
+    calendar = RoomCalendar()
+    odd = {"start": 9 * 60 + 7, "end": 9 * 60 + 13}
+    calendar.insert(odd["start"], odd["end"], odd)
+    assert 9 * 60 + 15 in calendar.free_starts(30, 5)
+    calendar.remove(odd["start"], odd["end"], odd)
+    assert calendar.off_grid == 0
+    assert calendar.free_starts(30, 30) == list(range(DAY_START * 60, DAY_END * 60 - 29, 30))
+
+
+@pytest.mark.parametrize("aligned", [True, False])
+def test_suggest_alternative_times_matches_brute_force(rooms, rng, aligned):
+    bookings = random_bookings(rng, rooms, 6, aligned)
+    group = make_group(1, "G1", "ประชุม", 3, 10.0, 11.3, rng.randint(1, 12))
+    suggestions = suggest_alternative_times(group, bookings, rooms, k=1000)
+
+    expected = {(room["id"], start) for room in rooms if group["size"] <= room["capacity"]
+                for start in brute_force_starts(bookings, room["id"], 90, 30)}
+    assert {(s["room"], s["start"]) for s in suggestions} == expected
+    assert [s["score"] for s in suggestions] == sorted((s["score"] for s in suggestions), reverse=True)
+
+
+@pytest.mark.parametrize("profile", ["default", "fit_rooms", "first_come"])
+def test_alternatives_use_scoring_profile(rooms, profile):
+    group = make_group(7, "G7", "ประชุม", 2, 10.0, 11.0, 5)
+    suggestions = suggest_alternative_times(group, [], rooms, k=1000, profile=profile)
+    by_room = {room["id"]: room for room in rooms}
+    for s in suggestions:
+        room = by_room[s["room"]]
+        distance = abs(s["start"] - 600) / 60
+        assert s["score"] == calculate_heuristic_score(group, room, "main", profile) - 2 * distance
+        assert s["score"] == score_alternative(group, room, s["start"], s["end"], profile=profile)
@@ -0,0 +1,52 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+import suite
+
+
+def run(p50, p99, peak):
+    return {"rounds": 10, "throughput": 1000 / p50, "p50_ms": p50, "p99_ms": p99, "peak_mb": peak}
+
+
+def recorded(*runs):
+    result = suite.best_of(list(runs))
+    return {**result, **suite.entry_limits(result)}
+
+
+def test_best_of_keeps_best_and_worst():
+    result = suite.best_of([run(10, 12, 1.0), run(14, 30, 1.1), run(11, 13, 1.0)])
+    assert (result["p50_ms"], result["p50_worst_ms"], result["p99_ms"]) == (10, 14, 30)
+    assert (result["peak_mb"], result["peak_worst_mb"], result["runs"]) == (1.0, 1.1, 3)
+
+
+def test_limits_follow_recorded_noise():
+    quiet = recorded(run(10, 10.5, 1.0), run(10.2, 10.6, 1.0))
+    noisy = recorded(run(10, 40, 1.0), run(18, 45, 1.0))
+    assert quiet["limit_ms"] == pytest.approx(10.6)
+    assert noisy["limit_ms"] == 45
+    assert suite.regressions(suite.best_of([run(11, 12, 1.0)]), quiet)
+    assert not suite.regressions(suite.best_of([run(30, 35, 1.0)]), noisy)
+    # หน่วยความจำ: ต่างกันไม่กี่ KB ไม่นับ แต่โตขึ้นชัดเจนนับ
+    assert not suite.regressions(suite.best_of([run(10, 10, 1.003)]), quiet)
+    assert suite.regressions(suite.best_of([run(10, 10, 1.2)]), quiet)
+
+
+def test_old_baseline_entries_without_limits_are_skipped():
+    assert suite.regressions(suite.best_of([run(100, 100, 9)]), {"p50_ms": 1, "peak_mb": 1}) == []
+
+
+@pytest.mark.parametrize("informational, code", [(False, 1), (True, 0)])
+def test_check_fails_only_for_gating_baseline(tmp_path, capsys, informational, code):
+    path = str(tmp_path / "baseline.json")
+    entry = {**recorded(run(1e-6, 1e-6, 0.0)), "limit_ms": 1e-6}
+    suite.save_baseline(path, {"parse_time/10": entry}, informational=informational)
+    assert json.load(open(path, encoding="utf-8"))["informational"] is informational
+
+    argv = ["--only", "parse_time", "--scales", "10", "--budget", "0.01", "--runs", "1",
+            "--baseline", path, "--check"]
+    assert suite.main(argv) == code
+    assert "parse_time/10" in capsys.readouterr().out
@@ -0,0 +1,47 @@
+import time
+
+import pytest
+
+pytest.importorskip("pulp")
+
+from bookingroom.ilp import schedule_optimal
+from bookingroom.scheduler import schedule_with_heuristic
+from conftest import random_groups
+
+
+def test_optimal_is_at_least_greedy(rng, rooms):
+    groups = random_groups(rng, 25)
+    assignments, result = schedule_optimal(groups, rooms, ("main", "alt"), time_limit=30)
+
+    assert result["status"] == "optimal"
+    assert result["gap"] == 0.0
+    assert result["objective"] >= result["greedy_objective"] - 1e-9
+    assert sum(a.score for a in assignments) == pytest.approx(result["objective"])
+    assert len({a.group["id"] for a in assignments}) == len(assignments)
+
+
+def test_expired_deadline_returns_greedy_without_solving(rng, rooms):
+    groups = random_groups(rng, 25)
+    start = time.monotonic()
+    assignments, result = schedule_optimal(groups, rooms, time_limit=1e-9)
+
+    assert time.monotonic() - start < 1
+    assert result["status"] == "time_limit"
+    assert result["bound"] is None and result["gap"] is None
+    greedy = schedule_with_heuristic(groups, rooms)
+    assert [(a.group["order"], a.room["id"]) for a in assignments] == \
+        [(a.group["order"], a.room["id"]) for a in greedy]
+
+
+def test_greedy_fallback_does_not_reorder_callers_list(rng, rooms, monkeypatch):
+    from bookingroom import ilp, scheduler
+
+    groups = random_groups(rng, 10)
+    held = list(reversed(schedule_with_heuristic(groups, rooms))) # list ที่ผู้เรียก / cache ถืออยู่
+    snapshot = list(held)
+    monkeypatch.setattr(scheduler, "schedule_with_heuristic", lambda *args: held)
+    monkeypatch.setattr(ilp, "selected_assignments", lambda *args: []) # solver ได้คำตอบแย่กว่า greedy
+
+    assignments, _ = schedule_optimal(groups, rooms, time_limit=30)
+    assert held == snapshot
+    assert assignments == sorted(held, key=lambda a: a.score, reverse=True)
@@ -0,0 +1,59 @@
+import pytest
+
+from bookingroom.scheduler import IncrementalScheduler, schedule_greedy
+from conftest import random_groups
+
+
+def result(assignments):
+    # IncrementalScheduler ต่อท้ายกลุ่มใหม่ ลำดับใน list จึงต่างได้ เทียบเป็นชุดของการจัด
+    return sorted((a.group["order"], a.room["id"], a.slot, a.score, a.start, a.end) for a in assignments)
+
+
+@pytest.mark.parametrize("slots", [("main",), ("main", "alt")])
+def test_add_group_matches_full_reschedule(rng, rooms, slots):
+    groups = random_groups(rng, 40)
+    scheduler = IncrementalScheduler(rooms, groups[:5], slots)
+
+    for group in groups[5:]:
+        planned = scheduler.plan(group)
+        added = scheduler.add_group(group)
+        full, _ = schedule_greedy(scheduler.groups, rooms, slots)
+
+        assert result(scheduler.assignments) == result(full)
+        assert (planned is None) == (added is None)
+        if added is not None:
+            assert (added.room["id"], added.slot) == (planned.room["id"], planned.slot)
+
+
+def test_plan_does_not_change_schedule(rng, rooms):
+    groups = random_groups(rng, 30)
+    scheduler = IncrementalScheduler(rooms, groups[:-1])
+    before = result(scheduler.assignments)
+
+    scheduler.plan(groups[-1])
+
+    assert result(scheduler.assignments) == before
+    assert len(scheduler.groups) == len(groups) - 1
+
+
+def test_calendars_follow_assignments(rng, rooms):
+    groups = random_groups(rng, 40)
+    scheduler = IncrementalScheduler(rooms, groups[:10])
+    for group in groups[10:]:
+        scheduler.add_group(group)
+
+    for room in rooms:
+        booked = sorted((a.start, a.end) for a in scheduler.assignments if a.room["id"] == room["id"])
+        calendar = scheduler.calendars.get(room["id"])
+        assert (calendar.intervals() if calendar else []) == booked
+
+
+def test_duplicate_ids_match_full_reschedule(rng, rooms):
+    # ชื่อซ้ำ (เมนูเวอร์ชัน Full อนุญาต) ต้องจัดใหม่ทั้งหมด ผลยังต้องตรงกัน
+    groups = random_groups(rng, 30, id_pool=["Somchai", "Malee", "Team A", "Team B"])
+    scheduler = IncrementalScheduler(rooms, groups[:3], ("main", "alt"))
+
+    for group in groups[3:]:
+        scheduler.add_group(group)
+        full, _ = schedule_greedy(scheduler.groups, rooms, ("main", "alt"))
+        assert result(scheduler.assignments) == result(full)
@@ -0,0 +1,65 @@
+import difflib
+import random
+
+import pytest
+
+from bookingroom.config import ACTIVITY_CONFIG
+from bookingroom.matcher import ActivityMatcher, AhoCorasick
+from bookingroom.nlp import get_activity, get_activity_reference
+
+KEYWORDS = [keyword for group in ACTIVITY_CONFIG for keyword in group["keywords"]]
+ALPHABET = sorted(set("".join(KEYWORDS))) + list("xyzกขคะาี ")
+
+
+def mutate(rng, word):
+    """แก้คำ 0 - 3 ตำแหน่ง (แทน / เพิ่ม / ลบ) และต่อหน้า / หลังบางครั้ง"""
+    chars = list(word)
+    for _ in range(rng.randint(0, 3)):
+        action = rng.choice(("replace", "insert", "delete"))
+        position = rng.randrange(len(chars) + 1)
+        if action == "insert" or not chars:
+            chars.insert(position, rng.choice(ALPHABET))
+        elif action == "replace":
+            chars[min(position, len(chars) - 1)] = rng.choice(ALPHABET)
+        else:
+            del chars[min(position, len(chars) - 1)]
+    if rng.random() < 0.3:
+        chars = list(rng.choice(KEYWORDS)[:2]) + chars
+    if rng.random() < 0.3:
+        chars += list(rng.choice(KEYWORDS)[-2:])
+    return "".join(chars)
+
+
+def reference_match(token, activity_config=ACTIVITY_CONFIG):
+    # เงื่อนไขเดิมของ get_activity ต่อหนึ่งคำ
+    return tuple(index for index, group in enumerate(activity_config)
+                 if any(k in token for k in group["keywords"])
+                 or difflib.get_close_matches(token, group["keywords"], n=1, cutoff=0.75))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matcher_matches_difflib_per_token(seed):
+    rng = random.Random(seed)
+    matcher = ActivityMatcher(ACTIVITY_CONFIG)
+    for _ in range(2000):
+        token = mutate(rng, rng.choice(KEYWORDS)) if rng.random() < 0.9 else \
+            "".join(rng.choice(ALPHABET) for _ in range(rng.randint(2, 10)))
+        assert matcher.match(token) == reference_match(token), token
+
+
+def test_aho_corasick_finds_every_substring():
+    rng = random.Random(0)
+    automaton = AhoCorasick((keyword, keyword) for keyword in KEYWORDS)
+    for _ in range(2000):
+        text = "".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 6))) + \
+            mutate(rng, rng.choice(KEYWORDS))
+        assert automaton.labels_in(text) == {k for k in KEYWORDS if k in text}, text
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_get_activity_matches_reference(seed):
+    rng = random.Random(seed)
+    for _ in range(200):
+        words = [mutate(rng, rng.choice(KEYWORDS)) for _ in range(rng.randint(1, 3))]
+        text = " ".join(words + [f"{rng.randint(8, 16)} โมง", f"{rng.randint(1, 20)} คน"])
+        assert get_activity(text) == get_activity_reference(text), text
@@ -0,0 +1,21 @@
+import pytest
+
+from bookingroom.nlp import extract_time_and_size, get_size
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("ประชุม 9.00-10.00 5 คน", ((540, 600), 5)),
+    ("20 คน 9 โมงถึง 10 โมง", ((540, 600), 20)),
+    ("ติว บ่าย 2 ถึง 4 โมงเย็น 12 ท่าน", ((840, 960), 12)),
+    ("10.00 ที่ห้อง", (None, None)),
+    ("10:30 ที่ห้อง 3 คน", (None, 3)),
+    ("ห้อง 3 ที่ 10:30 ที่ห้อง", (None, 3)),
+    ("เที่ยงครึ่ง - บ่ายโมง", ((750, 780), None)),
+])
+def test_extract_time_and_size(text, expected):
+    assert extract_time_and_size(text) == expected
+
+
+def test_get_size_skips_minutes_of_times():
+    assert get_size("10.00 ที่ห้อง 4 คน") == [4]
+    assert get_size("10:30 ที่ห้อง") == []
@@ -0,0 +1,106 @@
+import pytest
+
+from conftest import ROOMS, random_groups, random_time
+from bookingroom.records import make_group
+from bookingroom.schedule_cache import ScheduleCache, split_components
+from bookingroom.scheduler import _solve_greedy
+from bookingroom.scoring import ScoringProfile
+from bookingroom.timeutil import slot_minutes
+
+
+def as_rows(result):
+    assignments, calendars = result
+    return ([(id(a.group), a.room["id"], a.slot, a.score, a.start, a.end) for a in assignments],
+            {room: calendar.intervals() for room, calendar in calendars.items()})
+
+
+def mutate(rng, groups):
+    """แก้รายการกลุ่มแบบสุ่มหนึ่งอย่าง: เพิ่ม ลบ สลับลำดับ แก้เวลา / จำนวนคน หรือใช้ชื่อซ้ำ"""
+    groups = list(groups)
+    action = rng.choice(["add", "remove", "swap", "retime", "resize", "duplicate"])
+    if action == "add" or not groups:
+        groups += random_groups(rng, rng.randint(1, 3), first_order=len(groups) + 1)
+    elif action == "remove":
+        del groups[rng.randrange(len(groups))]
+    elif action == "swap":
+        i, j = rng.randrange(len(groups)), rng.randrange(len(groups))
+        groups[i], groups[j] = groups[j], groups[i]
+    else:
+        i = rng.randrange(len(groups))
+        g = groups[i]
+        main_start, main_end = random_time(rng) if action == "retime" else (g["main_start"], g["main_end"])
+        size = rng.randint(1, 22) if action == "resize" else g["size"]
+        group_id = rng.choice(groups)["id"] if action == "duplicate" else g["id"]
+        groups[i] = make_group(g["order"], group_id, g["activity"], g["priority"], main_start, main_end,
+                               size, g["alt_start"], g["alt_end"])
+    return groups
+
+
+@pytest.mark.parametrize("slots", [("main",), ("main", "alt")])
+def test_cached_schedule_matches_full_solve(rng, rooms, slots):
+    cache = ScheduleCache(max_groups=2000)
+    profiles = [None, "fit_rooms", ScoringProfile("random", order=30, priority=3, wasted_space=1.5)]
+    groups = random_groups(rng, 30)
+    for _ in range(40):
+        groups = mutate(rng, groups)
+        profile = rng.choice(profiles)
+        # ขนาดห้องเปลี่ยนเป็นบางครั้ง (ส่วนหนึ่งของ fingerprint)
+        room_set = rooms if rng.random() < 0.8 else [dict(r, capacity=r["capacity"] + 4) for r in rooms]
+        expected = as_rows(_solve_greedy(groups, room_set, slots, profile))
+        assert as_rows(cache.schedule(groups, room_set, slots, profile, _solve_greedy)) == expected
+        # ครั้งที่สองมาจาก cache ทั้งชุด
+        assert as_rows(cache.schedule(groups, room_set, slots, profile, _solve_greedy)) == expected
+
+
+def test_unchanged_components_are_not_solved_again(rooms):
+    solved = []
+
+    def solve(groups, rooms, slots, profile):
+        solved.append(len(groups))
+        return _solve_greedy(groups, rooms, slots, profile)
+
+    cache = ScheduleCache()
+    morning = [make_group(i, f"M{i}", "ประชุม", 3, 8.0 + i, 9.0 + i, 5) for i in range(1, 4)]
+    evening = [make_group(i, f"E{i}", "ประชุม", 3, 15.0, 16.0, 5) for i in range(4, 7)]
+    cache.schedule(morning + evening, rooms, ("main",), None, solve)
+
+    late = make_group(6, "E3", "ประชุม", 3, 16.0, 17.0, 5)
+    result = cache.schedule(morning + evening[:2] + [late], rooms, ("main",), None, solve)
+    assert result[0] and solved == [6, 3]
+    assert as_rows(result) == as_rows(_solve_greedy(morning + evening[:2] + [late], rooms, ("main",)))
+
+
+@pytest.mark.parametrize("slots", [("main",), ("main", "alt")])
+def test_split_components_separates_only_independent_groups(rng, slots):
+    groups = random_groups(rng, 60, id_pool=[f"G{i}" for i in range(50)])
+    times = [tuple(slot_minutes(g, slot) for slot in slots) for g in groups]
+    components = split_components(groups, ROOMS, times)
+
+    assert sorted(i for c in components for i in c) == list(range(len(groups)))
+    owner = {i: n for n, c in enumerate(components) for i in c}
+    for i, a in enumerate(groups):
+        for j, b in enumerate(groups):
+            if owner[i] == owner[j]:
+                continue
+            assert a["id"] != b["id"]
+            for room in ROOMS:
+                if a["size"] > room["capacity"] or b["size"] > room["capacity"]:
+                    continue
+                for s1, e1 in times[i]:
+                    for s2, e2 in times[j]:
+                        assert not (s1 < e2 and s2 < e1)
+
+
+def test_lru_eviction_by_group_count():
+    cache = ScheduleCache(max_groups=10)
+    cache.put("a", ("rows a",), 4)
+    cache.put("b", ("rows b",), 4)
+    assert cache.get("a") == ("rows a",) # a ถูกใช้ล่าสุด
+    cache.put("c", ("rows c",), 4)
+    assert cache.get("b") is None and cache.get("a") and cache.get("c")
+    assert cache.size == 8 and len(cache) == 2
+
+    cache.put("a", ("new a",), 2)
+    assert cache.size == 6 and cache.get("a") == ("new a",)
+    cache.put("huge", ("rows",), 11) # ใหญ่กว่าทั้ง cache ไม่เก็บ
+    assert cache.get("huge") is None and cache.size == 6
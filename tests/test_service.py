@@ -0,0 +1,113 @@
+import asyncio
+
+import pytest
+
+from bookingroom.service import BookingService
+from bookingroom.storage import open_storage
+
+DATE = "2025-12-09"
+ROOM = [{"id": "R1", "capacity": 6}]
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def group(group_id, start, end, size=4):
+    return {"id": group_id, "activity": "ประชุม", "priority": 3,
+            "main_start": start, "main_end": end, "size": size}
+
+
+def run(requests):
+    """ส่งคำขอตามลำดับให้ service ใหม่หนึ่งตัว คืนค่า list ของคำตอบ"""
+    async def main():
+        service = BookingService(open_storage("jsonl"), rooms=ROOM)
+        await service.start()
+        try:
+            return [await service.handle(dict(request, date=DATE)) for request in requests]
+        finally:
+            await service.stop()
+    return asyncio.run(main())
+
+
+def test_update_and_cancel_require_version(data_dir):
+    responses = run([
+        {"op": "add", "group": group("A", 9.00, 10.00)},
+        {"op": "update", "group": group("A", 10.00, 11.00)},
+        {"op": "cancel", "id": "A"},
+        {"op": "cancel", "id": "A", "version": "1"},
+        {"op": "groups"},
+    ])
+    assert responses[0]["ok"]
+    for response in responses[1:4]:
+        assert not response["ok"] and "conflict" not in response
+    assert responses[4]["groups"][0]["main_start"] == 9.00
+
+
+def test_stale_version_conflicts(data_dir):
+    responses = run([
+        {"op": "add", "group": group("A", 9.00, 10.00)},
+        {"op": "update", "group": group("A", 10.00, 11.00), "version": 1},
+        {"op": "cancel", "id": "A", "version": 1},
+        {"op": "cancel", "id": "A", "version": 2},
+    ])
+    assert responses[1]["ok"] and responses[1]["group_version"] == 2
+    assert responses[2] == dict(responses[2], ok=False, conflict=True, version=2)
+    assert responses[3]["ok"]
+
+
+def test_update_that_cannot_be_placed_is_rejected(data_dir):
+    responses = run([
+        {"op": "add", "group": group("A", 9.00, 10.00)},
+        {"op": "add", "group": group("B", 10.00, 11.00)},
+        {"op": "update", "group": group("B", 9.30, 10.30), "version": 1},
+        {"op": "schedule"},
+        {"op": "groups"},
+    ])
+    rejected, schedule, groups = responses[2:]
+    assert not rejected["ok"] and rejected["alternatives"]
+    assert all(a["start"] >= 10.00 or a["end"] <= 9.00 for a in rejected["alternatives"])
+    # ตารางและ version ไม่เปลี่ยน
+    assert schedule["version"] == 2
+    assert [(a["group"], a["start"]) for a in schedule["assignments"]] == [("A", 9.00), ("B", 10.00)]
+    assert [(g["id"], g["main_start"], g["version"]) for g in groups["groups"]] == \
+        [("A", 9.00, 1), ("B", 10.00, 1)]
+
+    # ข้อมูลใน storage ก็ไม่เปลี่ยน
+    reloaded = run([{"op": "groups"}])[0]
+    assert [(g["id"], g["main_start"]) for g in reloaded["groups"]] == [("A", 9.00), ("B", 10.00)]
+
+
+@pytest.mark.parametrize("backend", ["jsonl", "sqlite"])
+def test_update_on_duplicate_id_day_matches_storage(data_dir, backend):
+    from bookingroom.records import make_group
+
+    # ไฟล์จาก Full CLI ใส่ชื่อซ้ำได้
+    store = open_storage(backend)
+    # ไฟล์จาก Full CLI ใส่ชื่อซ้ำได้ (รายการหลังคะแนนสูงกว่าจึงเป็นรายการที่ได้ห้อง)
+    store.add_groups([make_group(1, "A", "ประชุม", 1, 9.00, 10.00, 4),
+                      make_group(2, "A", "ประชุม", 5, 13.00, 14.00, 4)], DATE)
+    store.close()
+
+    async def main():
+        service = BookingService(open_storage(backend), rooms=ROOM)
+        await service.start()
+        try:
+            updated = await service.handle({"op": "update", "date": DATE, "version": 1,
+                                            "group": dict(group("A", 15.00, 16.00), priority=5)})
+            in_memory = await service.handle({"op": "groups", "date": DATE})
+        finally:
+            await service.stop()
+        return updated, in_memory
+
+    updated, in_memory = asyncio.run(main())
+    assert updated["ok"], updated
+    reloaded = open_storage(backend)
+    stored = reloaded.load_groups(DATE)
+    reloaded.close()
+
+    expected = [("A", 9.00), ("A", 15.00)]
+    assert [(g["id"], g["main_start"]) for g in in_memory["groups"]] == expected
+    assert [(g["id"], g["main_start"]) for g in stored] == expected
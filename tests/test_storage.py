@@ -0,0 +1,155 @@
+import os
+import time
+
+import pytest
+
+from bookingroom import storage
+from bookingroom.storage import BookingJournal
+from conftest import random_groups
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    # ไฟล์การจองอยู่ใน Data/ ของโฟลเดอร์ที่รัน
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def fsyncs(monkeypatch):
+    calls = []
+    real_fsync = os.fsync
+    monkeypatch.setattr(storage.os, "fsync", lambda fd: (calls.append(fd), real_fsync(fd)))
+    return calls
+
+
+def test_journal_fsyncs_idle_record_after_interval(data_dir, fsyncs, rng):
+    journal = BookingJournal(str(data_dir / "journal.txt"), fsync_every=16, fsync_interval=0.05)
+    journal.append(random_groups(rng, 1)[0])
+    assert fsyncs == []
+
+    deadline = time.monotonic() + 2
+    while not fsyncs and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(fsyncs) == 1
+    journal.close()
+
+
+def test_journal_fsyncs_every_n_records(data_dir, fsyncs, rng):
+    journal = BookingJournal(str(data_dir / "journal.txt"), fsync_every=4, fsync_interval=60)
+    for group in random_groups(rng, 8):
+        journal.append(group)
+    assert len(fsyncs) == 2
+    journal.close()
+    assert journal._timer is None
+
+
+@pytest.fixture(params=["jsonl", "sqlite"])
+def backend(request, data_dir):
+    store = storage.open_storage(request.param)
+    yield store
+    store.close()
+
+
+def summary(groups):
+    return [(g["id"], g["order"], g["main_start"], g["main_end"]) for g in groups]
+
+
+def test_duplicate_ids_are_kept(backend):
+    from bookingroom.records import make_group
+
+    first = make_group(1, "Somchai", "ประชุม", 2, 9.0, 10.0, 4)
+    second = make_group(2, "Somchai", "ประชุม", 2, 13.0, 14.0, 4)
+    backend.add_group(first, "2025-12-01")
+    backend.add_group(second, "2025-12-01")
+
+    assert summary(backend.load_groups("2025-12-01")) == summary([first, second])
+
+
+def test_update_replaces_latest_duplicate_only(backend):
+    from bookingroom.records import make_group, set_main_time
+
+    groups = [make_group(1, "Somchai", "ประชุม", 2, 9.0, 10.0, 4),
+              make_group(2, "Malee", "ประชุม", 2, 11.0, 12.0, 4),
+              make_group(3, "Somchai", "ประชุม", 2, 13.0, 14.0, 4)]
+    backend.add_groups(groups, "2025-12-01")
+    set_main_time(groups[2], 15.0, 16.0)
+    backend.update_group(groups[2], "2025-12-01")
+
+    assert summary(backend.load_groups("2025-12-01")) == summary(groups)
+
+    backend.cancel_group("Somchai", "2025-12-01")
+    assert summary(backend.load_groups("2025-12-01")) == summary(groups[1:2])
+
+
+def test_backends_agree_on_random_bookings(data_dir, rng):
+    groups = random_groups(rng, 30, id_pool=["A", "B", "C", "D"])
+    loaded = []
+    for name in ("jsonl", "sqlite"):
+        store = storage.open_storage(name)
+        for group in groups:
+            store.add_group(group, "2025-12-02")
+        loaded.append(summary(store.load_groups("2025-12-02")))
+        store.close()
+    assert loaded[0] == loaded[1] == summary(groups)
+
+
+def test_sqlite_import_and_occupants_keep_duplicates(data_dir, rng):
+    from bookingroom.scheduler import schedule_with_heuristic
+
+    groups = random_groups(rng, 20, id_pool=["A", "B", "C"])
+    path = str(data_dir / "Booking_import.txt")
+    storage.save_groups(groups, path)
+
+    store = storage.SqliteStorage(str(data_dir / "import.db"))
+    assert store.import_jsonl(path, "2025-12-03") == len(groups)
+    assert summary(store.load_groups("2025-12-03")) == summary(groups)
+
+    rooms = [{"id": "R1", "capacity": 30}]
+    assignments = schedule_with_heuristic(groups, rooms)
+    store.save_assignments(assignments, "2025-12-03")
+    for a in assignments:
+        found = store.occupants("R1", a.start, a.end, "2025-12-03")
+        assert summary(found) == summary([a.group])
+    store.close()
+
+
+def test_sqlite_migrates_old_schema(data_dir, monkeypatch):
+    import json
+    import sqlite3
+
+    from bookingroom.records import as_dict, make_group
+
+    path = str(data_dir / "old.db")
+    group = make_group(1, "Somchai", "ประชุม", 2, 9.0, 10.0, 4)
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE groups (date TEXT NOT NULL, id TEXT NOT NULL, ord INTEGER NOT NULL,
+                             data TEXT NOT NULL, PRIMARY KEY (date, id));
+        CREATE TABLE assignments (date TEXT NOT NULL, group_id TEXT NOT NULL, room_id TEXT NOT NULL,
+                                  slot TEXT NOT NULL, start REAL NOT NULL, "end" REAL NOT NULL,
+                                  score REAL NOT NULL, PRIMARY KEY (date, group_id));
+        CREATE INDEX idx_groups_date_id ON groups (date, id);
+    """)
+    conn.execute("INSERT INTO groups VALUES (?, ?, ?, ?)",
+                 ("2025-12-04", "Somchai", 1, json.dumps(as_dict(group), ensure_ascii=False)))
+    conn.commit()
+    conn.close()
+
+    # ตรวจ index ทันทีหลังย้ายข้อมูล (ก่อนที่ __init__ จะรัน SCHEMA ซ้ำ)
+    migrated_indexes = []
+    migrate = storage.SqliteStorage._migrate
+
+    def checked_migrate(self):
+        migrate(self)
+        migrated_indexes.extend(row[1] for row in self.conn.execute("PRAGMA index_list('groups')"))
+
+    monkeypatch.setattr(storage.SqliteStorage, "_migrate", checked_migrate)
+    store = storage.SqliteStorage(path)
+    assert "idx_groups_date_id" in migrated_indexes
+    plan = " ".join(row[-1] for row in store.conn.execute(
+        "EXPLAIN QUERY PLAN SELECT seq FROM groups WHERE date = ? AND id = ?", ("2025-12-04", "Somchai")))
+    assert "idx_groups_date_id" in plan
+    store.add_group(make_group(2, "Somchai", "ประชุม", 2, 13.0, 14.0, 4), "2025-12-04")
+    assert [g["main_start"] for g in store.load_groups("2025-12-04")] == [9.0, 13.0]
+    store.close()
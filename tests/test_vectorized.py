@@ -0,0 +1,82 @@
+import pytest
+
+from conftest import random_groups
+from bookingroom.records import make_group
+from bookingroom.scheduler import build_candidates, calculate_heuristic_score, greedy_select
+from bookingroom.scoring import ScoringProfile
+from bookingroom.timeutil import slot_minutes
+
+pytest.importorskip("numpy")
+from bookingroom.vectorized import (greedy_select_vectorized, ranked_candidates, score_tensor,
+                                    slot_minutes_array)
+
+SLOTS = [("main",), ("main", "alt"), ("alt", "main")]
+
+
+def random_rooms(rng, n):
+    return [{"id": f"R{i}", "capacity": rng.choice([4, 6, 6, 10, 12.5, 20, 40])} for i in range(n)]
+
+
+def random_profile(rng):
+    return ScoringProfile("random", order=rng.uniform(0, 50), priority=rng.uniform(0, 20),
+                          main_slot=rng.choice([0, 5, 7.3]), wasted_space=rng.uniform(0, 3))
+
+
+def odd_minute_groups(rng, n):
+    """เวลา HH.MM ทุกนาที (เช่น 9.07) และจำนวนคนทศนิยม ให้ทั้ง float และการปัดนาทีถูกทดสอบ"""
+    groups = []
+    for order in range(1, n + 1):
+        start = rng.randrange(8 * 60, 17 * 60)
+        end = start + rng.randrange(1, 120)
+        hhmm = lambda minutes: round(minutes // 60 + minutes % 60 / 100, 2)
+        groups.append(make_group(order, f"G{rng.randrange(n)}", "ประชุม", rng.randint(1, 5),
+                                 hhmm(start), hhmm(end), rng.choice([1, 3, 5.5, 8, 15, 30])))
+    return groups
+
+
+def as_rows(assignments):
+    return [(id(a.group), a.room["id"], a.slot, a.score, a.start, a.end) for a in assignments]
+
+
+@pytest.mark.parametrize("slots", SLOTS)
+def test_score_tensor_matches_scalar_score(rng, slots):
+    groups = random_groups(rng, 40) + odd_minute_groups(rng, 20)
+    rooms = random_rooms(rng, 7)
+    profile = random_profile(rng)
+
+    score, feasible = score_tensor(groups, rooms, slots, profile)
+    starts, ends = slot_minutes_array(groups, slots)
+    for gi, g in enumerate(groups):
+        for si, slot in enumerate(slots):
+            assert (starts[gi, si], ends[gi, si]) == slot_minutes(g, slot)
+            for ri, r in enumerate(rooms):
+                assert feasible[gi, ri, si] == (g["size"] <= r["capacity"])
+                # ตรงกันทุกบิต ไม่ใช่แค่ใกล้เคียง
+                assert score[gi, ri, si] == calculate_heuristic_score(g, r, slot, profile)
+
+
+@pytest.mark.parametrize("slots", SLOTS)
+def test_ranked_candidates_match_sorted_build_candidates(rng, slots):
+    groups = random_groups(rng, 60, id_pool=[f"G{i}" for i in range(30)])
+    rooms = random_rooms(rng, 5)
+    profile = random_profile(rng)
+
+    expected = sorted(build_candidates(groups, rooms, slots, profile), key=lambda a: a.score, reverse=True)
+    ranked = ranked_candidates(groups, rooms, slots, profile)
+    assert [(id(groups[gi]), rooms[ri]["id"], slots[si], score, start, end)
+            for gi, ri, si, score, start, end in ranked] == as_rows(expected)
+
+
+@pytest.mark.parametrize("slots", SLOTS)
+@pytest.mark.parametrize("profile", [None, "fit_rooms", "first_come", "random"])
+def test_greedy_select_vectorized_matches_greedy_select(rng, slots, profile):
+    groups = random_groups(rng, 150, id_pool=[f"G{i}" for i in range(100)]) + odd_minute_groups(rng, 50)
+    rooms = random_rooms(rng, 6)
+    if profile == "random":
+        profile = random_profile(rng)
+
+    expected, expected_calendars = greedy_select(build_candidates(groups, rooms, slots, profile))
+    actual, calendars = greedy_select_vectorized(groups, rooms, slots, profile)
+    assert as_rows(actual) == as_rows(expected)
+    assert {room: calendar.intervals() for room, calendar in calendars.items()} == \
+        {room: calendar.intervals() for room, calendar in expected_calendars.items()}